@@ -1,14 +1,31 @@
 #!/usr/bin/env python3
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, FeatureNotFound
 import re
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
 import logging
 import urllib.parse
-import random
+import hashlib
+import argparse
+import threading
+import concurrent.futures
+import queue
+import sqlite3
+import asyncio
+import bisect
+import collections
+import contextlib
+import itertools
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # Asenkron boru hattı için gerekli, yoksa senkron mod kullanılır
 
 # Logging ayarları
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -20,160 +37,1150 @@ BASE_URL = "https://www.canlitv.vin/"
 OUTPUT_FILE = "kanallar.m3u"
 METADATA_FILE = "metadata.json"
 
-def get_all_channel_urls():
+# Eşzamanlı çıkarma ayarları
+MAX_WORKERS = 8  # Aynı anda işlenecek kanal sayısı
+PER_HOST_RATE_LIMIT = 4.0  # Aynı host'a saniyede gönderilebilecek en fazla istek (0 = sınırsız)
+GLOBAL_DEADLINE = 45 * 60  # Çıkarma aşaması için toplam süre sınırı (saniye, 0 = sınırsız)
+INCREMENTAL_MODE = True  # metadata.json'daki çalışan stream'leri yeniden çıkarmadan doğrula
+MAX_CHANNELS = 1000  # İşlenecek en fazla kanal sayısı
+
+# Boru hattı ayarları (keşif -> çıkarma -> doğrulama)
+PIPELINE_QUEUE_SIZE = 64  # Aşamalar arasındaki kuyrukların kapasitesi
+VALIDATION_WORKERS = 8  # Doğrulama aşamasındaki iş parçacığı sayısı
+
+# Asenkron HTTP ayarları
+ASYNC_MAX_CONNECTIONS = 100  # Olay döngüsündeki toplam eşzamanlı bağlantı sınırı
+ASYNC_PER_HOST_CONNECTIONS = 8  # Aynı host'a açık tutulabilecek en fazla bağlantı
+
+class HostRateLimiter:
+    """Host başına istek hızını sınırlar, iş parçacıkları arasında paylaşılır"""
+    
+    def __init__(self, rate):
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self.set_rate(rate)
+    
+    def set_rate(self, rate):
+        """Saniyedeki istek sınırını günceller"""
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+    
+    def wait(self, url):
+        """Verilen URL'nin host'u için sıradaki boş zaman dilimine kadar bekler"""
+        if not self.interval:
+            return
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+host_rate_limiter = HostRateLimiter(PER_HOST_RATE_LIMIT)
+
+# Paylaşılan HTTP oturumu ayarları
+HTTP_POOL_CONNECTIONS = 32  # Bağlantı havuzu tutulacak en fazla host sayısı
+HTTP_POOL_MAXSIZE = 4  # Varsayılan host başına açık tutulan bağlantı sayısı
+HOST_POOL_SIZES = {
+    "https://www.canlitv.vin": MAX_WORKERS * 2,  # Kanal ve iframe sayfalarının çoğu buradan gelir
+}
+HTTP_RETRY_TOTAL = 2  # Geçici hatalarda en fazla tekrar deneme sayısı
+HTTP_RETRY_BACKOFF = 0.5  # Denemeler arası bekleme katsayısı (0.5 s, 1 s, ...)
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def _build_http_adapter(pool_maxsize):
+    """Tekrar deneme politikası ve verilen havuz boyutuyla bir HTTPAdapter oluşturur"""
+    retry = Retry(
+        total=HTTP_RETRY_TOTAL,
+        connect=1,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    return HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=pool_maxsize, max_retries=retry)
+
+def get_http_session():
     """
-    Ana sayfayı analiz ederek tüm kanal linklerini çıkarır
+    Modül genelinde paylaşılan requests oturumunu döndürür.
+    Keep-alive bağlantılar host başına havuzlanır, böylece aynı sunucuya her istekte
+    yeni TCP/TLS el sıkışması yapılmaz.
     """
-    logger.info("Tüm kanal URL'leri toplanıyor...")
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                session.headers.update({'User-Agent': USER_AGENT})
+                default_adapter = _build_http_adapter(HTTP_POOL_MAXSIZE)
+                session.mount('http://', default_adapter)
+                session.mount('https://', default_adapter)
+                for prefix, pool_size in HOST_POOL_SIZES.items():
+                    session.mount(prefix, _build_http_adapter(pool_size))
+                _http_session = session
+    return _http_session
+
+# Aynı isteklerin çalıştırma boyunca tek seferde yapılması (single-flight) ayarları
+SINGLE_FLIGHT_ENABLED = True
+SINGLE_FLIGHT_MAX_RESULTS = 4096  # Çalıştırma boyunca saklanan en fazla yanıt sayısı
+SINGLE_FLIGHT_IGNORED_KWARGS = ('timeout',)  # Yanıtı değiştirmeyen, anahtara girmeyen parametreler
+
+def normalize_request_url(url):
+    """Şema/host küçük harfe çevrilmiş, varsayılan port ve fragman atılmış URL döndürür"""
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rpartition(':')[2]) in (('http', '80'), ('https', '443')):
+        netloc = netloc.rpartition(':')[0]
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+def request_flight_key(method, url, headers=None, **options):
+    """
+    Normalize edilmiş URL, yöntem, başlıklar ve yanıtı etkileyen seçeneklerden istek anahtarı üretir.
+    Başlık verilmeyen istekler oturumun varsayılan User-Agent'ı ile aynı sayılır.
+    """
+    effective_headers = {'user-agent': USER_AGENT}
+    effective_headers.update({name.lower(): value for name, value in (headers or {}).items()})
+    options = {name: value for name, value in options.items() if name not in SINGLE_FLIGHT_IGNORED_KWARGS}
+    return (method.upper(), normalize_request_url(url),
+            tuple(sorted(effective_headers.items())), repr(sorted(options.items())))
+
+def _is_shareable_response(response):
+    """Geçici hata olmayan yanıtlar çalıştırmanın geri kalanında paylaşılabilir"""
+    return response.status_code not in HTTP_RETRY_STATUSES
+
+class _Flight:
+    """Havadaki tek bir isteğin sonucu; bekleyen iş parçacıkları event'i bekler"""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Aynı anahtarlı eşzamanlı istekleri tek ağ isteğinde birleştirir ve başarılı sonucu
+    çalıştırma boyunca saklar. Hatalar yalnızca o anda bekleyenlerle paylaşılır, saklanmaz.
+    """
+    
+    def __init__(self, max_results=SINGLE_FLIGHT_MAX_RESULTS):
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._results = collections.OrderedDict()
+    
+    def do(self, key, fn, shareable=None):
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if flight.error is None and (shareable is None or shareable(flight.result)):
+                    self._results[key] = flight.result
+                    while len(self._results) > self.max_results:
+                        self._results.popitem(last=False)
+            flight.event.set()
+    
+    def forget(self):
+        """Saklanan sonuçları unutur (tekrar deneme turlarından önce çağrılır)"""
+        with self._lock:
+            self._results.clear()
+
+request_flights = SingleFlight()
+
+def _single_flight_request(method, send, url, kwargs):
+    # Akış (stream=True) yanıtlarının gövdesi bir kez okunabilir, paylaşılamaz
+    if not SINGLE_FLIGHT_ENABLED or kwargs.get('stream'):
+        return send()
+    key = request_flight_key(method, url, **kwargs)
+    return request_flights.do(key, send, _is_shareable_response)
+
+def http_get(url, **kwargs):
+    """
+    Paylaşılan oturum üzerinden host hız sınırına uyarak GET isteği yapar.
+    Aynı URL ve başlıklarla yapılan istekler tek istekte birleştirilir ve yanıt çalıştırma boyunca paylaşılır.
+    """
+    def send():
+        host_rate_limiter.wait(url)
+        return get_http_session().get(url, **kwargs)
+    return _single_flight_request('GET', send, url, kwargs)
+
+def http_head(url, **kwargs):
+    """Paylaşılan oturum üzerinden host hız sınırına uyarak HEAD isteği yapar (http_get gibi birleştirilir)"""
+    def send():
+        host_rate_limiter.wait(url)
+        return get_http_session().head(url, **kwargs)
+    return _single_flight_request('HEAD', send, url, kwargs)
+
+# Çalıştırmalar arasında saklanan durum dosyaları
+CACHE_DIR = ".cache"
+SLUG_CACHE_FILE = os.path.join(CACHE_DIR, "slug_variants.json")
+
+# URL canlılık kontrolü ayarları
+PROBE_WORKERS = 32  # Aynı anda gönderilebilecek en fazla HEAD isteği
+
+def _load_json_file(path, default):
+    """JSON dosyasını okur, dosya yoksa veya bozuksa varsayılan değeri döndürür"""
     try:
-        response = requests.get("https://www.canlitv.vin", timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Tüm potansiyel linkleri topla
-        all_links = set()
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            
-            # Tam URL'e dönüştür
-            if href.startswith('/'):
-                href = f"https://www.canlitv.vin{href}"
-            elif not href.startswith(('http://', 'https://')):
-                href = f"https://www.canlitv.vin/{href}"
-                
-            # Kanal olabilecek linkleri filtrele
-            if any(keyword in href.lower() for keyword in ['canli', 'izle', 'yayin']) and 'category' not in href:
-                all_links.add(href)
-        
-        # Menü öğelerini ve kategori sayfalarını işle
-        menu_items = soup.select('.navbar-nav .nav-item a, .sidebar .widget a')
-        for item in menu_items:
-            href = item.get('href')
-            if href and ('category' in href or 'etiket' in href):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        logger.warning(f"JSON dosyası okunamadı: {path} - {e}")
+        return default
+
+def _save_json_file(path, data):
+    """JSON dosyasını geçici dosya üzerinden atomik olarak yazar"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+class SlugVariantMemory:
+    """Her kanal slug'ı için en son çalışan URL varyantını hatırlar"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+        self._dirty = False
+    
+    def _ensure_loaded(self):
+        if self._data is None:
+            self._data = _load_json_file(self.path, {})
+    
+    def get(self, slug):
+        with self._lock:
+            self._ensure_loaded()
+            return self._data.get(slug)
+    
+    def remember(self, slug, url):
+        with self._lock:
+            self._ensure_loaded()
+            if self._data.get(slug) != url:
+                self._data[slug] = url
+                self._dirty = True
+    
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                _save_json_file(self.path, self._data)
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"Slug varyant kaydı yazılamadı: {e}")
+
+slug_variant_memory = SlugVariantMemory(SLUG_CACHE_FILE)
+
+# Disk üzerindeki HTTP yanıt önbelleği ayarları
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+HTTP_CACHE_TTL = 6 * 60 * 60  # Bu süre içindeki yanıtlar ağa çıkmadan kullanılır (saniye)
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Gövdeler için disk sınırı, aşılınca en eski erişilenler silinir
+
+class CachedResponse:
+    """Önbellekten ya da ağdan gelen bir GET yanıtının ortak görünümü"""
+    
+    def __init__(self, url, status_code, text, headers=None, content_hash=None, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.content_hash = content_hash
+        self.from_cache = from_cache  # True ise gövde diskten okundu (taze kayıt ya da 304)
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}: {self.url}")
+
+class HttpResponseCache:
+    """
+    İçerik adresli disk önbelleği. Gövdeler SHA-256 özetleriyle bodies/ altında saklanır,
+    index.json her istek anahtarı için ETag, Last-Modified, kayıt ve son erişim zamanını tutar.
+    Aynı içeriğe ait ayrıştırma sonuçları da özet üzerinden saklanır (derived), böylece
+    değişmeyen sayfalar yeniden ayrıştırılmaz.
+    """
+    
+    def __init__(self, directory, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._index = None
+        self._dirty = False
+    
+    @property
+    def _index_path(self):
+        return os.path.join(self.directory, "index.json")
+    
+    def _body_path(self, content_hash):
+        return os.path.join(self.directory, "bodies", content_hash[:2], content_hash)
+    
+    def _ensure_loaded(self):
+        if self._index is None:
+            self._index = _load_json_file(self._index_path, {})
+            self._index.setdefault('entries', {})
+            self._index.setdefault('derived', {})
+    
+    @staticmethod
+    def request_key(url, headers=None):
+        """URL ve içeriği etkileyebilecek başlıklardan önbellek anahtarı üretir"""
+        referer = (headers or {}).get('Referer', '')
+        return hashlib.sha1(f"{url}\n{referer}".encode('utf-8')).hexdigest()
+    
+    def lookup(self, key):
+        """Anahtara ait kaydı döndürür, gövdesi diskte yoksa None"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._index['entries'].get(key)
+            if entry and not os.path.exists(self._body_path(entry['hash'])):
+                del self._index['entries'][key]
+                self._dirty = True
+                return None
+            return dict(entry) if entry else None
+    
+    def is_fresh(self, entry):
+        return time.time() - entry.get('stored_at', 0) < self.ttl
+    
+    def conditional_headers(self, entry):
+        """Koşullu istek başlıklarını döndürür"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def read_body(self, entry):
+        with open(self._body_path(entry['hash']), 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def touch(self, key, revalidated=False):
+        """Son erişim zamanını (ve 304 sonrasında kayıt zamanını) günceller"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._index['entries'].get(key)
+            if entry:
+                now = time.time()
+                entry['last_access'] = now
+                if revalidated:
+                    entry['stored_at'] = now
+                self._dirty = True
+    
+    def store(self, key, url, text, headers):
+        """200 yanıtını saklar ve içerik özetini döndürür"""
+        body = text.encode('utf-8')
+        content_hash = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(content_hash)
+        if not os.path.exists(body_path):
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+        
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            self._index['entries'][key] = {
+                'url': url,
+                'hash': content_hash,
+                'size': len(body),
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'stored_at': now,
+                'last_access': now,
+            }
+            self._dirty = True
+        return content_hash
+    
+    def get_derived(self, content_hash, name):
+        """Aynı içerik için daha önce hesaplanmış ayrıştırma sonucunu döndürür"""
+        if not content_hash:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            return self._index['derived'].get(content_hash, {}).get(name)
+    
+    def set_derived(self, content_hash, name, value):
+        if not content_hash:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._index['derived'].setdefault(content_hash, {})[name] = value
+            self._dirty = True
+    
+    def _evict(self):
+        """Gövde boyutu sınırı aşıldıysa en uzun süre erişilmeyen kayıtları siler (kilit altında çağrılır)"""
+        entries = self._index['entries']
+        sizes = {}
+        for entry in entries.values():
+            sizes[entry['hash']] = entry['size']
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+        
+        for key, entry in sorted(entries.items(), key=lambda item: item[1].get('last_access', 0)):
+            if total <= self.max_bytes:
+                break
+            del entries[key]
+            content_hash = entry['hash']
+            if not any(other['hash'] == content_hash for other in entries.values()):
+                total -= sizes.get(content_hash, 0)
+                self._index['derived'].pop(content_hash, None)
                 try:
-                    category_response = requests.get(href, timeout=10)
-                    category_soup = BeautifulSoup(category_response.text, 'html.parser')
-                    for cat_link in category_soup.find_all('a', href=True):
-                        cat_href = cat_link['href']
-                        if any(keyword in cat_href.lower() for keyword in ['canli', 'izle', 'yayin']) and 'category' not in cat_href:
-                            if cat_href.startswith('/'):
-                                cat_href = f"https://www.canlitv.vin{cat_href}"
-                            elif not cat_href.startswith(('http://', 'https://')):
-                                cat_href = f"https://www.canlitv.vin/{cat_href}"
-                            all_links.add(cat_href)
-                except Exception as e:
-                    logger.error(f"Kategori sayfası işlenirken hata: {e}")
-                    continue
+                    os.remove(self._body_path(content_hash))
+                except OSError:
+                    pass
+        self._dirty = True
+    
+    def save(self):
+        """İndeksi diske yazar"""
+        with self._lock:
+            if self._index is None or not self._dirty:
+                return
+            try:
+                self._evict()
+                # Artık hiçbir kayda ait olmayan ayrıştırma sonuçlarını at
+                live_hashes = {entry['hash'] for entry in self._index['entries'].values()}
+                self._index['derived'] = {h: v for h, v in self._index['derived'].items() if h in live_hashes}
+                _save_json_file(self._index_path, self._index)
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"HTTP önbellek indeksi yazılamadı: {e}")
+
+http_cache = HttpResponseCache(HTTP_CACHE_DIR)
+
+def cached_get(url, headers=None, timeout=10):
+    """
+    Disk önbelleği üzerinden GET isteği yapar ve CachedResponse döndürür.
+    TTL içindeki kayıtlar ağa çıkmadan döner; süresi dolmuş kayıtlar If-None-Match /
+    If-Modified-Since ile yeniden doğrulanır ve 304 yanıtında diskteki gövde kullanılır.
+    """
+    if not (HTTP_CACHE_ENABLED and http_cache.enabled):
+        response = http_get(url, headers=headers, timeout=timeout)
+        return CachedResponse(response.url, response.status_code, response.text, response.headers)
+    
+    key = http_cache.request_key(url, headers)
+    entry = http_cache.lookup(key)
+    if entry and http_cache.is_fresh(entry):
+        try:
+            text = http_cache.read_body(entry)
+            http_cache.touch(key)
+            return CachedResponse(url, 200, text, content_hash=entry['hash'], from_cache=True)
+        except OSError:
+            entry = None
+    
+    request_headers = dict(headers or {})
+    if entry:
+        request_headers.update(http_cache.conditional_headers(entry))
+    
+    response = http_get(url, headers=request_headers, timeout=timeout)
+    
+    if response.status_code == 304 and entry:
+        try:
+            text = http_cache.read_body(entry)
+            http_cache.touch(key, revalidated=True)
+            logger.debug(f"Önbellek yeniden doğrulandı (304): {url}")
+            return CachedResponse(url, 200, text, response.headers, content_hash=entry['hash'], from_cache=True)
+        except OSError:
+            # Gövde kaybolmuş, koşulsuz tekrar iste
+            response = http_get(url, headers=headers, timeout=timeout)
+    
+    content_hash = None
+    if response.status_code == 200:
+        try:
+            content_hash = http_cache.store(key, url, response.text, response.headers)
+        except Exception as e:
+            logger.warning(f"Yanıt önbelleğe yazılamadı: {url} - {e}")
+    return CachedResponse(response.url, response.status_code, response.text, response.headers, content_hash)
+
+# HTML ayrıştırma ayarları
+HTML_PARSER = 'lxml'  # BeautifulSoup ayrıştırıcısı: 'lxml' (hızlı) ya da 'html.parser'
+
+# Kanal sayfalarında aranan video oynatıcı elementleri
+PLAYER_SELECTORS = [
+    '#video-player', '#player', '.video-player', '.player', '#tv-player', 
+    '.tv-player', '#videoContainer', '.videoContainer', '#playerContainer', 
+    '.playerContainer', '#livePlayer', '.livePlayer', '#video', '.video',
+    '#player_div', '.player_div', '#playerElement', '.playerElement',
+    '#jwplayer', '.jwplayer', '.flowplayer', '#flowplayer'
+]
+PLAYER_IDS = {selector[1:] for selector in PLAYER_SELECTORS if selector.startswith('#')}
+PLAYER_CLASSES = {selector[1:] for selector in PLAYER_SELECTORS if selector.startswith('.')}
+PLAYER_DATA_ATTRS = ['data-source', 'data-url', 'data-stream', 'data-hls', 'data-src']
+
+# Debug sayfa kayıtları (ana tarama sırasında yan çıktı olarak yazılır)
+SNAPSHOT_DIR = "debug_channels"
+SAVE_SNAPSHOTS = True
+
+class SnapshotWriter:
+    """
+    Tarama sırasında indirilen sayfaları debug klasörüne arka plandaki tek bir
+    iş parçacığıyla yazar, böylece çıkarma işçileri disk işlemi için beklemez.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.enabled = SAVE_SNAPSHOTS
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, filename, content):
+        """Sayfayı yazılmak üzere kuyruğa ekler"""
+        if not self.enabled or not content:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='snapshot-writer', daemon=True)
+                self._thread.start()
+        self._queue.put((re.sub(r'[^A-Za-z0-9._-]', '_', filename), content))
+    
+    def _run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                filename, content = item
+                path = os.path.join(self.directory, filename)
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                logger.debug(f"Debug sayfası kaydedildi: {path}")
+            except Exception as e:
+                logger.warning(f"Debug sayfası kaydedilemedi: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def flush(self):
+        """Kuyruktaki tüm yazma işlemlerinin bitmesini bekler"""
+        if self._thread is not None:
+            self._queue.join()
+
+snapshot_writer = SnapshotWriter(SNAPSHOT_DIR)
+
+def flush_caches():
+    """Çalıştırma boyunca biriken kalıcı durumları diske yazar"""
+    slug_variant_memory.save()
+    strategy_memory.save()
+    geolive_result_memory.save()
+    cdn_stats.save()
+    http_cache.save()
+    snapshot_writer.flush()
+
+# Selenium tarayıcı havuzu ayarları
+BROWSER_POOL_SIZE = 2  # Çalıştırma boyunca açık tutulan en fazla Chrome sayısı
+BROWSER_MAX_USES = 20  # Bir tarayıcı bu kadar kanaldan sonra kapatılıp yenisi açılır
+BROWSER_LEASE_TIMEOUT = 120  # Boş tarayıcı beklemek için en fazla süre (saniye)
+BROWSER_PAGE_LOAD_TIMEOUT = 30
+STREAM_CAPTURE_TIMEOUT = 8  # Manifest isteği için en fazla bekleme (saniye)
+STREAM_CAPTURE_POLL = 0.1  # Ağ olaylarının okunma aralığı (saniye)
+HLS_MIME_TYPES = ('application/vnd.apple.mpegurl', 'application/x-mpegurl', 'audio/mpegurl', 'audio/x-mpegurl')
+
+# Headless tarayıcıda engellenen kaynaklar: yalnızca manifest URL'si gerektiği için resim,
+# font, stil dosyası, medya segmentleri ve reklam/analitik sunucuları yüklenmez
+BLOCK_BROWSER_RESOURCES = True
+BLOCKED_RESOURCE_EXTENSIONS = [
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'bmp', 'avif',
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+    'css',
+    'ts', 'm4s', 'aac', 'mp4', 'm4a', 'm4v', 'webm', 'mp3',
+]
+BLOCKED_RESOURCE_HOSTS = [
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com', 'adservice.google.com',
+    'google-analytics.com', 'googletagmanager.com', 'googletagservices.com',
+    'facebook.net', 'connect.facebook.com', 'mc.yandex.ru', 'an.yandex.ru', 'hotjar.com',
+    'scorecardresearch.com', 'quantserve.com', 'criteo.com', 'taboola.com', 'outbrain.com',
+    'popads.net', 'popcash.net', 'propellerads.com', 'adsterra.com', 'onclickads.net',
+    'exoclick.com', 'juicyads.com', 'admatic.com.tr', 'adnxs.com', 'histats.com', 'statcounter.com',
+]
+def resource_block_patterns():
+    """
+    DevTools Network.setBlockedURLs için joker karakterli URL desenlerini döndürür.
+    setBlockedURLs istisna desteklemediği için oynatıcı betikleri (js) ve manifestler
+    (m3u8/mpd) yukarıdaki listelerin dışında tutularak serbest bırakılır; oynatıcı
+    CDN'leri engelli host listesine eklenmemelidir.
+    """
+    patterns = []
+    for extension in BLOCKED_RESOURCE_EXTENSIONS:
+        patterns.extend([f'*.{extension}', f'*.{extension}?*'])
+    for host in BLOCKED_RESOURCE_HOSTS:
+        patterns.extend([f'*://{host}/*', f'*://*.{host}/*'])
+    return patterns
+
+class BrowserUnavailableError(Exception):
+    """Selenium ya da Chrome başlatılamadığında yükseltilir"""
+
+def _import_selenium():
+    """Selenium paketlerini içe aktarır, kurulu değilse pip ile kurar"""
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+    except ImportError:
+        logger.warning("Selenium paketleri bulunamadı, otomatik kurmayı deniyorum...")
+        import subprocess
+        import sys
         
-        # Tespit edilen URL'lerden kanal adlarını çıkar ve alternatif formatlar oluştur
-        channel_names = set()
-        for link in all_links:
-            parts = link.split('/')
-            if len(parts) > 3:
-                channel_name = parts[-1]
-                if 'canli' in channel_name or 'izle' in channel_name:
-                    base_name = channel_name.replace('-canli', '').replace('-izle', '').replace('-yayin', '')
-                    channel_names.add(base_name)
-        
-        # Alternatif URL formatları oluştur
-        for name in list(channel_names):
-            all_links.add(f"https://www.canlitv.vin/{name}-canli")
-            all_links.add(f"https://www.canlitv.vin/{name}-canli-izle")
-            all_links.add(f"https://www.canlitv.vin/{name}-canli-yayin")
-        
-        # Bilinen kanal URL'lerini ekle (hata durumlarına karşı)
-        known_urls = [
-            # Ulusal kanallar
-            "https://www.canlitv.vin/trt1-canli-izle",
-            "https://www.canlitv.vin/atv-canli-izle",
-            "https://www.canlitv.vin/show-tv-canli-izle",
-            "https://www.canlitv.vin/fox-tv-canli-izle",
-            "https://www.canlitv.vin/star-tv-canli-izle",
-            "https://www.canlitv.vin/kanal-d-canli-izle",
-            "https://www.canlitv.vin/tv8-canli-izle",
-            "https://www.canlitv.vin/kanal-7-canli-izle",
-            "https://www.canlitv.vin/360-tv-canli-izle",
-            "https://www.canlitv.vin/teve2-canli-izle",
-            "https://www.canlitv.vin/beyaz-tv-canli-izle",
-            "https://www.canlitv.vin/trt2-canli-izle",
-            "https://www.canlitv.vin/trt-turk-canli-izle",
-            "https://www.canlitv.vin/trt-avaz-canli-izle",
-            # Haber kanalları
-            "https://www.canlitv.vin/trt-haber-canli-izle",
-            "https://www.canlitv.vin/cnn-turk-canli-izle",
-            "https://www.canlitv.vin/haberturk-canli-izle",
-            "https://www.canlitv.vin/ntv-canli-izle",
-            "https://www.canlitv.vin/tv100-canli-izle",
-            "https://www.canlitv.vin/halk-tv-canli-izle",
-            "https://www.canlitv.vin/tele1-canli-izle",
-            "https://www.canlitv.vin/krt-tv-canli-izle",
-            "https://www.canlitv.vin/sozcu-tv-canli-izle",
-            "https://www.canlitv.vin/ekoturk-canli-izle",
-            "https://www.canlitv.vin/bloomberg-ht-canli-izle",
-            "https://www.canlitv.vin/ulke-tv-canli-izle",
-            "https://www.canlitv.vin/a-haber-canli-izle",
-            "https://www.canlitv.vin/tgrt-haber-canli-izle",
-            "https://www.canlitv.vin/tvnet-canli-izle",
-            "https://www.canlitv.vin/24-tv-canli-izle",
-            "https://www.canlitv.vin/kanal-24-canli-izle",
-            "https://www.canlitv.vin/flash-haber-canli-izle",
-            "https://www.canlitv.vin/benguturk-canli-izle",
-            "https://www.canlitv.vin/akit-tv-canli-izle",
-            # Spor kanalları
-            "https://www.canlitv.vin/trt-spor-canli-izle",
-            "https://www.canlitv.vin/trt-spor-yildiz-canli-izle",
-            "https://www.canlitv.vin/spor-smart-canli-izle",
-            "https://www.canlitv.vin/spor-smart2-canli-izle",
-            "https://www.canlitv.vin/tv8-5-canli-izle",
-            "https://www.canlitv.vin/gstv-canli-izle",
-            "https://www.canlitv.vin/fb-tv-canli-izle",
-            "https://www.canlitv.vin/bjk-tv-canli-izle",
-            "https://www.canlitv.vin/a-spor-canli-izle",
-            # Belgesel kanalları
-            "https://www.canlitv.vin/trt-belgesel-canli-izle",
-            "https://www.canlitv.vin/nat-geo-wild-canli-izle",
-            "https://www.canlitv.vin/discovery-channel-canli-izle",
-            "https://www.canlitv.vin/tlc-canli-izle",
-            "https://www.canlitv.vin/dmax-canli-izle",
-            # Azerbaycan kanalları
-            "https://www.canlitv.vin/az-tv-canli",
-            "https://www.canlitv.vin/azerbaycan-tv-canli-izle",
-            "https://www.canlitv.vin/idman-tv-canli",
-            "https://www.canlitv.vin/ictimai-tv-canli",
-            "https://www.canlitv.vin/atv-az-canli",
-            "https://www.canlitv.vin/xezer-tv-canli",
-            "https://www.canlitv.vin/space-tv-az-canli",
-            "https://www.canlitv.vin/cbc-azerbaijan-canli",
-            "https://www.canlitv.vin/arb-tv-canli",
-            "https://www.canlitv.vin/atv-azerbaijan-canli-izle",
-            "https://www.canlitv.vin/lider-tv-canli",
-            "https://www.canlitv.vin/medeniyyet-tv-canli",
-            "https://www.canlitv.vin/arb24-canli",
-            # Müzik kanalları
-            "https://www.canlitv.vin/trt-muzik-canli-izle",
-            "https://www.canlitv.vin/kral-tv-canli-izle",
-            "https://www.canlitv.vin/kral-pop-canli-izle",
-            "https://www.canlitv.vin/dream-turk-canli-izle",
-            "https://www.canlitv.vin/power-turk-canli-izle",
-            "https://www.canlitv.vin/power-tv-canli-izle",
-            "https://www.canlitv.vin/milyontv-canli-izle",
-            "https://www.canlitv.vin/number1-tv-canli-izle",
-            "https://www.canlitv.vin/number1-turk-canli-izle",
-            # Çocuk kanalları
-            "https://www.canlitv.vin/trt-cocuk-canli-izle",
-            "https://www.canlitv.vin/minika-go-canli-izle",
-            "https://www.canlitv.vin/minika-cocuk-canli-izle",
-            "https://www.canlitv.vin/cartoon-network-canli-izle",
-            # Özel Tematik Kanallar
-            "https://www.canlitv.vin/eurostar-canli-hd"
-        ]
+        # Pip ile gerekli paketleri yükle
+        packages = ["selenium", "webdriver-manager", "selenium-stealth"]
+        for package in packages:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", package], 
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        logger.info("Selenium paketleri başarıyla kuruldu")
+    return webdriver, Options, Service
+
+class PooledBrowser:
+    """Havuzdaki tek bir Chrome: sürücü, profil klasörü ve kullanım sayısı"""
+    
+    def __init__(self, driver, profile_dir):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.uses = 0
+
+class BrowserPool:
+    """
+    Çalıştırma boyunca sıcak tutulan headless Chrome havuzu.
+    Tarayıcılar ihtiyaç oldukça (en fazla size adet) açılır, lease() ile ödünç verilir ve
+    her kanaldan sonra çerezleri/sekmeleri temizlenerek havuza döner. max_uses kullanımdan
+    sonra ya da çökme durumunda tarayıcı kapatılır, profil klasörü silinir ve yenisi açılır.
+    ChromeDriverManager kurulumu tüm havuz için bir kez yapılır.
+    """
+    
+    def __init__(self, size=BROWSER_POOL_SIZE, max_uses=BROWSER_MAX_USES):
+        self.size = size
+        self.max_uses = max_uses
+        self.block_resources = BLOCK_BROWSER_RESOURCES
+        self._idle = []  # Boştaki tarayıcılar (en son kullanılan en üstte)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(threading.Lock())
+        self._selenium = None
+        self._driver_path = None
+        self._start_error = None
+        self._closed = False
+    
+    @property
+    def available(self):
+        """Selenium/Chrome başlatılamadıysa ya da havuz kapatıldıysa False"""
+        return self._start_error is None and not self._closed
+    
+    def _prepare(self):
+        """Selenium'u ve ChromeDriver'ı havuz için bir kez hazırlar"""
+        with self._lock:
+            if self._start_error:
+                raise BrowserUnavailableError(self._start_error)
+            if self._selenium is not None:
+                return
+            try:
+                self._selenium = _import_selenium()
+            except Exception as e:
+                self._start_error = f"Selenium yüklenemedi: {e}"
+                raise BrowserUnavailableError(self._start_error)
+            
+            # WebDriver Manager ile Chrome Driver'ı otomatik kur
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                self._driver_path = ChromeDriverManager().install()
+            except Exception as e:
+                logger.warning(f"Chrome Driver otomatik kurulumu hatası: {e}")
+                # Sistem PATH'inde ChromeDriver'ı aramaya çalış
+                self._driver_path = "chromedriver"
+    
+    def _build_options(self, profile_dir):
+        _, Options, _ = self._selenium
+        chrome_options = Options()
+        
+        # Github Actions ve CI ortamları için gerekli ayarlar
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        
+        # Stealth mode tespiti zorlaştıracak ayarlar
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # Her tarayıcının kendi profil klasörü olur (Github Actions için kritik)
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        
+        # Diğer ayarlar
+        chrome_options.add_argument("--disable-web-security")
+        chrome_options.add_argument("--disable-site-isolation-trials")
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-setuid-sandbox")
+        chrome_options.add_argument("--disable-infobars")
+        
+        # Ağ olaylarını performans loglarından okuyabilmek için (bkz. wait_for_stream_request)
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        # driver.get DOMContentLoaded'da döner; oynatıcının isteği ağ olaylarından beklenir
+        chrome_options.page_load_strategy = 'eager'
+        
+        if self.block_resources:
+            # Resimler render aşamasında da kapatılır
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        return chrome_options
+    
+    def _apply_resource_blocking(self, driver):
+        """Engelleme desenlerini DevTools protokolü üzerinden tarayıcıya yükler"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': resource_block_patterns()})
+        except Exception as e:
+            logger.warning(f"Kaynak engelleme uygulanamadı: {e}")
+    
+    def _launch(self):
+        """Yeni bir Chrome başlatır; başarısız olursa BrowserUnavailableError yükseltir"""
+        import tempfile
+        import shutil
+        
+        webdriver, _, Service = self._selenium
+        profile_dir = tempfile.mkdtemp(prefix="chrome_profile_")
+        try:
+            logger.info("Chrome Driver başlatılıyor...")
+            driver = webdriver.Chrome(service=Service(self._driver_path), options=self._build_options(profile_dir))
+        except Exception as e:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise BrowserUnavailableError(str(e))
+        
+        driver.set_page_load_timeout(BROWSER_PAGE_LOAD_TIMEOUT)
+        if self.block_resources:
+            self._apply_resource_blocking(driver)
+        
+        # Selenium Stealth uygulaması - otomatik tarayıcı tespitini zorlaştırır
+        try:
+            import selenium_stealth
+            selenium_stealth.stealth(driver,
+                languages=["tr-TR", "tr", "en-US", "en"],
+                vendor="Google Inc.",
+                platform="Win32",
+                webgl_vendor="Intel Inc.",
+                renderer="Intel Iris OpenGL Engine",
+                fix_hairline=True,
+            )
+        except Exception as e:
+            logger.warning(f"Selenium Stealth uygulanamadı: {e}")
+        
+        logger.info("Chrome Driver başarıyla başlatıldı")
+        return PooledBrowser(driver, profile_dir)
+    
+    def _acquire(self, timeout=None):
+        if self._closed:
+            raise BrowserUnavailableError("Tarayıcı havuzu kapatıldı")
+        self._prepare()
+        
+        deadline = time.monotonic() + (BROWSER_LEASE_TIMEOUT if timeout is None else timeout)
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BrowserUnavailableError("Boş tarayıcı beklenirken zaman aşımı")
+                self._available.wait(remaining)
         
-        # Bilinen URL'leri ekle
-        for url in known_urls:
-            all_links.add(url)
+        # Chrome başlatmak birkaç saniye sürer, kilit dışında yapılır
+        try:
+            return self._launch()
+        except BrowserUnavailableError:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+    
+    def _reset(self, browser):
+        """
+        Sonraki kanal için tarayıcı durumunu temizler: ek sekmeler, sayfa, tüm alan adlarının
+        çerezleri, HTTP önbelleği ve açılan çerçevelerin (oynatıcı/CDN iframe'leri dahil)
+        localStorage/IndexedDB gibi depoları. delete_all_cookies yalnızca geçerli belgenin alan
+        adını temizlediği için temizlik DevTools protokolüyle yapılır.
+        """
+        driver = browser.driver
+        origins = {'{0.scheme}://{0.netloc}'.format(urllib.parse.urlsplit(BASE_URL))}
+        handles = driver.window_handles
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            origins.update(_frame_origins(driver))
+            if handle != handles[0]:
+                driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+        # Süre bütçesiyle kısaltılmış olabilir
+        driver.set_page_load_timeout(BROWSER_PAGE_LOAD_TIMEOUT)
+        driver.get("about:blank")
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        for origin in origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        _drain_performance_log(driver)
+    
+    def _discard(self, browser):
+        """Tarayıcıyı kapatır ve profil klasörünü siler"""
+        import shutil
+        
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+        shutil.rmtree(browser.profile_dir, ignore_errors=True)
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+    
+    def _release(self, browser, healthy):
+        browser.uses += 1
+        if healthy and not self._closed and browser.uses < self.max_uses:
+            try:
+                self._reset(browser)
+                with self._available:
+                    self._idle.append(browser)
+                    self._available.notify()
+                return
+            except Exception as e:
+                logger.warning(f"Tarayıcı sıfırlanamadı, yenisi açılacak: {e}")
+        self._discard(browser)
+    
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        """
+        Havuzdan bir WebDriver ödünç verir. Blok içinde hata olursa tarayıcı çökmüş
+        sayılır ve havuza geri konmaz. timeout boş tarayıcı için en fazla bekleme süresidir
+        (varsayılan BROWSER_LEASE_TIMEOUT).
+        """
+        browser = self._acquire(timeout)
+        healthy = False
+        try:
+            yield browser.driver
+            healthy = True
+        finally:
+            self._release(browser, healthy)
+    
+    def shutdown(self):
+        """Havuzdaki tüm tarayıcıları kapatır"""
+        self._closed = True
+        with self._available:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._discard(browser)
+
+browser_pool = BrowserPool()
+
+def _frame_origins(driver):
+    """Açık sayfadaki tüm çerçevelerin (iç içe iframe'ler dahil) http(s) origin'lerini döndürür"""
+    try:
+        pending = [driver.execute_cdp_cmd('Page.getFrameTree', {})['frameTree']]
+    except Exception as e:
+        logger.debug(f"Çerçeve ağacı alınamadı: {e}")
+        return set()
+    origins = set()
+    while pending:
+        node = pending.pop()
+        parts = urllib.parse.urlsplit(node.get('frame', {}).get('url', ''))
+        if parts.scheme in ('http', 'https') and parts.netloc:
+            origins.add(f"{parts.scheme}://{parts.netloc}")
+        pending.extend(node.get('childFrames', []))
+    return origins
+
+def _drain_performance_log(driver):
+    """Önceki sayfadan kalan performans log kayıtlarını okuyup atar"""
+    try:
+        driver.get_log('performance')
+    except Exception:
+        pass
+
+def _stream_url_from_network_event(message):
+    """Bir DevTools ağ olayı manifest isteğiyse URL'sini döndürür"""
+    method = message.get('method')
+    params = message.get('params', {})
+    if method == 'Network.requestWillBeSent':
+        url = params.get('request', {}).get('url', '')
+        if '.m3u8' in url or '.m3u' in url:
+            return url
+    elif method == 'Network.responseReceived':
+        response = params.get('response', {})
+        mime_type = (response.get('mimeType') or '').lower()
+        if mime_type in HLS_MIME_TYPES:
+            return response.get('url')
+    return None
+
+_PERFORMANCE_ENTRIES_SCRIPT = """
+    var entries = (window.performance && window.performance.getEntries) ? window.performance.getEntries() : [];
+    return entries.map(function(entry) { return entry.name; });
+"""
+
+def wait_for_stream_request(driver, timeout=STREAM_CAPTURE_TIMEOUT):
+    """
+    Tarayıcının ağ olaylarını dinler ve ilk .m3u8 isteği (ya da HLS MIME tipli yanıt)
+    görüldüğü anda URL'sini döndürür. timeout saniye içinde görülmezse None döner.
+    Performans logları desteklenmiyorsa window.performance kayıtları aynı aralıkla okunur.
+    """
+    deadline = time.monotonic() + timeout
+    use_performance_log = True
+    while True:
+        if use_performance_log:
+            try:
+                for entry in driver.get_log('performance'):
+                    url = _stream_url_from_network_event(json.loads(entry['message']).get('message', {}))
+                    if url:
+                        logger.info(f"Ağ trafiğinde manifest isteği yakalandı: {url}")
+                        return url
+            except Exception as log_error:
+                logger.debug(f"Performans logları okunamadı, sayfa kayıtlarına geçiliyor: {log_error}")
+                use_performance_log = False
+        if not use_performance_log:
+            try:
+                for name in driver.execute_script(_PERFORMANCE_ENTRIES_SCRIPT) or []:
+                    if name and '.m3u' in name:
+                        logger.info(f"Performans kayıtlarında manifest isteği yakalandı: {name}")
+                        return name
+            except Exception as script_error:
+                logger.warning(f"Ağ kayıtları okunamadı: {script_error}")
+                return None
         
-        # URL'leri kontrol et ve düzelt
-        checked_urls = check_and_fix_urls(all_links)
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(STREAM_CAPTURE_POLL)
+
+# Bilinen kanal URL'leri (hata durumlarına karşı her taramada eklenir)
+KNOWN_CHANNEL_URLS = [
+    # Ulusal kanallar
+    "https://www.canlitv.vin/trt1-canli-izle",
+    "https://www.canlitv.vin/atv-canli-izle",
+    "https://www.canlitv.vin/show-tv-canli-izle",
+    "https://www.canlitv.vin/fox-tv-canli-izle",
+    "https://www.canlitv.vin/star-tv-canli-izle",
+    "https://www.canlitv.vin/kanal-d-canli-izle",
+    "https://www.canlitv.vin/tv8-canli-izle",
+    "https://www.canlitv.vin/kanal-7-canli-izle",
+    "https://www.canlitv.vin/360-tv-canli-izle",
+    "https://www.canlitv.vin/teve2-canli-izle",
+    "https://www.canlitv.vin/beyaz-tv-canli-izle",
+    "https://www.canlitv.vin/trt2-canli-izle",
+    "https://www.canlitv.vin/trt-turk-canli-izle",
+    "https://www.canlitv.vin/trt-avaz-canli-izle",
+    # Haber kanalları
+    "https://www.canlitv.vin/trt-haber-canli-izle",
+    "https://www.canlitv.vin/cnn-turk-canli-izle",
+    "https://www.canlitv.vin/haberturk-canli-izle",
+    "https://www.canlitv.vin/ntv-canli-izle",
+    "https://www.canlitv.vin/tv100-canli-izle",
+    "https://www.canlitv.vin/halk-tv-canli-izle",
+    "https://www.canlitv.vin/tele1-canli-izle",
+    "https://www.canlitv.vin/krt-tv-canli-izle",
+    "https://www.canlitv.vin/sozcu-tv-canli-izle",
+    "https://www.canlitv.vin/ekoturk-canli-izle",
+    "https://www.canlitv.vin/bloomberg-ht-canli-izle",
+    "https://www.canlitv.vin/ulke-tv-canli-izle",
+    "https://www.canlitv.vin/a-haber-canli-izle",
+    "https://www.canlitv.vin/tgrt-haber-canli-izle",
+    "https://www.canlitv.vin/tvnet-canli-izle",
+    "https://www.canlitv.vin/24-tv-canli-izle",
+    "https://www.canlitv.vin/kanal-24-canli-izle",
+    "https://www.canlitv.vin/flash-haber-canli-izle",
+    "https://www.canlitv.vin/benguturk-canli-izle",
+    "https://www.canlitv.vin/akit-tv-canli-izle",
+    # Spor kanalları
+    "https://www.canlitv.vin/trt-spor-canli-izle",
+    "https://www.canlitv.vin/trt-spor-yildiz-canli-izle",
+    "https://www.canlitv.vin/spor-smart-canli-izle",
+    "https://www.canlitv.vin/spor-smart2-canli-izle",
+    "https://www.canlitv.vin/tv8-5-canli-izle",
+    "https://www.canlitv.vin/gstv-canli-izle",
+    "https://www.canlitv.vin/fb-tv-canli-izle",
+    "https://www.canlitv.vin/bjk-tv-canli-izle",
+    "https://www.canlitv.vin/a-spor-canli-izle",
+    # Belgesel kanalları
+    "https://www.canlitv.vin/trt-belgesel-canli-izle",
+    "https://www.canlitv.vin/nat-geo-wild-canli-izle",
+    "https://www.canlitv.vin/discovery-channel-canli-izle",
+    "https://www.canlitv.vin/tlc-canli-izle",
+    "https://www.canlitv.vin/dmax-canli-izle",
+    # Azerbaycan kanalları
+    "https://www.canlitv.vin/az-tv-canli",
+    "https://www.canlitv.vin/azerbaycan-tv-canli-izle",
+    "https://www.canlitv.vin/idman-tv-canli",
+    "https://www.canlitv.vin/ictimai-tv-canli",
+    "https://www.canlitv.vin/atv-az-canli",
+    "https://www.canlitv.vin/xezer-tv-canli",
+    "https://www.canlitv.vin/space-tv-az-canli",
+    "https://www.canlitv.vin/cbc-azerbaijan-canli",
+    "https://www.canlitv.vin/arb-tv-canli",
+    "https://www.canlitv.vin/atv-azerbaijan-canli-izle",
+    "https://www.canlitv.vin/lider-tv-canli",
+    "https://www.canlitv.vin/medeniyyet-tv-canli",
+    "https://www.canlitv.vin/arb24-canli",
+    # Müzik kanalları
+    "https://www.canlitv.vin/trt-muzik-canli-izle",
+    "https://www.canlitv.vin/kral-tv-canli-izle",
+    "https://www.canlitv.vin/kral-pop-canli-izle",
+    "https://www.canlitv.vin/dream-turk-canli-izle",
+    "https://www.canlitv.vin/power-turk-canli-izle",
+    "https://www.canlitv.vin/power-tv-canli-izle",
+    "https://www.canlitv.vin/milyontv-canli-izle",
+    "https://www.canlitv.vin/number1-tv-canli-izle",
+    "https://www.canlitv.vin/number1-turk-canli-izle",
+    # Çocuk kanalları
+    "https://www.canlitv.vin/trt-cocuk-canli-izle",
+    "https://www.canlitv.vin/minika-go-canli-izle",
+    "https://www.canlitv.vin/minika-cocuk-canli-izle",
+    "https://www.canlitv.vin/cartoon-network-canli-izle",
+    # Özel Tematik Kanallar
+    "https://www.canlitv.vin/eurostar-canli-hd"
+]
+
+def _normalize_site_href(href):
+    """Site içi göreli linkleri tam URL'e dönüştürür"""
+    if href.startswith('/'):
+        return f"https://www.canlitv.vin{href}"
+    elif not href.startswith(('http://', 'https://')):
+        return f"https://www.canlitv.vin/{href}"
+    return href
+
+def _collect_homepage_links(soup):
+    """Ana sayfadaki kanal linklerini ve işlenecek kategori sayfalarını döndürür"""
+    # Tüm potansiyel linkleri topla
+    all_links = set()
+    for a_tag in soup.find_all('a', href=True):
+        # Tam URL'e dönüştür
+        href = _normalize_site_href(a_tag['href'])
+        
+        # Kanal olabilecek linkleri filtrele
+        if any(keyword in href.lower() for keyword in ['canli', 'izle', 'yayin']) and 'category' not in href:
+            all_links.add(href)
+    
+    # Menü öğelerini ve kategori sayfalarını işle
+    category_urls = []
+    menu_items = soup.select('.navbar-nav .nav-item a, .sidebar .widget a')
+    for item in menu_items:
+        href = item.get('href')
+        if href and ('category' in href or 'etiket' in href):
+            category_urls.append(href)
+    
+    return all_links, category_urls
+
+def _collect_category_links(soup):
+    """Kategori sayfasındaki kanal linklerini döndürür"""
+    links = set()
+    for cat_link in soup.find_all('a', href=True):
+        cat_href = cat_link['href']
+        if any(keyword in cat_href.lower() for keyword in ['canli', 'izle', 'yayin']) and 'category' not in cat_href:
+            links.add(_normalize_site_href(cat_href))
+    return links
+
+def _expand_channel_links(all_links):
+    """Bulunan linklere alternatif URL formatlarını ve bilinen kanal URL'lerini ekler"""
+    # Tespit edilen URL'lerden kanal adlarını çıkar ve alternatif formatlar oluştur
+    channel_names = set()
+    for link in all_links:
+        parts = link.split('/')
+        if len(parts) > 3:
+            channel_name = parts[-1]
+            if 'canli' in channel_name or 'izle' in channel_name:
+                base_name = channel_name.replace('-canli', '').replace('-izle', '').replace('-yayin', '')
+                channel_names.add(base_name)
+    
+    # Alternatif URL formatları oluştur
+    for name in list(channel_names):
+        all_links.add(f"https://www.canlitv.vin/{name}-canli")
+        all_links.add(f"https://www.canlitv.vin/{name}-canli-izle")
+        all_links.add(f"https://www.canlitv.vin/{name}-canli-yayin")
+    
+    # Bilinen URL'leri ekle (hata durumlarına karşı)
+    for url in KNOWN_CHANNEL_URLS:
+        all_links.add(url)
+    
+    return all_links
+
+def collect_channel_links():
+    """
+    Ana sayfa ve kategori sayfalarındaki kanal linklerini (henüz kontrol edilmemiş) toplar ve
+    aynı kanalın farklı slug'larını tek kayıtta birleştiren bir ChannelCatalog döndürür
+    """
+    response = cached_get("https://www.canlitv.vin", timeout=10)
+    response.raise_for_status()
+    
+    # Sayfa değişmediyse önceki ayrıştırma sonucunu kullan
+    parsed = http_cache.get_derived(response.content_hash, 'homepage_links')
+    if parsed:
+        all_links, category_urls = set(parsed[0]), parsed[1]
+    else:
+        soup = make_soup(response.text)
+        all_links, category_urls = _collect_homepage_links(soup)
+        http_cache.set_derived(response.content_hash, 'homepage_links', [sorted(all_links), category_urls])
+    
+    for href in category_urls:
+        try:
+            category_response = cached_get(href, timeout=10)
+            category_links = http_cache.get_derived(category_response.content_hash, 'category_links')
+            if category_links is None:
+                category_soup = make_soup(category_response.text)
+                category_links = sorted(_collect_category_links(category_soup))
+                http_cache.set_derived(category_response.content_hash, 'category_links', category_links)
+            all_links.update(category_links)
+        except Exception as e:
+            logger.error(f"Kategori sayfası işlenirken hata: {e}")
+            continue
+    
+    return ChannelCatalog.from_links(all_links)
+
+def get_all_channel_urls():
+    """
+    Ana sayfayı analiz ederek tüm kanal linklerini çıkarır
+    """
+    logger.info("Tüm kanal URL'leri toplanıyor...")
+    try:
+        catalog = collect_channel_links()
+        
+        # URL'leri kontrol et ve düzelt (kanal başına bir URL, diğer slug'lar yedek aday)
+        checked_urls = check_and_fix_urls(catalog.primary_urls(), catalog.alias_map())
         
         logger.info(f"Toplam {len(checked_urls)} kanal URL'si bulundu")
         return checked_urls
@@ -182,46 +1189,101 @@ def get_all_channel_urls():
         logger.error(f"Tüm kanal URL'leri toplanırken hata: {e}")
         return []
 
-def check_and_fix_urls(url_list):
-    """URL'leri kontrol eder, çalışmayanları otomatik düzeltmeye çalışır."""
+def _url_format_variants(url):
+    """Çalışmayan bir kanal URL'si için denenecek alternatif formatları döndürür"""
+    channel_name = url.rstrip('/').split('/')[-1]
+    return [
+        f"{BASE_URL}{channel_name.replace('-canli', '')}-canli-yayin",
+        f"{BASE_URL}{channel_name.replace('-izle', '')}-canli-izle",
+        f"{BASE_URL}{channel_name.replace('-tv', '')}-televizyonu-canli-izle",
+        f"{BASE_URL}{channel_name.split('-')[0]}-tv-canli-yayin"
+    ]
+
+def _url_slug(url):
+    """URL'nin son yol parçasını (kanal slug'ını) döndürür"""
+    return url.rstrip('/').split('/')[-1]
+
+def _probe_candidates(url, aliases=()):
+    """
+    Bir URL için denenecek adayları öncelik sırasıyla döndürür:
+    önce bu slug için daha önce çalıştığı bilinen varyant, sonra URL'nin kendisi, sonra katalogdaki
+    aynı kanala ait diğer slug'lar, sonra format varyasyonları.
+    """
+    candidates = []
+    for candidate in [slug_variant_memory.get(_url_slug(url)), url] + list(aliases) + _url_format_variants(url):
+        if candidate and candidate not in candidates:
+            candidates.append(candidate)
+    return candidates
+
+def _probe_url(url):
+    """URL'ye HEAD isteği gönderir, (çalışıyor mu, istek hatası oldu mu) döndürür"""
+    try:
+        response = http_head(url, headers={"User-Agent": USER_AGENT}, timeout=5)
+        return response.status_code < 400, False
+    except Exception:
+        return False, True
+
+def _remember_probe_result(url, chosen):
+    """Doğrulanmış sonucu slug hafızasına yazar; yalnızca varyant kullanıldığında ya da kayıt değiştiğinde"""
+    slug = _url_slug(url)
+    if chosen != url or slug_variant_memory.get(slug) not in (None, chosen):
+        slug_variant_memory.remember(slug, chosen)
+
+def _check_url(url, aliases=()):
+    """
+    Bir URL'nin adaylarını öncelik sırasıyla tek tek dener ve (seçilen URL, doğrulandı mı) döndürür.
+    Varyasyonlar yalnızca önceki aday çalışmadığında denenir; böylece çalışan bir kanal için
+    host'a tek HEAD isteği gider.
+    """
+    for candidate in _probe_candidates(url, aliases):
+        ok, errored = _probe_url(candidate)
+        if ok:
+            return candidate, True
+        if errored and candidate == url:
+            # İstek hatası, URL'yi olduğu gibi ekle
+            return url, False
+    return None, False
+
+def iter_checked_urls(url_list, aliases=None):
+    """
+    URL'leri kontrol eder, çalışmayanları otomatik düzeltmeye çalışır ve her URL'nin sonucunu
+    hazır olur olmaz (url, seçilen URL) olarak döndürür; sıra tamamlanma sırasıdır.
+    aliases verilirse her URL için oradaki diğer slug'lar da aday olarak denenir.
+    Farklı URL'ler paralel kontrol edilir; bir URL'nin varyasyonları ise ancak orijinal
+    adres başarısız olursa sırayla denenir.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix='probe')
+    try:
+        futures = {executor.submit(_check_url, url, (aliases or {}).get(url, ())): url for url in url_list}
+        for future in concurrent.futures.as_completed(futures):
+            url = futures[future]
+            chosen, verified = future.result()
+            if chosen and verified:
+                _remember_probe_result(url, chosen)
+            yield url, chosen
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        slug_variant_memory.save()
+
+def check_and_fix_urls(url_list, aliases=None):
+    """
+    URL'leri kontrol eder, çalışmayanları otomatik düzeltmeye çalışır.
+    Çalışan (ya da düzeltilmiş) URL'lerin listesini döndürür.
+    """
     working_urls = []
     fixed_count = 0
     
-    for url in url_list:
-        try:
-            # Önce URL'yi olduğu gibi dene
-            response = requests.head(url, headers={"User-Agent": USER_AGENT}, timeout=5)
-            
-            if response.status_code < 400:
-                # URL çalışıyor
-                working_urls.append(url)
-                logger.info(f"URL çalışıyor: {url}")
-            else:
-                # URL çalışmıyor, düzeltmeye çalış
-                channel_name = url.rstrip('/').split('/')[-1]
-                
-                # Format varyasyonlarını dene
-                format_variants = [
-                    f"{BASE_URL}{channel_name.replace('-canli', '')}-canli-yayin",
-                    f"{BASE_URL}{channel_name.replace('-izle', '')}-canli-izle",
-                    f"{BASE_URL}{channel_name.replace('-tv', '')}-televizyonu-canli-izle",
-                    f"{BASE_URL}{channel_name.split('-')[0]}-tv-canli-yayin"
-                ]
-                
-                for variant in format_variants:
-                    try:
-                        variant_response = requests.head(variant, headers={"User-Agent": USER_AGENT}, timeout=5)
-                        if variant_response.status_code < 400:
-                            # Düzeltilmiş URL çalışıyor
-                            working_urls.append(variant)
-                            logger.info(f"URL düzeltildi: {url} -> {variant}")
-                            fixed_count += 1
-                            break
-                    except:
-                        continue
-        except Exception as e:
-            # İstek hatası, URL'yi olduğu gibi ekle
-            working_urls.append(url)
+    for url, chosen in iter_checked_urls(url_list, aliases):
+        if not chosen:
+            continue
+        
+        working_urls.append(chosen)
+        if chosen == url:
+            logger.info(f"URL çalışıyor: {url}")
+        else:
+            # Düzeltilmiş URL çalışıyor
+            logger.info(f"URL düzeltildi: {url} -> {chosen}")
+            fixed_count += 1
     
     logger.info(f"URL kontrolü tamamlandı: {len(working_urls)} çalışan URL, {fixed_count} URL düzeltildi")
     return working_urls
@@ -297,22 +1359,28 @@ def use_fallback_method():
         for category_url in category_urls:
             try:
                 logger.info(f"Kategori sayfası yükleniyor: {category_url}")
-                response = requests.get(category_url, headers=headers, timeout=10)
+                response = cached_get(category_url, headers=headers, timeout=10)
                 
                 if response.status_code != 200:
                     logger.warning(f"Kategori sayfası yüklenemedi: {category_url}")
                     continue
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                links = soup.find_all('a', href=True)
+                # Sayfa değişmediyse önceki ayrıştırma sonucunu kullan
+                category_links = http_cache.get_derived(response.content_hash, 'fallback_links')
+                if category_links is None:
+                    category_links = []
+                    soup = make_soup(response.text)
+                    for link in soup.find_all('a', href=True):
+                        href = link.get('href')
+                        if href and ('/izle/' in href or '/canli-' in href):
+                            if not href.startswith('http'):
+                                href = urllib.parse.urljoin(BASE_URL, href)
+                            category_links.append(href)
+                    http_cache.set_derived(response.content_hash, 'fallback_links', category_links)
                 
-                for link in links:
-                    href = link.get('href')
-                    if href and ('/izle/' in href or '/canli-' in href):
-                        if not href.startswith('http'):
-                            href = urllib.parse.urljoin(BASE_URL, href)
-                        all_channel_urls.append(href)
-                        logger.info(f"Kategori sayfasından kanal URL'si eklendi: {href}")
+                for href in category_links:
+                    all_channel_urls.append(href)
+                    logger.info(f"Kategori sayfasından kanal URL'si eklendi: {href}")
             
             except Exception as e:
                 logger.error(f"Kategori sayfası işlenirken hata: {category_url} - {str(e)}")
@@ -336,79 +1404,679 @@ def use_fallback_method():
         logger.warning("Statik kanal listesi kullanılıyor...")
         return static_channels
 
-def get_channels():
-    """Tüm kanal URL'lerinden kanal bilgilerini oluşturur."""
+def build_channel_name(url):
+    """Kanal URL'sinden okunabilir bir kanal adı üretir"""
     try:
-        # Tüm kanal URL'lerini al
-        channel_urls = get_all_channel_urls()
+        # URL'den kanal adını çıkar
+        channel_name = url.split('/')[-1].replace('-', ' ').strip()
+        
+        # "canli" ve "izle" gibi gereksiz kelimeleri kaldır
+        for word in ['canli', 'izle', 'live', 'watch', 'tv', 'online', 'hd']:
+            channel_name = channel_name.replace(word, '').strip()
+        
+        # Fazladan boşlukları temizle
+        channel_name = ' '.join(channel_name.split())
+        
+        # Azerbaycan kanalları için özel işleme
+        if 'azerbaycan' in url.lower() or 'azeri' in url.lower():
+            if 'azerbaycan' not in channel_name.lower() and 'azeri' not in channel_name.lower():
+                channel_name = f"{channel_name} (Azerbaycan)"
+        
+        # İlk harfleri büyük yap, ancak yaygın kısaltmalara dikkat et
+        words = channel_name.split()
+        capitalized_words = []
+        
+        for word in words:
+            # TRT, CNN, NTV gibi kısaltmalar büyük harfle yazılır
+            if len(word) <= 3 and word.lower() not in ['ve', 'ile', 'bir', 'the', 'and']:
+                capitalized_words.append(word.upper())
+            else:
+                capitalized_words.append(word.capitalize())
         
-        if not channel_urls:
-            logger.error("Hiç kanal URL'si bulunamadı!")
+        channel_name = ' '.join(capitalized_words)
+        
+        # Kanal D, Show TV gibi özel formatları düzelt
+        for special_name in ['Kanal D', 'Show TV', 'Fox TV', 'Star TV', 'TV 8', 'TRT 1', 'TRT 2']:
+            lower_name = channel_name.lower()
+            lower_special = special_name.lower()
+            if lower_special.replace(' ', '') in lower_name.replace(' ', ''):
+                channel_name = special_name
+                break
+        
+        # "TV" formatını normalize et
+        channel_name = channel_name.replace('Tv', 'TV')
+        
+    except:
+        # Hata durumunda basit isimlendirme kullan
+        channel_name = url.split('/')[-1].replace('-', ' ').title()
+    
+    return channel_name
+
+# Kanal slug'larındaki kanal kimliğine ait olmayan kelimeler
+CHANNEL_SLUG_NOISE = ('canli', 'izle', 'yayin', 'canliyayin', 'hd', 'hdizle', 'live', 'watch', 'online')
+CHANNEL_SLUG_NOISE_SUFFIXES = sorted(CHANNEL_SLUG_NOISE, key=len, reverse=True)
+TURKISH_ASCII_MAP = str.maketrans('çğıöşüÇĞİÖŞÜ', 'cgiosuCGIOSU')
+
+def canonical_channel_id(url):
+    """
+    Kanal URL'sinden kanonik kanal kimliği üretir: show-tv-canli-yayin, showtvcanli ve
+    show-tv-canli-izle hepsi 'show' olur. Kimliğin parçası olan 'tv' (atv, tv8) korunur.
+    """
+    slug = urllib.parse.urlsplit(url).path.rstrip('/').split('/')[-1].lower().translate(TURKISH_ASCII_MAP)
+    tokens = [token for token in re.split(r'[^a-z0-9]+', slug) if token and token not in CHANNEL_SLUG_NOISE]
+    if len(tokens) > 1:
+        tokens = [token for token in tokens if token != 'tv'] or tokens
+    channel_id = ''.join(tokens) or slug
+    
+    # Birleşik yazılmış ekler: startvcanli, atvcanli-hdizle, trt1-canliyayin
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in CHANNEL_SLUG_NOISE_SUFFIXES:
+            if channel_id.endswith(suffix) and len(channel_id) - len(suffix) >= 2:
+                channel_id = channel_id[:-len(suffix)]
+                stripped = True
+                break
+    if channel_id.endswith('tv') and len(channel_id) >= 5:
+        channel_id = channel_id[:-2]
+    return channel_id
+
+def normalize_channel_name(name):
+    """Kanal adını karşılaştırma için sadeleştirir: küçük harf, Türkçe karaktersiz, yalnızca harf/rakam"""
+    return re.sub(r'[^a-z0-9]+', '', name.translate(TURKISH_ASCII_MAP).lower())
+
+class ChannelCatalog:
+    """
+    Bir çalıştırmada bulunan kanal URL'lerinin kanonik kimliğe göre dizini.
+    Her kimlik için ilk eklenen URL birincil adres, aynı kanala çıkan diğer slug'lar takma addır;
+    ağ işinden önce kurulur ki aynı kanal birden fazla kez kontrol edilip çıkarılmasın.
+    Kimlikleri farklı olsa da görünen adları sadeleştirildiğinde aynı olan slug'lar da (ör.
+    kimlik kurallarının yakalamadığı bir ek) sadeleştirilmiş ad dizini üzerinden aynı kanala bağlanır.
+    """
+    
+    def __init__(self):
+        self._entries = {}  # kimlik -> {'id', 'name', 'url', 'aliases'}
+        self._by_url = {}
+        self._by_name = {}  # sadeleştirilmiş ad -> kimlik
+    
+    @classmethod
+    def from_links(cls, site_links):
+        """
+        Sitede bulunan linklerle (önce, birincil adres olmaya öncelikli) ve onlardan türetilen
+        alternatif formatlar ile bilinen kanal URL'leriyle (sonra, takma ad olarak) katalog kurar
+        """
+        catalog = cls()
+        site_links = set(site_links)
+        for url in sorted(site_links):
+            catalog.add(url)
+        for url in sorted(_expand_channel_links(set(site_links)) - site_links):
+            catalog.add(url)
+        logger.info(f"Kanal kataloğu: {len(site_links)} site linki, {len(catalog)} benzersiz kanal")
+        return catalog
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def add(self, url):
+        """URL'yi kataloğa ekler ve kanal kimliğini döndürür"""
+        if url in self._by_url:
+            return self._by_url[url]
+        channel_id = canonical_channel_id(url)
+        entry = self._entries.get(channel_id)
+        if entry is None:
+            name = build_channel_name(url)
+            normalized = normalize_channel_name(name)
+            entry = self._entries.get(self._by_name.get(normalized)) if normalized else None
+            if entry is None:
+                entry = self._entries[channel_id] = {'id': channel_id, 'name': name, 'url': url, 'aliases': []}
+                if normalized:
+                    self._by_name[normalized] = channel_id
+                self._by_url[url] = channel_id
+                return channel_id
+        entry['aliases'].append(url)
+        self._by_url[url] = entry['id']
+        return entry['id']
+    
+    def get(self, url):
+        """URL'nin (birincil ya da takma ad) ait olduğu kanal kaydını döndürür"""
+        channel_id = self._by_url.get(url)
+        if channel_id is None:
+            channel_id = canonical_channel_id(url)
+        return self._entries.get(channel_id)
+    
+    def primary_urls(self):
+        return [entry['url'] for entry in self._entries.values()]
+    
+    def alias_map(self):
+        """Birincil URL -> aynı kanalın diğer slug'ları"""
+        return {entry['url']: entry['aliases'] for entry in self._entries.values() if entry['aliases']}
+    
+    def new_channel(self, url):
+        """Kontrol edilmiş URL için kanal sözlüğü oluşturur (ad ve kimlik katalogdan)"""
+        entry = self.get(url)
+        if entry is None:
+            self.add(url)
+            entry = self.get(url)
+        return {'id': entry['id'], 'name': entry['name'], 'url': url, 'm3u_url': None}
+
+def _unique_channels(channel_urls):
+    """Kontrol edilmiş URL'lerden kanal sözlükleri oluşturur; aynı kanal kimliğine çıkan URL'ler atlanır"""
+    catalog = ChannelCatalog()
+    channels = []
+    for url in channel_urls:
+        channel = catalog.new_channel(url)
+        if channel['url'] == catalog.get(url)['url']:
+            channels.append(channel)
+    return channels
+
+def _mark_strategy(channel_info, m3u_url, strategy):
+    """Çıkarmada başarılı olan yöntemi kanal bilgisine işler ve URL'yi aynen döndürür"""
+    channel_info['strategy'] = strategy
+    return m3u_url
+
+def _absolute_url(url, base_url):
+    """Göreli ya da protokolsüz URL'yi tam URL'e çevirir"""
+    if url.startswith('http'):
+        return url
+    if url.startswith('//'):
+        return 'https:' + url
+    return urllib.parse.urljoin(base_url, url)
+
+def _has_m3u(value):
+    return bool(value) and '.m3u' in value
+
+class PageIndex:
+    """
+    Bir HTML belgesinin tek geçişte çıkarılmış özeti.
+    Belge bir kez ayrıştırılır ve tüm etiketler bir kez dolaşılır; iframe'ler, video/source
+    kaynakları, data-* öznitelikleri, script gövdeleri ve oynatıcı elementleri burada toplanır.
+    Çıkarma yöntemlerinin hepsi ağacı yeniden dolaşmak yerine bu indeksten çalışır.
+    """
+    
+    def __init__(self, html_content):
+        self.iframes = []  # Belge sırasıyla iframe src değerleri (src yoksa None)
+        self.videos = []  # Belge sırasıyla (video src, [source src, ...])
+        self.scripts = []  # Satır içi script gövdeleri
+        self.data_urls = []  # m3u içeren (data-* özniteliği, değer) çiftleri
+        self.players = {}  # Seçici -> ilk eşleşen oynatıcı elementinin özeti
+        self._build(make_soup(html_content))
+    
+    def _build(self, soup):
+        players_by_element = {}
+        for element in soup.find_all(True):
+            attrs = element.attrs
+            
+            # Oynatıcı seçicileri: her seçici için belgedeki ilk eşleşme (select_one ile aynı)
+            element_id = attrs.get('id')
+            element_classes = attrs.get('class') or []
+            if element_id in PLAYER_IDS or PLAYER_CLASSES.intersection(element_classes):
+                for selector in _matching_player_selectors(element_id, element_classes):
+                    if selector not in self.players:
+                        info = players_by_element.get(id(element))
+                        if info is None:
+                            info = {
+                                'iframe': None,
+                                'has_iframe': False,
+                                'video': None,
+                                'data': {attr: attrs.get(attr) for attr in PLAYER_DATA_ATTRS if attrs.get(attr)},
+                            }
+                            players_by_element[id(element)] = info
+                        self.players[selector] = info
+            
+            for attr, value in attrs.items():
+                if attr.startswith('data-') and isinstance(value, str) and '.m3u' in value:
+                    self.data_urls.append((attr, value))
+            
+            name = element.name
+            if name == 'iframe':
+                src = attrs.get('src')
+                self.iframes.append(src)
+                for info in self._enclosing_players(element, players_by_element):
+                    if not info['has_iframe']:
+                        info['has_iframe'] = True
+                        info['iframe'] = src
+            elif name == 'video':
+                video = (attrs.get('src'), [source.get('src') for source in element.find_all('source')])
+                self.videos.append(video)
+                for info in self._enclosing_players(element, players_by_element):
+                    if info['video'] is None:
+                        info['video'] = video
+            elif name == 'script':
+                if element.string:
+                    self.scripts.append(element.string)
+    
+    @staticmethod
+    def _enclosing_players(element, players_by_element):
+        if not players_by_element:
             return []
+        return [players_by_element[id(parent)] for parent in element.parents if id(parent) in players_by_element]
+    
+    def video_m3u_sources(self):
+        """Video src ve source etiketlerindeki m3u URL'lerini belge sırasıyla döndürür"""
+        results = []
+        for video_src, source_srcs in self.videos:
+            if _has_m3u(video_src):
+                results.append(('video', video_src))
+            for source_src in source_srcs:
+                if _has_m3u(source_src):
+                    results.append(('source', source_src))
+        return results
+
+def make_soup(html_content):
+    """Seçili ayrıştırıcı ile BeautifulSoup ağacı oluşturur, lxml kurulu değilse html.parser kullanılır"""
+    try:
+        return BeautifulSoup(html_content, HTML_PARSER)
+    except FeatureNotFound:
+        return BeautifulSoup(html_content, 'html.parser')
+
+def _matching_player_selectors(element_id, element_classes):
+    for selector in PLAYER_SELECTORS:
+        if selector[0] == '#' and selector[1:] == element_id:
+            yield selector
+        elif selector[0] == '.' and selector[1:] in element_classes:
+            yield selector
+
+class ExtractionContext:
+    """Bir kanal için çıkarma yöntemlerinin paylaştığı sayfa ve istek bilgisi"""
+    
+    def __init__(self, channel_info, headers, html_content):
+        self.channel_info = channel_info
+        self.url = channel_info['url']
+        self.slug = _url_slug(channel_info['url'])
+        self.headers = headers
+        self.html_content = html_content
+        self.index = PageIndex(html_content)
+        self.candidates = []  # Yöntemlerin gördüğü tüm m3u adayları
+    
+    def iframe_headers(self):
+        iframe_headers = self.headers.copy()
+        iframe_headers['Referer'] = self.url
+        return iframe_headers
+    
+    def add_candidate(self, url, source, base_url=None):
+        """Etiket ya da öznitelikten gelen bir adayı kaydeder"""
+        candidate = {'url': _absolute_url(url, base_url or self.url), 'source': source, 'path': ()}
+        self.candidates.append(candidate)
+        return candidate
+    
+    def find_m3u(self, content, base_url=None):
+        """İçerikteki tüm adayları kaydeder ve en yüksek puanlısının URL'sini döndürür"""
+        candidates = find_m3u_candidates(content, base_url or self.url)
+        self.candidates.extend(candidates)
+        return candidates[0]['url'] if candidates else None
+    
+    def collect_page_candidates(self):
+        """Kanal sayfasının kendisinden, ağ isteği gerektirmeyen tüm adayları toplar"""
+        for tag, src in self.index.video_m3u_sources():
+            self.add_candidate(src, tag)
+        for attr, value in self.index.data_urls:
+            self.add_candidate(value, 'data')
+        for iframe_src in self.index.iframes:
+            if _has_m3u(iframe_src):
+                self.add_candidate(iframe_src, 'iframe')
+        self.find_m3u(self.html_content)
+    
+    def strategy_scope(self):
+        """
+        Yöntem istatistiklerinin kapsamı: host ve sayfadaki oynatıcı yerleşimi (aynı sitedeki
+        iframe'lerin dosya adları, dış iframe host'ları, oynatıcı elementi). Aynı yerleşime
+        sahip sayfalar aynı yöntemlerle çözülür; bir yerleşimdeki sonuç diğerlerini etkilemez.
+        """
+        host = urllib.parse.urlsplit(self.url).netloc
+        features = set()
+        for iframe_src in self.index.iframes:
+            if not iframe_src:
+                continue
+            parts = urllib.parse.urlsplit(_absolute_url(iframe_src, self.url))
+            features.add(parts.path.rsplit('/', 1)[-1] if parts.netloc == host else parts.netloc)
+        if any(self.index.players.get(selector) for selector in PLAYER_SELECTORS):
+            features.add('player')
+        return f"{host}|{','.join(sorted(features))}"
+    
+    def ranked_candidates(self, chosen_url):
+        """Seçilen URL başta olmak üzere adayları puan sırasıyla döndürür"""
+        ranked = rank_m3u_candidates(self.candidates)
+        chosen = next((candidate for candidate in ranked if candidate['url'] == chosen_url), None)
+        if chosen is None:
+            chosen = {'url': chosen_url, 'source': self.channel_info.get('strategy'), 'path': ()}
+            chosen['score'] = score_m3u_candidate(chosen)
+        others = [candidate for candidate in ranked if candidate is not chosen]
+        return ([chosen] + others)[:M3U_CANDIDATE_LIMIT]
+
+def _best_candidate_url(candidates):
+    ranked = rank_m3u_candidates(candidates)
+    return ranked[0]['url'] if ranked else None
+
+def _is_geolive_iframe(iframe_src):
+    return bool(iframe_src) and 'geolive.php' in iframe_src and 'kanal=' in iframe_src
+
+# Yöntem bu sayfada uygulanamadığında (ilgili öğe yok, bağımlılık kurulu değil) döner;
+# gerçek bir deneme sayılmaz ve istatistiklere yazılmaz
+STRATEGY_NOT_APPLICABLE = object()
+
+def _strategy_geolive(context):
+    """ÖZEL İŞLEME: canlitv.vin için geolive.php iframeler (yüksek öncelik)"""
+    for iframe_src in context.index.iframes:
+        if _is_geolive_iframe(iframe_src):
+            logger.info(f"GeoLive iframe bulundu: {iframe_src}")
+            return process_geolive_iframe(iframe_src, context.url, candidates=context.candidates)
+    return STRATEGY_NOT_APPLICABLE
+
+def _strategy_kanallar_iframe(context):
+    """kanallar.php iframe'ini işler - canlitv.vin'in özel formatı"""
+    applicable = False
+    for iframe_index, iframe_src in enumerate(context.index.iframes):
+        if not iframe_src or 'kanallar.php' not in iframe_src:
+            continue
+        logger.info(f"kanallar.php iframe bulundu: {iframe_src}")
         
-        # URL'lerden kanal bilgilerini oluştur
-        channels = []
-        for url in channel_urls:
-            # Kanal adını URL'den çıkar ve düzelt
-            try:
-                # URL'den kanal adını çıkar
-                channel_name = url.split('/')[-1].replace('-', ' ').strip()
-                
-                # "canli" ve "izle" gibi gereksiz kelimeleri kaldır
-                for word in ['canli', 'izle', 'live', 'watch', 'tv', 'online', 'hd']:
-                    channel_name = channel_name.replace(word, '').strip()
-                
-                # Fazladan boşlukları temizle
-                channel_name = ' '.join(channel_name.split())
-                
-                # Azerbaycan kanalları için özel işleme
-                if 'azerbaycan' in url.lower() or 'azeri' in url.lower():
-                    if 'azerbaycan' not in channel_name.lower() and 'azeri' not in channel_name.lower():
-                        channel_name = f"{channel_name} (Azerbaycan)"
-                
-                # İlk harfleri büyük yap, ancak yaygın kısaltmalara dikkat et
-                words = channel_name.split()
-                capitalized_words = []
-                
-                for word in words:
-                    # TRT, CNN, NTV gibi kısaltmalar büyük harfle yazılır
-                    if len(word) <= 3 and word.lower() not in ['ve', 'ile', 'bir', 'the', 'and']:
-                        capitalized_words.append(word.upper())
-                    else:
-                        capitalized_words.append(word.capitalize())
-                
-                channel_name = ' '.join(capitalized_words)
-                
-                # Kanal D, Show TV gibi özel formatları düzelt
-                for special_name in ['Kanal D', 'Show TV', 'Fox TV', 'Star TV', 'TV 8', 'TRT 1', 'TRT 2']:
-                    lower_name = channel_name.lower()
-                    lower_special = special_name.lower()
-                    if lower_special.replace(' ', '') in lower_name.replace(' ', ''):
-                        channel_name = special_name
-                        break
+        # kanallar.php parametrelerini çıkar
+        kanal_param = None
+        if '?' in iframe_src:
+            for param in iframe_src.split('?')[1].split('&'):
+                if param.startswith('kanal='):
+                    kanal_param = param.split('=')[1]
+                    break
+        if not kanal_param:
+            continue
+        applicable = True
+        logger.info(f"Kanal parametresi bulundu: {kanal_param}")
+        
+        iframe_url = _absolute_url(iframe_src, BASE_URL)
+        try:
+            iframe_response = cached_get(iframe_url, headers=context.iframe_headers(), timeout=10)
+            iframe_content = iframe_response.text
+            
+            # iframe içeriğini debug için kaydet
+            snapshot_writer.submit(f"{context.slug}_iframe_{iframe_index}.html", iframe_content)
+            
+            # iframe içinde m3u URL'lerini ara: önce video/source etiketleri, sonra tüm içerik
+            iframe_index_data = PageIndex(iframe_content)
+            tag_candidates = [context.add_candidate(src, tag, iframe_url)
+                              for tag, src in iframe_index_data.video_m3u_sources()]
+            m3u_url = _best_candidate_url(tag_candidates)
+            if m3u_url:
+                logger.info(f"Video/source tag'i içinde m3u bulundu: {m3u_url}")
+                return m3u_url
+            
+            m3u_url = context.find_m3u(iframe_content, iframe_url)
+            if m3u_url:
+                logger.info(f"iframe içeriğinde m3u bulundu: {m3u_url}")
+                return m3u_url
+        except Exception as iframe_error:
+            logger.warning(f"iframe içeriği incelenirken hata: {iframe_error}")
+    return None if applicable else STRATEGY_NOT_APPLICABLE
+
+def _strategy_iframe_src(context):
+    """İframe src'si doğrudan m3u formatındaysa onu döndürür"""
+    iframe_candidates = []
+    for iframe_src in context.index.iframes:
+        if not iframe_src or 'kanallar.php' in iframe_src:
+            continue
+        if iframe_src.endswith('.m3u') or '.m3u8' in iframe_src:
+            iframe_candidates.append(context.add_candidate(iframe_src, 'iframe'))
+    if not iframe_candidates:
+        return STRATEGY_NOT_APPLICABLE
+    m3u_url = _best_candidate_url(iframe_candidates)
+    if m3u_url:
+        logger.info(f"İframe src içinde doğrudan m3u URL'si bulundu: {m3u_url}")
+    return m3u_url
+
+def _strategy_nested_iframe(context):
+    """Diğer tüm iframe'lerin içeriğini indirip m3u arar"""
+    applicable = False
+    for iframe_index, iframe_src in enumerate(context.index.iframes):
+        if not iframe_src or 'kanallar.php' in iframe_src or _has_m3u(iframe_src):
+            continue
+        # GeoLive iframe'leri kendi yöntemiyle zaten incelendi
+        if _is_geolive_iframe(iframe_src):
+            continue
+        applicable = True
+        
+        full_iframe_src = _absolute_url(iframe_src, context.url)
+        try:
+            iframe_response = cached_get(full_iframe_src, headers=context.iframe_headers(), timeout=10)
+            if iframe_response.status_code == 200:
+                nested_content = iframe_response.text
                 
-                # "TV" formatını normalize et
-                channel_name = channel_name.replace('Tv', 'TV')
+                # Debug için kaydet
+                snapshot_writer.submit(f"{context.slug}_iframe_{iframe_index}.html", nested_content)
                 
-            except:
-                # Hata durumunda basit isimlendirme kullan
-                channel_name = url.split('/')[-1].replace('-', ' ').title()
+                m3u_url = context.find_m3u(nested_content, full_iframe_src)
+                if m3u_url:
+                    logger.info(f"Nested iframe içinden m3u URL bulundu: {m3u_url}")
+                    return m3u_url
+        except Exception as nested_error:
+            logger.warning(f"Nested iframe hatası: {nested_error}")
+    return None if applicable else STRATEGY_NOT_APPLICABLE
+
+def _strategy_player(context):
+    """Bilinen video oynatıcı elementlerinin içindeki iframe, video ve data özniteliklerini inceler"""
+    if not any(context.index.players.get(selector) for selector in PLAYER_SELECTORS):
+        return STRATEGY_NOT_APPLICABLE
+    for selector in PLAYER_SELECTORS:
+        player = context.index.players.get(selector)
+        if not player:
+            continue
+        logger.info(f"Player elementi bulundu: {selector}")
+        
+        # Player içinde iframe var mı?
+        if player['iframe']:
+            iframe_src = _absolute_url(player['iframe'], context.url)
+            logger.info(f"Player içinde iframe bulundu: {iframe_src}")
             
-            channels.append({
-                'name': channel_name,
-                'url': url,
-                'm3u_url': None  # İlk aşamada boş, sonra doldurulacak
-            })
+            if '.m3u' in iframe_src:
+                context.add_candidate(iframe_src, 'iframe')
+                logger.info(f"Player iframe src içinde m3u linki bulundu: {iframe_src}")
+                return iframe_src
+            
+            try:
+                iframe_response = cached_get(iframe_src, headers=context.iframe_headers(), timeout=10)
+                if iframe_response.status_code == 200:
+                    m3u_url = context.find_m3u(iframe_response.text, iframe_src)
+                    if m3u_url:
+                        logger.info(f"Player iframe içinde m3u bulundu: {m3u_url}")
+                        return m3u_url
+            except Exception as player_iframe_error:
+                logger.warning(f"Player iframe işlenirken hata: {player_iframe_error}")
         
-        logger.info(f"Toplam {len(channels)} kanal bilgisi oluşturuldu")
-        return channels
+        # Player içinde video veya source elementleri ve data attribute'ları
+        player_candidates = []
+        if player['video']:
+            video_src, source_srcs = player['video']
+            for tag, src in [('video', video_src)] + [('source', src) for src in source_srcs]:
+                if _has_m3u(src):
+                    player_candidates.append(context.add_candidate(src, tag))
+        for data_attr in PLAYER_DATA_ATTRS:
+            attr_value = player['data'].get(data_attr)
+            if _has_m3u(attr_value):
+                player_candidates.append(context.add_candidate(attr_value, 'data'))
         
-    except Exception as e:
-        logger.error(f"Kanal bilgileri oluşturulurken hata: {str(e)}")
-        return []
+        m3u_url = _best_candidate_url(player_candidates)
+        if m3u_url:
+            logger.info(f"Player elementi içinde m3u bulundu: {m3u_url}")
+            return m3u_url
+    return None
+
+def _strategy_video_tag(context):
+    """Sayfadaki tüm video/source elementlerini ve data-* özniteliklerini kontrol eder"""
+    tag_candidates = [context.add_candidate(src, tag) for tag, src in context.index.video_m3u_sources()]
+    tag_candidates.extend(context.add_candidate(value, 'data') for _, value in context.index.data_urls)
+    m3u_url = _best_candidate_url(tag_candidates)
+    if m3u_url:
+        logger.info(f"Video/source tag'i ya da data özniteliği içinde m3u bulundu: {m3u_url}")
+    return m3u_url
+
+def _strategy_script(context):
+    """Sayfa içindeki script elementlerini kontrol eder"""
+    script_candidates = []
+    for script_content in context.index.scripts:
+        script_candidates.extend(find_m3u_candidates(script_content, context.url))
+    context.candidates.extend(script_candidates)
+    m3u_url = _best_candidate_url(script_candidates)
+    if m3u_url:
+        logger.info(f"Script içinde m3u bulundu: {m3u_url}")
+    return m3u_url
+
+def _strategy_page_regex(context):
+    """Sayfa içeriğinin tamamında m3u URL'leri arar"""
+    m3u_url = context.find_m3u(context.html_content)
+    if m3u_url:
+        logger.info(f"Sayfa içeriğinde m3u bulundu: {m3u_url}")
+    return m3u_url
+
+def _strategy_js_eval(context):
+    """Satır içi scriptleri gömülü JS yorumlayıcısında çalıştırıp oynatıcıya verilen URL'yi yakalar"""
+    if not JS_EVAL_ENABLED or not context.index.scripts or _get_quickjs() is None:
+        return STRATEGY_NOT_APPLICABLE
+    js_candidates = [context.add_candidate(url, 'js_eval') for url in evaluate_scripts_for_m3u(context.index.scripts, context.url)]
+    m3u_url = _best_candidate_url(js_candidates)
+    if m3u_url:
+        logger.info(f"JS değerlendirmesi ile m3u bulundu: {m3u_url}")
+    return m3u_url
+
+def _strategy_ytdlp(context):
+    """Son çare: yt-dlp"""
+    if _get_ytdlp() is None:
+        return STRATEGY_NOT_APPLICABLE
+    try:
+        yt_dlp_url = extract_with_ytdlp(context.url)
+        if yt_dlp_url:
+            logger.info(f"yt-dlp ile m3u bulundu: {yt_dlp_url}")
+            return yt_dlp_url
+    except Exception as yt_dlp_error:
+        logger.warning(f"yt-dlp ile çıkarma hatası: {str(yt_dlp_error)}")
+    return None
 
-def extract_m3u_url(channel_info):
-    """Kanal sayfasından m3u/m3u8 URL'sini dinamik olarak çıkarır"""
+def _strategy_selenium(context):
+    """Son çare: Selenium (GeoLive basamağı bu kanal için tarayıcı açtıysa atlanır)"""
+    if not browser_pool.available:
+        return STRATEGY_NOT_APPLICABLE
+    if not _claim_channel_browser(context.url):
+        logger.info(f"Bu kanal için tarayıcı zaten kullanıldı, selenium atlanıyor: {context.url}")
+        return STRATEGY_NOT_APPLICABLE
+    try:
+        selenium_url = extract_with_selenium(context.url)
+        if selenium_url:
+            logger.info(f"Selenium ile m3u bulundu: {selenium_url}")
+            return selenium_url
+    except Exception as selenium_error:
+        logger.warning(f"Selenium ile çıkarma hatası: {str(selenium_error)}")
+    # Tarayıcı bu denemede başlatılamadıysa deneme yapılmış sayılmaz
+    return None if browser_pool.available else STRATEGY_NOT_APPLICABLE
+
+# Çıkarma yöntemleri, varsayılan denenme sırasıyla (isimler metadata.json'a kaydedilir)
+EXTRACTION_STRATEGIES = [
+    ('geolive', _strategy_geolive),
+    ('kanallar_iframe', _strategy_kanallar_iframe),
+    ('iframe_src', _strategy_iframe_src),
+    ('nested_iframe', _strategy_nested_iframe),
+    ('player', _strategy_player),
+    ('video_tag', _strategy_video_tag),
+    ('script', _strategy_script),
+    ('page_regex', _strategy_page_regex),
+    ('js_eval', _strategy_js_eval),
+    ('ytdlp', _strategy_ytdlp),
+    ('selenium', _strategy_selenium),
+]
+
+# Kanal ve sayfa kapsamı bazında hangi çıkarma yönteminin çalıştığının kaydı
+STRATEGY_STATS_FILE = os.path.join(CACHE_DIR, "strategy_stats.json")
+STRATEGY_SKIP_MIN_ATTEMPTS = 25  # Bir kapsamda bu kadar denemede hiç çalışmamış yöntem atlanır
+STRATEGY_RETRY_DAYS = 7  # Atlanan yöntem son denemesinin üzerinden bu kadar gün geçince yeniden denenir
+STRATEGY_STATS_WINDOW = 200  # Deneme sayısı buna ulaşınca sayaçlar yarıya indirilir (eski sonuçlar söner)
+
+class StrategyMemory:
+    """
+    Çıkarma yöntemlerinin geçmişini çalıştırmalar arasında saklar.
+    Kanal bazında: en son kazanan yöntem ve süresi. Kapsam bazında (host ve sayfa yerleşimi,
+    bkz. ExtractionContext.strategy_scope): her yöntemin deneme/başarı sayısı, ortalama süresi
+    ve son deneme zamanı. order() bu geçmişe göre yöntem sırasını belirler.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+        self._dirty = False
+    
+    def _ensure_loaded(self):
+        if self._data is None:
+            self._data = _load_json_file(self.path, {})
+            self._data.setdefault('channels', {})
+            self._data.setdefault('scopes', {})
+            # Eski sürümün host bazlı sayaçları tüm siteyi tek kapsam sayıyordu
+            self._data.pop('hosts', None)
+    
+    @staticmethod
+    def _never_works(stats):
+        """Kapsamda yeterince denenip hiç çalışmamış ve yeniden deneme zamanı gelmemiş yöntem"""
+        if not stats or stats['attempts'] < STRATEGY_SKIP_MIN_ATTEMPTS or stats['successes'] > 0:
+            return False
+        try:
+            last_attempt = datetime.fromisoformat(stats.get('last_attempt', ''))
+        except ValueError:
+            return False
+        return datetime.now() - last_attempt < timedelta(days=STRATEGY_RETRY_DAYS)
+    
+    def order(self, channel_url, scope, strategies=None):
+        """
+        Kanal için denenecek (isim, fonksiyon) listesini döndürür: kanalın geçmişte kazanan
+        yöntemi başta, kapsamda hiç çalışmamış yöntemler hariç, kalanlar varsayılan sırada.
+        Atlanan bir yöntem STRATEGY_RETRY_DAYS geçince bir kez daha denenir.
+        """
+        strategies = list(EXTRACTION_STRATEGIES if strategies is None else strategies)
+        with self._lock:
+            self._ensure_loaded()
+            winner = (self._data['channels'].get(channel_url) or {}).get('strategy')
+            scope_stats = dict(self._data['scopes'].get(scope, {}))
+        
+        ordered = [item for item in strategies if item[0] == winner]
+        ordered += [item for item in strategies
+                    if item[0] != winner and not self._never_works(scope_stats.get(item[0]))]
+        return ordered
+    
+    def record(self, channel_url, scope, strategy_name, latency, success):
+        """Bir yöntemin gerçek bir denemesinin sonucunu kaydeder (uygulanamayan durumlar kaydedilmez)"""
+        with self._lock:
+            self._ensure_loaded()
+            scope_stats = self._data['scopes'].setdefault(scope, {})
+            stats = scope_stats.setdefault(strategy_name, {'attempts': 0, 'successes': 0, 'avg_latency': 0.0})
+            if stats['attempts'] >= STRATEGY_STATS_WINDOW:
+                stats['attempts'] //= 2
+                stats['successes'] = (stats['successes'] + 1) // 2
+            stats['attempts'] += 1
+            stats['last_attempt'] = datetime.now().isoformat()
+            if success:
+                stats['successes'] += 1
+                # Başarılı denemelerin ortalama süresi
+                stats['avg_latency'] = round(stats['avg_latency'] + (latency - stats['avg_latency']) / stats['successes'], 3)
+                self._data['channels'][channel_url] = {
+                    'strategy': strategy_name,
+                    'latency': round(latency, 3),
+                    'updated': datetime.now().isoformat(),
+                }
+            self._dirty = True
+    
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                _save_json_file(self.path, self._data)
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"Yöntem istatistikleri yazılamadı: {e}")
+
+strategy_memory = StrategyMemory(STRATEGY_STATS_FILE)
+
+def extract_m3u_url(channel_info, html_content=None):
+    """
+    Kanal sayfasından m3u/m3u8 URL'sini dinamik olarak çıkarır.
+    html_content verilirse kanal sayfası yeniden indirilmez (asenkron boru hattı kullanır).
+    Sayfa bir kez ayrıştırılır; yöntemler strategy_memory'nin belirlediği sırayla aynı indeks üzerinde denenir.
+    Görülen tüm adaylar puanlanıp channel_info['m3u_candidates'] listesine yazılır.
+    """
     try:
         headers = {
             'User-Agent': USER_AGENT,
@@ -419,332 +2087,35 @@ def extract_m3u_url(channel_info):
         logger.info(f"İşleniyor: {channel_info['name']} - {channel_info['url']}")
         
         try:
-            response = requests.get(channel_info['url'], headers=headers, timeout=15)
-            response.raise_for_status()
-            html_content = response.text
+            if html_content is None:
+                response = cached_get(channel_info['url'], headers=headers, timeout=15)
+                response.raise_for_status()
+                html_content = response.text
             
-            # Debug: Kanal HTML içeriğini kaydet
-            debug_file = f"debug_channel_{channel_info['name'].replace(' ', '_')}.html"
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-                logger.info(f"Kanal HTML içeriği kaydedildi: {debug_file}")
+            # Debug: Kanal HTML içeriğini arka planda kaydet
+            snapshot_writer.submit(f"{_url_slug(channel_info['url'])}.html", html_content)
                 
         except Exception as e:
             logger.error(f"Sayfa alınırken hata: {channel_info['url']} - {str(e)}")
             return None
         
-        # HTML içeriğini analiz et
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # ÖZEL İŞLEME: canlitv.vin için geolive.php iframeler (yüksek öncelik)
-        geolive_iframe = None
-        iframes = soup.find_all('iframe')
-        for iframe in iframes:
-            iframe_src = iframe.get('src', '')
-            if 'geolive.php' in iframe_src and 'kanal=' in iframe_src:
-                geolive_iframe = iframe_src
-                logger.info(f"GeoLive iframe bulundu: {geolive_iframe}")
-                break
-        
-        if geolive_iframe:
-            geolive_m3u = process_geolive_iframe(geolive_iframe, channel_info['url'])
-            if geolive_m3u:
-                return geolive_m3u
-        
-        # 1. kanallar.php iframe'ini bul - canlitv.vin'in özel formatı
-        iframes = soup.find_all('iframe')
-        for iframe in iframes:
-            iframe_src = iframe.get('src')
-            if not iframe_src:
-                continue
-                
-            # kanallar.php iframe'i önemli bir ipucu
-            if 'kanallar.php' in iframe_src:
-                logger.info(f"kanallar.php iframe bulundu: {iframe_src}")
-                
-                # kanallar.php parametrelerini çıkar
-                kanal_param = None
-                if '?' in iframe_src:
-                    query_part = iframe_src.split('?')[1]
-                    params = query_part.split('&')
-                    for param in params:
-                        if param.startswith('kanal='):
-                            kanal_param = param.split('=')[1]
-                            break
-                
-                if kanal_param:
-                    logger.info(f"Kanal parametresi bulundu: {kanal_param}")
-                    
-                    # iframe URL'sini normalize et
-                    iframe_url = iframe_src
-                    if not iframe_url.startswith('http'):
-                        if iframe_url.startswith('//'):
-                            iframe_url = 'https:' + iframe_url
-                        else:
-                            iframe_url = urllib.parse.urljoin(BASE_URL, iframe_url)
-                    
-                    # iframe içeriğini getir
-                    try:
-                        iframe_headers = headers.copy()
-                        iframe_headers['Referer'] = channel_info['url']
-                        
-                        iframe_response = requests.get(iframe_url, headers=iframe_headers, timeout=10)
-                        iframe_content = iframe_response.text
-                        
-                        # iframe içeriğini debug için kaydet
-                        iframe_debug_file = f"debug_iframe_{kanal_param}.html"
-                        with open(iframe_debug_file, 'w', encoding='utf-8') as f:
-                            f.write(iframe_content)
-                            logger.info(f"iframe içeriği kaydedildi: {iframe_debug_file}")
-                        
-                        # iframe içinde m3u URL'lerini ara
-                        iframe_soup = BeautifulSoup(iframe_content, 'html.parser')
-                        
-                        # Video elementleri kontrol et
-                        video_tags = iframe_soup.find_all('video')
-                        for video in video_tags:
-                            # video src attribute
-                            video_src = video.get('src')
-                            if video_src and ('.m3u' in video_src or '.m3u8' in video_src):
-                                if not video_src.startswith('http'):
-                                    video_src = urllib.parse.urljoin(iframe_url, video_src)
-                                logger.info(f"Video tag'i içinde m3u bulundu: {video_src}")
-                                return video_src
-                            
-                            # source elementleri kontrol et
-                            source_tags = video.find_all('source')
-                            for source in source_tags:
-                                source_src = source.get('src')
-                                if source_src and ('.m3u' in source_src or '.m3u8' in source_src):
-                                    if not source_src.startswith('http'):
-                                        source_src = urllib.parse.urljoin(iframe_url, source_src)
-                                    logger.info(f"Source tag'i içinde m3u bulundu: {source_src}")
-                                    return source_src
-                        
-                        # Scriptlerde değişkenler ara
-                        script_tags = iframe_soup.find_all('script')
-                        for script in script_tags:
-                            script_content = script.string
-                            if script_content:
-                                m3u_url = find_m3u_in_content(script_content)
-                                if m3u_url:
-                                    # URL'yi normalize et
-                                    if not m3u_url.startswith('http'):
-                                        if m3u_url.startswith('//'):
-                                            m3u_url = 'https:' + m3u_url
-                                        else:
-                                            m3u_url = urllib.parse.urljoin(iframe_url, m3u_url)
-                                    logger.info(f"iframe script içinde m3u bulundu: {m3u_url}")
-                                    return m3u_url
-                        
-                        # iframe içeriğinde m3u URL'leri ara
-                        m3u_url = find_m3u_in_content(iframe_content)
-                        if m3u_url:
-                            # URL'yi normalize et
-                            if not m3u_url.startswith('http'):
-                                if m3u_url.startswith('//'):
-                                    m3u_url = 'https:' + m3u_url
-                                else:
-                                    m3u_url = urllib.parse.urljoin(iframe_url, m3u_url)
-                            logger.info(f"iframe içeriğinde m3u bulundu: {m3u_url}")
-                            return m3u_url
-                    
-                    except Exception as iframe_error:
-                        logger.warning(f"iframe içeriği incelenirken hata: {iframe_error}")
-            
-            # İframe içeriği direk m3u formatındaysa
-            elif iframe_src.endswith('.m3u') or iframe_src.endswith('.m3u8') or '.m3u8' in iframe_src:
-                # URL'yi normalize et
-                if not iframe_src.startswith('http'):
-                    if iframe_src.startswith('//'):
-                        iframe_src = 'https:' + iframe_src
-                    else:
-                        iframe_src = urllib.parse.urljoin(channel_info['url'], iframe_src)
-                logger.info(f"İframe src içinde doğrudan m3u URL'si bulundu: {iframe_src}")
-                return iframe_src
-            
-            # Diğer tüm iframe'leri de kontrol edelim
-            else:
-                # iframe URL'sini normalize et
-                full_iframe_src = iframe_src
-                if not full_iframe_src.startswith('http'):
-                    if full_iframe_src.startswith('//'):
-                        full_iframe_src = 'https:' + full_iframe_src
-                    else:
-                        full_iframe_src = urllib.parse.urljoin(channel_info['url'], full_iframe_src)
-                
-                try:
-                    # iframe içeriğini al
-                    iframe_headers = headers.copy()
-                    iframe_headers['Referer'] = channel_info['url']
-                    
-                    iframe_response = requests.get(full_iframe_src, headers=iframe_headers, timeout=10)
-                    if iframe_response.status_code == 200:
-                        nested_content = iframe_response.text
-                        
-                        # Debug için kaydet
-                        nested_debug_file = f"debug_nested_iframe_{full_iframe_src.split('/')[-1].split('?')[0]}.html"
-                        with open(nested_debug_file, 'w', encoding='utf-8') as f:
-                            f.write(nested_content)
-                        
-                        # İçerikten m3u URL'sini ara
-                        m3u_url = find_m3u_in_content(nested_content)
-                        if m3u_url:
-                            logger.info(f"Nested iframe içinden m3u URL bulundu: {m3u_url}")
-                            return m3u_url
-                except Exception as nested_error:
-                    logger.warning(f"Nested iframe hatası: {nested_error}")
-        
-        # 2. Video player elementlerini bul
-        player_selectors = [
-            '#video-player', '#player', '.video-player', '.player', '#tv-player', 
-            '.tv-player', '#videoContainer', '.videoContainer', '#playerContainer', 
-            '.playerContainer', '#livePlayer', '.livePlayer', '#video', '.video',
-            '#player_div', '.player_div', '#playerElement', '.playerElement',
-            '#jwplayer', '.jwplayer', '.flowplayer', '#flowplayer'
-        ]
-        
-        for selector in player_selectors:
-            player_element = soup.select_one(selector)
-            if player_element:
-                logger.info(f"Player elementi bulundu: {selector}")
-                
-                # Player içinde iframe var mı?
-                player_iframe = player_element.find('iframe')
-                if player_iframe and player_iframe.get('src'):
-                    iframe_src = player_iframe.get('src')
-                    # URL'yi normalize et
-                    if not iframe_src.startswith('http'):
-                        if iframe_src.startswith('//'):
-                            iframe_src = 'https:' + iframe_src
-                        else:
-                            iframe_src = urllib.parse.urljoin(channel_info['url'], iframe_src)
-                    
-                    logger.info(f"Player içinde iframe bulundu: {iframe_src}")
-                    
-                    # m3u8 linki içeriyor mu kontrol et
-                    if '.m3u' in iframe_src or '.m3u8' in iframe_src:
-                        logger.info(f"Player iframe src içinde m3u linki bulundu: {iframe_src}")
-                        return iframe_src
-                    
-                    # iframe içeriğini al
-                    try:
-                        iframe_headers = headers.copy()
-                        iframe_headers['Referer'] = channel_info['url']
-                        
-                        iframe_response = requests.get(iframe_src, headers=iframe_headers, timeout=10)
-                        if iframe_response.status_code == 200:
-                            iframe_content = iframe_response.text
-                            
-                            # iframe içinde m3u URL'leri ara
-                            m3u_url = find_m3u_in_content(iframe_content)
-                            if m3u_url:
-                                # URL'yi normalize et
-                                if not m3u_url.startswith('http'):
-                                    if m3u_url.startswith('//'):
-                                        m3u_url = 'https:' + m3u_url
-                                    else:
-                                        m3u_url = urllib.parse.urljoin(iframe_src, m3u_url)
-                                logger.info(f"Player iframe içinde m3u bulundu: {m3u_url}")
-                                return m3u_url
-                    except Exception as player_iframe_error:
-                        logger.warning(f"Player iframe işlenirken hata: {player_iframe_error}")
-                
-                # Player içinde video veya source elementleri var mı?
-                video_tag = player_element.find('video')
-                if video_tag:
-                    # Video src attribute
-                    video_src = video_tag.get('src')
-                    if video_src and ('.m3u' in video_src or '.m3u8' in video_src):
-                        if not video_src.startswith('http'):
-                            video_src = urllib.parse.urljoin(channel_info['url'], video_src)
-                        logger.info(f"Player içindeki video tag'i içinde m3u bulundu: {video_src}")
-                        return video_src
-                    
-                    # Source elementleri kontrol et
-                    source_tags = video_tag.find_all('source')
-                    for source in source_tags:
-                        source_src = source.get('src')
-                        if source_src and ('.m3u' in source_src or '.m3u8' in source_src):
-                            if not source_src.startswith('http'):
-                                source_src = urllib.parse.urljoin(channel_info['url'], source_src)
-                            logger.info(f"Player içindeki source tag'i içinde m3u bulundu: {source_src}")
-                            return source_src
-                
-                # Data attribute'ları kontrol et
-                for data_attr in ['data-source', 'data-url', 'data-stream', 'data-hls', 'data-src']:
-                    attr_value = player_element.get(data_attr)
-                    if attr_value and ('.m3u' in attr_value or '.m3u8' in attr_value):
-                        if not attr_value.startswith('http'):
-                            attr_value = urllib.parse.urljoin(channel_info['url'], attr_value)
-                        logger.info(f"Player data attribute içinde m3u bulundu: {attr_value}")
-                        return attr_value
-        
-        # 3. Sayfa içindeki tüm video elementlerini kontrol et
-        video_tags = soup.find_all('video')
-        for video in video_tags:
-            # Video src attribute
-            video_src = video.get('src')
-            if video_src and ('.m3u' in video_src or '.m3u8' in video_src):
-                if not video_src.startswith('http'):
-                    video_src = urllib.parse.urljoin(channel_info['url'], video_src)
-                logger.info(f"Video tag'i içinde m3u bulundu: {video_src}")
-                return video_src
-            
-            # Source elementleri kontrol et
-            source_tags = video.find_all('source')
-            for source in source_tags:
-                source_src = source.get('src')
-                if source_src and ('.m3u' in source_src or '.m3u8' in source_src):
-                    if not source_src.startswith('http'):
-                        source_src = urllib.parse.urljoin(channel_info['url'], source_src)
-                    logger.info(f"Source tag'i içinde m3u bulundu: {source_src}")
-                    return source_src
-        
-        # 4. Sayfa içindeki script elementlerini kontrol et
-        script_tags = soup.find_all('script')
-        for script in script_tags:
-            script_content = script.string
-            if script_content:
-                m3u_url = find_m3u_in_content(script_content)
-                if m3u_url:
-                    # URL'yi normalize et
-                    if not m3u_url.startswith('http'):
-                        if m3u_url.startswith('//'):
-                            m3u_url = 'https:' + m3u_url
-                        else:
-                            m3u_url = urllib.parse.urljoin(channel_info['url'], m3u_url)
-                    logger.info(f"Script içinde m3u bulundu: {m3u_url}")
-                    return m3u_url
-        
-        # 5. Sayfa içinde m3u URL'leri ara
-        m3u_url = find_m3u_in_content(html_content)
-        if m3u_url:
-            # URL'yi normalize et
-            if not m3u_url.startswith('http'):
-                if m3u_url.startswith('//'):
-                    m3u_url = 'https:' + m3u_url
-                else:
-                    m3u_url = urllib.parse.urljoin(channel_info['url'], m3u_url)
-            logger.info(f"Sayfa içeriğinde m3u bulundu: {m3u_url}")
-            return m3u_url
-        
-        # 6. Son çare: yt-dlp veya selenium kullan
-        try:
-            yt_dlp_url = extract_with_ytdlp(channel_info['url'])
-            if yt_dlp_url:
-                logger.info(f"yt-dlp ile m3u bulundu: {yt_dlp_url}")
-                return yt_dlp_url
-        except Exception as yt_dlp_error:
-            logger.warning(f"yt-dlp ile çıkarma hatası: {str(yt_dlp_error)}")
+        # HTML içeriğini bir kez analiz et
+        context = ExtractionContext(channel_info, headers, html_content)
         
-        try:
-            selenium_url = extract_with_selenium(channel_info['url'])
-            if selenium_url:
-                logger.info(f"Selenium ile m3u bulundu: {selenium_url}")
-                return selenium_url
-        except Exception as selenium_error:
-            logger.warning(f"Selenium ile çıkarma hatası: {str(selenium_error)}")
+        # Geçmişte bu kanal için kazanan yöntem önce denenir
+        scope = context.strategy_scope()
+        for strategy_name, strategy in strategy_memory.order(channel_info['url'], scope):
+            started = time.monotonic()
+            m3u_url = strategy(context)
+            if m3u_url is STRATEGY_NOT_APPLICABLE:
+                continue
+            strategy_memory.record(channel_info['url'], scope, strategy_name, time.monotonic() - started, bool(m3u_url))
+            if m3u_url:
+                _mark_strategy(channel_info, m3u_url, strategy_name)
+                # Doğrulama ilk tahmin ölü çıkarsa yeniden çıkarma yapmadan sıradaki adaya geçer
+                context.collect_page_candidates()
+                channel_info['m3u_candidates'] = context.ranked_candidates(m3u_url)
+                return m3u_url
         
         # M3U bulunamadı
         logger.warning(f"M3U URL bulunamadı: {channel_info['name']}")
@@ -754,8 +2125,47 @@ def extract_m3u_url(channel_info):
         logger.error(f"M3U URL çıkarılırken genel hata: {str(e)}")
         return None
 
-def process_geolive_iframe(iframe_url, referer_url):
-    """canlitv.vin sitesinin geolive.php iframe'ini özel olarak işler"""
+# GeoLive iframe'leri için maliyet sıralı çözümleme ayarları
+GEOLIVE_TIME_BUDGET = 90  # Bir kanal için tüm basamaklara ayrılan en fazla süre (saniye)
+GEOLIVE_BROWSER_MIN_BUDGET = 15  # Tarayıcı basamağına geçmek için kalması gereken en az süre (saniye)
+GEOLIVE_RESULTS_FILE = os.path.join(CACHE_DIR, "geolive_results.json")
+
+# GeoLive kanal adı -> en son çalışan m3u URL'si (slug deposuyla aynı anahtar/URL yapısı)
+geolive_result_memory = SlugVariantMemory(GEOLIVE_RESULTS_FILE)
+
+# Bu çalıştırmada tarayıcı ile denenmiş kanal sayfaları: GeoLive basamağı ve selenium yöntemi
+# aynı kaydı kullanır, böylece tarayıcı kanal başına en fazla bir kez açılır
+_browser_attempts = set()
+_browser_attempts_lock = threading.Lock()
+
+def _geolive_channel_name(iframe_url):
+    return iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else 'unknown'
+
+def _claim_channel_browser(channel_url):
+    """Kanal sayfası için tarayıcı hakkını alır; bu çalıştırmada zaten kullanıldıysa False döner"""
+    with _browser_attempts_lock:
+        if channel_url in _browser_attempts:
+            return False
+        _browser_attempts.add(channel_url)
+        return True
+
+def _budget_seconds(deadline, limit):
+    """limit ile deadline'a kalan sürenin küçüğünü döndürür; deadline yoksa limit"""
+    if deadline is None:
+        return limit
+    return max(0.0, min(limit, deadline - time.monotonic()))
+
+def process_geolive_iframe(iframe_url, referer_url, candidates=None):
+    """
+    canlitv.vin sitesinin geolive.php iframe'ini ucuzdan pahalıya sıralı basamaklarla işler:
+    önceki çalıştırmanın sonucu, statik HTTP ve regex/JS çözücüleri, bilinen CDN desenleri ve
+    en son tarayıcı. Kanal başına GEOLIVE_TIME_BUDGET süre sınırı vardır ve tarayıcı beklemesi,
+    sayfa yükleme ve manifest yakalama da kalan süreyle sınırlanır. Tarayıcı kanal başına
+    (selenium yöntemi dahil) en fazla bir kez açılır.
+    candidates listesi verilirse sayfada görülen tüm m3u adayları ona eklenir.
+    """
+    if candidates is None:
+        candidates = []
     try:
         logger.info(f"GeoLive iframe işleniyor: {iframe_url}")
         
@@ -766,15 +2176,60 @@ def process_geolive_iframe(iframe_url, referer_url):
             else:
                 iframe_url = urllib.parse.urljoin(BASE_URL, iframe_url)
         
-        # YENİ: Rekaptcha algılama ve atlatma
-        logger.info("Anti-bot korumalarını atlatma denemesi yapılıyor...")
+        deadline = time.monotonic() + GEOLIVE_TIME_BUDGET
+        channel_name = _geolive_channel_name(iframe_url)
+        
+        # 1. Önceki çalıştırmada bulunan sonuç hâlâ çalışıyorsa ağda başka iş yapılmaz
+        m3u_url = geolive_result_memory.get(channel_name)
+        if m3u_url and _is_stream_alive(m3u_url):
+            logger.info(f"GeoLive için önceki sonuç hâlâ çalışıyor: {m3u_url}")
+            candidates.append({'url': m3u_url, 'source': 'geolive_cache', 'path': ()})
+            return m3u_url
+        
+        # 2. Statik HTTP isteği ve çözücüler
+        m3u_url = _process_geolive_static(iframe_url, referer_url, candidates, deadline)
+        
+        # 3. Kanal adından türetilen bilinen CDN adresleri
+        if not m3u_url:
+            m3u_url = probe_known_geolive_patterns(iframe_url, deadline)
+        
+        # 4. Tarayıcı: yalnızca yeterli süre kaldıysa ve bu kanal için daha önce açılmadıysa
+        if not m3u_url:
+            remaining = deadline - time.monotonic()
+            if remaining < GEOLIVE_BROWSER_MIN_BUDGET:
+                logger.warning(f"GeoLive süre bütçesi doldu, tarayıcı atlanıyor: {channel_name}")
+            elif not _claim_channel_browser(referer_url):
+                logger.info(f"Bu kanal için tarayıcı zaten kullanıldı, atlanıyor: {channel_name}")
+            else:
+                m3u_url = extract_geolive_with_selenium(iframe_url, referer_url, deadline)
+                if m3u_url:
+                    logger.info(f"Selenium ile GeoLive'dan m3u URL başarıyla çıkarıldı: {m3u_url}")
         
-        # Geolive sayfasını önce Selenium ile deneyelim
-        m3u_url = extract_geolive_with_selenium(iframe_url, referer_url)
         if m3u_url:
-            logger.info(f"Selenium ile GeoLive'dan m3u URL başarıyla çıkarıldı: {m3u_url}")
+            geolive_result_memory.remember(channel_name, m3u_url)
             return m3u_url
         
+        logger.warning(f"GeoLive iframe'inde m3u URL bulunamadı: {iframe_url}")
+        return None
+        
+    except Exception as e:
+        logger.error(f"GeoLive iframe işleme hatası: {str(e)}")
+        return None
+
+def _join_js_parts(expr, var_dict):
+    """'a + b + "c"' biçimindeki bir JavaScript birleştirmesini bilinen değişkenlerle çözer"""
+    combined_value = ""
+    for part in re.split(r'\s*\+\s*', expr):
+        part = part.strip()
+        if part in var_dict:
+            combined_value += var_dict[part]
+        elif part.startswith('"') or part.startswith("'"):
+            combined_value += part.strip('"\'')
+    return combined_value
+
+def _process_geolive_static(iframe_url, referer_url, candidates, deadline):
+    """GeoLive sayfasını tarayıcısız indirir ve regex/JS çözücüleriyle m3u URL'si arar"""
+    try:
         # Geolive sayfasını getir
         headers = {
             'User-Agent': USER_AGENT,
@@ -795,9 +2250,12 @@ def process_geolive_iframe(iframe_url, referer_url):
         
         response = None
         for ua in user_agents:
+            if time.monotonic() >= deadline:
+                logger.warning("GeoLive süre bütçesi doldu, User-Agent denemeleri durduruldu")
+                break
             try:
                 headers['User-Agent'] = ua
-                response = requests.get(iframe_url, headers=headers, timeout=15)
+                response = http_get(iframe_url, headers=headers, timeout=15)
                 
                 if response.status_code == 200 and not ('captcha' in response.text.lower() or 'g-recaptcha' in response.text.lower()):
                     logger.info(f"Başarılı GeoLive erişimi (User-Agent: {ua[:20]}...)")
@@ -813,252 +2271,111 @@ def process_geolive_iframe(iframe_url, referer_url):
             return None
         
         # Debug için sayfayı kaydet
-        debug_file = f"debug_geolive_{iframe_url.split('kanal=')[1].split('&')[0]}.html"
-        with open(debug_file, 'w', encoding='utf-8') as f:
-            f.write(response.text)
-            logger.info(f"GeoLive iframe içeriği kaydedildi: {debug_file}")
+        snapshot_writer.submit(f"geolive_{_geolive_channel_name(iframe_url)}.html", response.text)
         
         # İçerikten m3u bağlantısını ara
         iframe_content = response.text
         
-        # Captcha kontrolü
+        # Captcha kontrolü: statik çözümleme anlamsız, sonraki basamaklara bırakılır
         if 'captcha' in iframe_content.lower() or 'g-recaptcha' in iframe_content.lower():
-            logger.warning("CAPTCHA algılandı. Selenium ile otomatik bypass denemesi yapılacak...")
-            m3u_url = extract_geolive_with_selenium(iframe_url, referer_url)
-            if m3u_url:
-                return m3u_url
-            
-            # Kanal adını al
-            channel_name = iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else 'unknown'
-            
-            # Direk bilinen URL'leri dene
-            logger.info(f"Bilinen M3U patternleri deneniyor: {channel_name}")
-            known_patterns = [
-                f"https://canlitv.center/stream/{channel_name}.m3u8",
-                f"https://cdn.yayin.com.tr/tv/{channel_name}/playlist.m3u8",
-                f"https://tv-{channel_name}.live.trt.com.tr/master.m3u8",
-                f"https://stream.canlitv.com/{channel_name}/tracks-v1/index.m3u8",
-                f"https://canlitv-pull.ercdn.net/{channel_name}/playlist.m3u8"
-            ]
-            
-            for pattern in known_patterns:
-                try:
-                    head_response = requests.head(pattern, timeout=5)
-                    if head_response.status_code < 400:
-                        logger.info(f"Bilinen pattern çalışıyor: {pattern}")
-                        return pattern
-                except:
-                    continue
-            
-            logger.warning(f"CAPTCHA nedeniyle işlem başarısız: {iframe_url}")
+            logger.warning(f"CAPTCHA algılandı, statik çözümleme atlanıyor: {iframe_url}")
             return None
         
-        # YENİ: JavaScript değişken tanımlarını analiz et
-        # Genellikle gizlenmiş videoları ayıklamak için
-        var_declarations = re.findall(r'var\s+([a-zA-Z0-9_$]+)\s*=\s*[\'"](.*?)[\'"];', iframe_content)
-        var_dict = {k: v for k, v in var_declarations}
+        # Tüm ağ gerektirmeyen çözücüler bulduklarını aday olarak ekler; ilk eşleşme değil,
+        # en yüksek puanlı aday seçilir (diğer çıkarma yöntemleriyle aynı sıralama)
+        static_candidates = []
         
-        # Değişkenleri birleştiren ifadeleri bul
-        combined_vars = re.findall(r'([a-zA-Z0-9_$]+\s*\+\s*[a-zA-Z0-9_$]+(?:\s*\+\s*[a-zA-Z0-9_$]+)*)', iframe_content)
+        def add_static(url, source):
+            if url and '.m3u' in url:
+                static_candidates.append({'url': _absolute_url(url, iframe_url), 'source': source, 'path': ()})
         
-        # Değişken birleştirmeleri deneyip m3u ara
-        for combined in combined_vars:
-            try:
-                parts = re.split(r'\s*\+\s*', combined)
-                combined_value = ""
-                for part in parts:
-                    if part in var_dict:
-                        combined_value += var_dict[part]
-                
-                if '.m3u' in combined_value:
-                    logger.info(f"Değişken birleştirme ile m3u URL bulundu: {combined_value}")
-                    return combined_value
-            except Exception as var_error:
-                logger.warning(f"Değişken birleştirme analiz hatası: {var_error}")
-        
-        # YENİ: kaynak etiketi içindeki gizli içerikleri analiz et
-        source_with_vars = re.findall(r'source\s*:\s*([a-zA-Z0-9_$]+\s*\+\s*[a-zA-Z0-9_$]+(?:\s*\+\s*[a-zA-Z0-9_$]+)*)', iframe_content)
-        for source_expr in source_with_vars:
-            try:
-                parts = re.split(r'\s*\+\s*', source_expr)
-                combined_value = ""
-                for part in parts:
-                    part = part.strip()
-                    if part in var_dict:
-                        combined_value += var_dict[part]
-                    elif part.startswith('"') or part.startswith("'"):
-                        # Stringse tırnak işaretlerini kaldır
-                        combined_value += part.strip('"\'')
-                
-                if '.m3u' in combined_value:
-                    logger.info(f"Source değişken birleştirme ile m3u URL bulundu: {combined_value}")
-                    return combined_value
-            except Exception as source_error:
-                logger.warning(f"Source değişken birleştirme analiz hatası: {source_error}")
-        
-        # YENİ: Obfuscated stringleri analiz et - HLS.js ve benzeri kütüphanelerde
-        hls_patterns = [
-            r'([a-zA-Z0-9_$]+)\.src\s*=\s*\{[^}]*?\bsrc\s*:\s*([a-zA-Z0-9_$]+\s*\+\s*[a-zA-Z0-9_$]+(?:\s*\+\s*[a-zA-Z0-9_$]+)*)',
-            r'(?:Hls|hls)\.loadSource\(([a-zA-Z0-9_$]+\s*\+\s*[a-zA-Z0-9_$]+(?:\s*\+\s*[a-zA-Z0-9_$]+)*)\)',
-            r'videojs\([^)]+\)\.src\(\{\s*src\s*:\s*([a-zA-Z0-9_$]+\s*\+\s*[a-zA-Z0-9_$]+(?:\s*\+\s*[a-zA-Z0-9_$]+)*)',
+        # JavaScript değişken tanımları ve bunları birleştiren ifadeler (gizlenmiş video adresleri)
+        var_dict = dict(re.findall(r'var\s+([a-zA-Z0-9_$]+)\s*=\s*[\'"](.*?)[\'"];', iframe_content))
+        concat_expr = r'[a-zA-Z0-9_$]+\s*\+\s*[a-zA-Z0-9_$]+(?:\s*\+\s*[a-zA-Z0-9_$]+)*'
+        concat_patterns = [
+            ('js_var', r'(' + concat_expr + r')'),
+            # Oynatıcıya verilen birleştirmeler (source:, HLS.js, video.js)
+            ('js_player', r'source\s*:\s*(' + concat_expr + r')'),
+            ('js_player', r'[a-zA-Z0-9_$]+\.src\s*=\s*\{[^}]*?\bsrc\s*:\s*(' + concat_expr + r')'),
+            ('js_player', r'(?:Hls|hls)\.loadSource\((' + concat_expr + r')\)'),
+            ('js_player', r'videojs\([^)]+\)\.src\(\{\s*src\s*:\s*(' + concat_expr + r')'),
         ]
+        for source, pattern in concat_patterns:
+            for expr in re.findall(pattern, iframe_content):
+                add_static(_join_js_parts(expr, var_dict), source)
         
-        for pattern in hls_patterns:
-            matches = re.findall(pattern, iframe_content)
-            for match in matches:
-                try:
-                    expr = match
-                    if isinstance(match, tuple):
-                        expr = match[1] if len(match) > 1 else match[0]
-                        
-                    parts = re.split(r'\s*\+\s*', expr)
-                    combined_value = ""
-                    for part in parts:
-                        part = part.strip()
-                        if part in var_dict:
-                            combined_value += var_dict[part]
-                        elif part.startswith('"') or part.startswith("'"):
-                            combined_value += part.strip('"\'')
-                    
-                    if '.m3u' in combined_value:
-                        logger.info(f"HLS pattern ile m3u URL bulundu: {combined_value}")
-                        return combined_value
-                except Exception as hls_error:
-                    logger.warning(f"HLS pattern analiz hatası: {hls_error}")
-        
-        # YENİ: Özel canlitv.vin desen analizi
-        m3u8_regex_pattern = r'function\s+getURL\(\)\s*{[^}]*\breturn\s+[\'"]([^\'"]*)[\'"]\s*\+\s*[\'"]([^\'"]*)[\'"]\s*;?\s*}'
-        m3u8_matches = re.findall(m3u8_regex_pattern, iframe_content)
-        if m3u8_matches:
-            try:
-                parts = m3u8_matches[0]
-                if len(parts) >= 2:
-                    combined_url = parts[0] + parts[1]
-                    if '.m3u' in combined_url:
-                        logger.info(f"getURL fonksiyonundan m3u URL bulundu: {combined_url}")
-                        return combined_url
-            except Exception as url_func_error:
-                logger.warning(f"getURL fonksiyonu analiz hatası: {url_func_error}")
-        
-        # YENİ: JavaScript fonksiyonlarını bul
-        js_functions = {}
-        function_pattern = r'function\s+([a-zA-Z0-9_$]+)\s*\([^)]*\)\s*{([^}]*)}'
-        func_matches = re.findall(function_pattern, iframe_content)
-        
-        for func_name, func_body in func_matches:
-            js_functions[func_name] = func_body
-            
-            # Eğer fonksiyonda return ve m3u ifadesi varsa analiz et
-            if 'return' in func_body and ('.m3u' in func_body or '.m3u8' in func_body):
-                # Basit return ifadelerini bul
-                return_pattern = r'return\s+[\'"]([^\'"]*\.m3u[^\'"]*)[\'"]'
-                return_matches = re.findall(return_pattern, func_body)
-                
-                if return_matches:
-                    logger.info(f"JavaScript fonksiyonundan m3u URL bulundu: {return_matches[0]}")
-                    return return_matches[0]
-                
-                # String birleştirme return'leri
-                return_concat_pattern = r'return\s+[\'"]([^\'"]*)[\'"](?:\s*\+\s*[\'"]([^\'"]*)[\'"])+\s*;'
-                return_concat_matches = re.findall(return_concat_pattern, func_body)
-                
-                if return_concat_matches:
-                    concat_strings = re.findall(r'[\'"]([^\'"]*)[\'"]', func_body[func_body.find('return'):])
-                    combined = ''.join(concat_strings)
-                    
-                    if '.m3u' in combined:
-                        logger.info(f"JavaScript fonksiyonu string birleştirmesiyle m3u URL bulundu: {combined}")
-                        return combined
+        # Özel canlitv.vin deseni: getURL() iki parçayı birleştirip döndürür
+        getter_pattern = r'function\s+getURL\(\)\s*{[^}]*\breturn\s+[\'"]([^\'"]*)[\'"]\s*\+\s*[\'"]([^\'"]*)[\'"]\s*;?\s*}'
+        for first, second in re.findall(getter_pattern, iframe_content):
+            add_static(first + second, 'js_function')
+        
+        # m3u döndüren JavaScript fonksiyonları (düz ya da birleştirilmiş string)
+        for func_name, func_body in re.findall(r'function\s+([a-zA-Z0-9_$]+)\s*\([^)]*\)\s*{([^}]*)}', iframe_content):
+            if 'return' not in func_body or '.m3u' not in func_body:
+                continue
+            for returned in re.findall(r'return\s+[\'"]([^\'"]*\.m3u[^\'"]*)[\'"]', func_body):
+                add_static(returned, 'js_function')
+            if re.search(r'return\s+[\'"]([^\'"]*)[\'"](?:\s*\+\s*[\'"]([^\'"]*)[\'"])+\s*;', func_body):
+                add_static(''.join(re.findall(r'[\'"]([^\'"]*)[\'"]', func_body[func_body.find('return'):])), 'js_function')
         
-        # YENİ: JSON yapılandırma objelerini ara
+        # JSON yapılandırma objeleri
         json_pattern = r'(?:var|const|let)\s+([a-zA-Z0-9_$]+)\s*=\s*({[^;]*?(?:src|source|file|url)\s*:\s*[\'"][^\'";]*?\.m3u[^\'"]*[\'"][^;]*})'
-        json_matches = re.findall(json_pattern, iframe_content)
+        for var_name, json_str in re.findall(json_pattern, iframe_content):
+            for url in re.findall(r'["\'](https?://[^"\']*\.m3u[8]?[^"\']*)["\']', json_str):
+                add_static(url, 'json_config')
         
-        for var_name, json_str in json_matches:
-            try:
-                # {} içindeki içeriği tam bir JSON'a çevir
-                cleaned_json = '{' + re.sub(r'([{,])\s*([a-zA-Z0-9_$]+)\s*:', r'\1"\2":', json_str.strip('{} ')) + '}'
-                
-                # Tırnak işaretlerini normalleştir
-                cleaned_json = re.sub(r':\s*\'([^\']*?)\'', r':"\1"', cleaned_json)
-                
-                # Temiz bir JSON mu kontrol et
-                if cleaned_json.count('{') == cleaned_json.count('}'):
-                    # m3u URL'sini bul
-                    url_pattern = r'["\'](https?://[^"\']*\.m3u[8]?[^"\']*)["\']'
-                    url_match = re.search(url_pattern, cleaned_json)
-                    
-                    if url_match:
-                        logger.info(f"JSON yapılandırmasından m3u URL bulundu: {url_match.group(1)}")
-                        return url_match.group(1)
-            except Exception as json_error:
-                logger.warning(f"JSON analiz hatası: {json_error}")
-        
-        # 1. Doğrudan embedDecode fonksiyonunu ara
-        embed_decode_pattern = r'embedDecode\("([^"]+)"\)'
-        embed_matches = re.findall(embed_decode_pattern, iframe_content)
-        
-        if embed_matches:
-            encoded_content = embed_matches[0]
+        # embedDecode("...") içindeki base64 kodlu içerik
+        for encoded_content in re.findall(r'embedDecode\("([^"]+)"\)', iframe_content):
             try:
-                # Base64 kodlu içeriği çöz
                 import base64
                 decoded_content = base64.b64decode(encoded_content).decode('utf-8')
                 logger.info(f"Çözülen embedDecode içeriği: {decoded_content}")
-                
-                # Çözülen içerikten m3u URL'sini çıkar
-                m3u_url = find_m3u_in_content(decoded_content)
-                if m3u_url:
-                    logger.info(f"embedDecode içinden m3u URL bulundu: {m3u_url}")
-                    return m3u_url
+                static_candidates.extend(find_m3u_candidates(decoded_content, iframe_url))
             except Exception as decode_error:
                 logger.warning(f"embedDecode çözme hatası: {decode_error}")
         
-        # 2. Vidogevideo değişkenini ara
-        vidogevideo_pattern = r'var vidogevideo\s*=\s*[\'"]([^\'"]*)[\'"]'
-        vidogevideo_matches = re.findall(vidogevideo_pattern, iframe_content)
-        
-        if vidogevideo_matches:
-            video_url = vidogevideo_matches[0]
-            if '.m3u' in video_url:
-                logger.info(f"vidogevideo değişkeninden m3u URL bulundu: {video_url}")
-                return video_url
-        
-        # 3. Diğer Player URL'lerini ara (script içinde)
+        # Vidogevideo değişkeni, player URL'leri ve JSON içindeki URL'ler
         player_url_patterns = [
-            r'player\.src\(\{\s*src:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-            r'player\.src\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-            r'file:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-            r'source:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-            r'src=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-            r'source\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
+            ('vidogevideo', r'var vidogevideo\s*=\s*[\'"]([^\'"]*)[\'"]'),
+            ('player', r'player\.src\(\{\s*src:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]'),
+            ('player', r'player\.src\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]'),
+            ('player', r'file:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]'),
+            ('player', r'source:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]'),
+            ('player', r'src=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]'),
+            ('player', r'source\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]'),
+            ('json', r'[{,]\s*["\'](?:file|src|source|url|stream|hlsUrl)["\']:\s*["\']([^"\']*\.m3u[^"\']*)["\']'),
         ]
+        for rule_index, (source, pattern) in enumerate(player_url_patterns):
+            for match in re.findall(pattern, iframe_content):
+                if '.m3u' in match:
+                    static_candidates.append({'url': _absolute_url(match, iframe_url), 'source': source,
+                                              'rule': rule_index, 'path': ()})
         
-        for pattern in player_url_patterns:
-            matches = re.findall(pattern, iframe_content)
-            if matches:
-                for match in matches:
-                    if '.m3u' in match:
-                        logger.info(f"Player URL patterninden m3u URL bulundu: {match}")
-                        return match
+        # Video ve source etiketleri
+        iframe_page = PageIndex(iframe_content)
+        for tag, src in iframe_page.video_m3u_sources():
+            add_static(src, tag)
         
-        # 4. JSON içindeki URL'leri ara
-        json_url_pattern = r'[{,]\s*["\'](?:file|src|source|url|stream|hlsUrl)["\']:\s*["\']([^"\']*\.m3u[^"\']*)["\']'
-        json_matches = re.findall(json_url_pattern, iframe_content)
+        # Genel tarama: eşleştirici kuralları, atob(...) içeriklerini de çözer
+        static_candidates.extend(find_m3u_candidates(iframe_content, iframe_url))
         
-        if json_matches:
-            for match in json_matches:
-                if '.m3u' in match:
-                    logger.info(f"JSON içinden m3u URL bulundu: {match}")
-                    return match
+        candidates.extend(static_candidates)
+        m3u_url = _best_candidate_url(static_candidates)
+        if m3u_url:
+            logger.info(f"GeoLive sayfasında {len(static_candidates)} aday içinden m3u URL seçildi: {m3u_url}")
+            return m3u_url
         
-        # 5. Sayfayı daha derin analiz et ve iframe'leri kontrol et
-        soup = BeautifulSoup(iframe_content, 'html.parser')
+        # Regex çözücüleri sonuç vermediyse scriptleri gömülü JS yorumlayıcısında çalıştır
+        js_candidates = [{'url': url, 'source': 'js_eval', 'path': ()}
+                         for url in evaluate_scripts_for_m3u(iframe_page.scripts, iframe_url)]
+        candidates.extend(js_candidates)
+        m3u_url = _best_candidate_url(js_candidates)
+        if m3u_url:
+            logger.info(f"GeoLive scriptleri JS değerlendirmesiyle m3u URL verdi: {m3u_url}")
+            return m3u_url
         
         # Nested iframe'leri kontrol et
-        nested_iframes = soup.find_all('iframe')
-        for nested_iframe in nested_iframes:
-            nested_src = nested_iframe.get('src')
+        for nested_src in iframe_page.iframes:
             if nested_src and nested_src != 'about:blank':
                 logger.info(f"GeoLive içinde nested iframe bulundu: {nested_src}")
                 
@@ -1073,652 +2390,555 @@ def process_geolive_iframe(iframe_url, referer_url):
                     nested_headers = headers.copy()
                     nested_headers['Referer'] = iframe_url
                     
-                    nested_response = requests.get(nested_src, headers=nested_headers, timeout=10)
+                    nested_response = cached_get(nested_src, headers=nested_headers, timeout=10)
                     if nested_response.status_code == 200:
                         nested_content = nested_response.text
                         
                         # Debug için kaydet
-                        nested_debug_file = f"debug_nested_iframe_{nested_src.split('/')[-1].split('?')[0]}.html"
-                        with open(nested_debug_file, 'w', encoding='utf-8') as f:
-                            f.write(nested_content)
+                        snapshot_writer.submit(f"nested_iframe_{nested_src.split('/')[-1].split('?')[0]}.html", nested_content)
                         
                         # İçerikten m3u URL'sini ara
-                        m3u_url = find_m3u_in_content(nested_content)
+                        nested_candidates = find_m3u_candidates(nested_content, nested_src)
+                        candidates.extend(nested_candidates)
+                        m3u_url = _best_candidate_url(nested_candidates)
                         if m3u_url:
                             logger.info(f"Nested iframe içinden m3u URL bulundu: {m3u_url}")
                             return m3u_url
                 except Exception as nested_error:
                     logger.warning(f"Nested iframe hatası: {nested_error}")
         
-        # 6. Sayfa içindeki tüm videoları kontrol et
-        video_tags = soup.find_all('video')
-        for video in video_tags:
-            video_src = video.get('src')
-            if video_src and ('.m3u' in video_src or '.m3u8' in video_src):
-                logger.info(f"Video tag'inden m3u URL bulundu: {video_src}")
-                return video_src
-            
-            # Video source'larını kontrol et
-            sources = video.find_all('source')
-            for source in sources:
-                source_src = source.get('src')
-                if source_src and ('.m3u' in source_src or '.m3u8' in source_src):
-                    logger.info(f"Video source tag'inden m3u URL bulundu: {source_src}")
-                    return source_src
-        
-        # 7. Script taglerindeki evalatob kodunu çözmeyi dene
-        script_tags = soup.find_all('script')
-        for script in script_tags:
-            script_content = script.string
-            if script_content and 'atob(' in script_content:
-                try:
-                    # Atob fonksiyonlarını bul
-                    atob_pattern = r'atob\([\'"]([^\'"]+)[\'"]\)'
-                    atob_matches = re.findall(atob_pattern, script_content)
-                    
-                    for encoded in atob_matches:
-                        try:
-                            import base64
-                            decoded = base64.b64decode(encoded).decode('utf-8')
-                            logger.info(f"Atob çözüldü: {decoded}")
-                            
-                            # Çözülen içerikten m3u URL'sini ara
-                            m3u_url = find_m3u_in_content(decoded)
-                            if m3u_url:
-                                logger.info(f"Atob çözümünden m3u URL bulundu: {m3u_url}")
-                                return m3u_url
-                        except Exception as decode_error:
-                            logger.warning(f"Atob çözme hatası: {decode_error}")
-                except Exception as script_error:
-                    logger.warning(f"Script çözme hatası: {script_error}")
-        
-        # 8. Son çare: tüm içerikte m3u ara
-        m3u_url = find_m3u_in_content(iframe_content)
-        if m3u_url:
-            logger.info(f"Genel içerik taramasından m3u URL bulundu: {m3u_url}")
-            return m3u_url
-        
-        # 9. YENİ: URL parçalarını birleştirerek arama
+        # URL parçalarını olası sunucu domainleriyle birleştirerek arama
         url_part_pattern = r'/([^/]*\.m3u[^/\'"]*)'
         url_parts = re.findall(url_part_pattern, iframe_content)
         
-        if url_parts:
-            for part in url_parts:
-                # Olası sunucu domainlerini kontrol et
-                possible_domains = [
-                    'https://cdn.canlitv.vin',
-                    'https://stream.canlitv.vin',
-                    'https://live.canlitv.vin',
-                    'https://player.canlitv.vin',
-                    'https://tv.canlitv.vin',
-                    'https://media.canlitv.vin',
-                    'https://cdn.canlitv.com',
-                    'https://stream.canlitv.com'
-                ]
-                
-                for domain in possible_domains:
-                    potential_url = f"{domain}/{part}"
-                    logger.info(f"Parçalardan oluşturulan potansiyel m3u URL: {potential_url}")
-                    
-                    # Bu URL'yi kontrol et (başlık kontrolü yeterli)
-                    try:
-                        head_response = requests.head(potential_url, timeout=5)
-                        if head_response.status_code < 400:
-                            logger.info(f"Geçerli parçalanmış m3u URL bulundu: {potential_url}")
-                            return potential_url
-                    except:
-                        continue
+        if url_parts and time.monotonic() < deadline:
+            # Olası sunucu domainleri
+            possible_domains = [
+                'https://cdn.canlitv.vin',
+                'https://stream.canlitv.vin',
+                'https://live.canlitv.vin',
+                'https://player.canlitv.vin',
+                'https://tv.canlitv.vin',
+                'https://media.canlitv.vin',
+                'https://cdn.canlitv.com',
+                'https://stream.canlitv.com'
+            ]
+            potential_urls = [f"{domain}/{part}" for part in url_parts for domain in possible_domains]
+            logger.info(f"Parçalardan {len(potential_urls)} potansiyel m3u URL oluşturuldu")
+            
+            # Başlık kontrolü yeterli, hepsi aynı anda denenir
+            m3u_url = probe_stream_urls(potential_urls, deadline)
+            if m3u_url:
+                logger.info(f"Geçerli parçalanmış m3u URL bulundu: {m3u_url}")
+                return m3u_url
         
-        logger.warning(f"GeoLive iframe'inde m3u URL bulunamadı")
+        logger.warning(f"GeoLive iframe'inde statik çözümleme ile m3u URL bulunamadı")
         return None
         
     except Exception as e:
         logger.error(f"GeoLive iframe işleme hatası: {str(e)}")
         return None
 
-def extract_geolive_with_selenium(iframe_url, referer_url):
-    """Selenium ve Chrome Stealth ile GeoLive iframe'den m3u URL çıkarma"""
-    try:
-        logger.info(f"Selenium ile GeoLive iframe işleniyor: {iframe_url}")
-        
-        # Selenium'un kurulu olup olmadığını kontrol et
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-        except ImportError:
-            logger.warning("Selenium paketleri bulunamadı, otomatik kurmayı deniyorum...")
-            import subprocess
-            import sys
-            
-            # Pip ile gerekli paketleri yükle
-            packages = ["selenium", "webdriver-manager", "selenium-stealth"]
-            for package in packages:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package], 
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            logger.info("Selenium paketleri başarıyla kuruldu")
-            
-            try:
-                import selenium_stealth
-            except ImportError:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "selenium-stealth"],
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                import selenium_stealth
-                logger.info("Selenium Stealth başarıyla kuruldu")
-        
-        # WebDriver Manager ile Chrome Driver'ı otomatik kur
+# Bilinen CDN desenlerinin eşzamanlı denenmesi ve desen bazlı istatistikleri
+CDN_STATS_FILE = os.path.join(CACHE_DIR, "cdn_stats.json")
+CDN_PROBE_TIMEOUT = 5  # Her HEAD isteği için zaman aşımı (saniye)
+CDN_PRUNE_MIN_ATTEMPTS = 20  # Bu kadar denemede hiç yanıt vermemiş desen atlanır
+CDN_RETRY_DAYS = 3  # Atlanan desen son denemesinin üzerinden bu kadar gün geçince yeniden denenir
+CDN_STATS_WINDOW = 200  # Deneme sayısı buna ulaşınca sayaçlar yarıya indirilir (eski sonuçlar söner)
+
+def cdn_stats_key(url):
+    """Şablonu bilinmeyen adresler için istatistik anahtarı: host ve son parça hariç yol"""
+    parts = urllib.parse.urlsplit(url)
+    return parts.netloc + parts.path.rsplit('/', 1)[0] + '/'
+
+class CDNStats:
+    """
+    Desen denemelerinin desen bazında (şablon ya da host ve yol öneki) deneme/başarı sayısını,
+    ortalama süresini ve son deneme zamanını saklar. order() adayları geçmişte en çok çalışan
+    desenler önce olacak şekilde sıralar.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+        self._dirty = False
+    
+    def _ensure_loaded(self):
+        if self._data is None:
+            # Eski sürümün host bazlı kayıtları ('/' içermeyen anahtarlar) tüm host'u tek desen sayıyordu
+            self._data = {key: entry for key, entry in _load_json_file(self.path, {}).items() if '/' in key}
+    
+    @staticmethod
+    def _pruned(entry):
+        """Yeterince denenip hiç yanıt vermemiş ve yeniden deneme zamanı gelmemiş desen"""
+        if not entry or entry['attempts'] < CDN_PRUNE_MIN_ATTEMPTS or entry['successes'] > 0:
+            return False
         try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            chromedriver_path = ChromeDriverManager().install()
-        except Exception as e:
-            logger.warning(f"Chrome Driver otomatik kurulumu hatası: {e}")
-            # Sistem PATH'inde ChromeDriver'ı aramaya çalış
-            chromedriver_path = "chromedriver"
+            last_attempt = datetime.fromisoformat(entry.get('last_attempt', ''))
+        except ValueError:
+            return False
+        return datetime.now() - last_attempt < timedelta(days=CDN_RETRY_DAYS)
+    
+    def order(self, urls, keys=None):
+        """
+        URL'leri desen başarı oranına göre sıralar (hiç denenmemiş desenler 0.5 sayılır, eşitlikte
+        verilen sıra korunur); hiç yanıt vermediği kesinleşmiş desenleri CDN_RETRY_DAYS dolana
+        kadar çıkarır. keys, URL'den istatistik anahtarına (şablon) eşlemedir.
+        """
+        keys = keys or {}
+        with self._lock:
+            self._ensure_loaded()
+            stats = {url: self._data.get(keys.get(url) or cdn_stats_key(url)) for url in urls}
         
-        # Chrome Options ayarlamaları - CI/CD ortamları için özel ayarlar
-        chrome_options = Options()
+        def rate(url):
+            entry = stats[url] or {'attempts': 0, 'successes': 0}
+            return (entry['successes'] + 1) / (entry['attempts'] + 2)
         
-        # Github Actions ve CI ortamları için gerekli ayarlar
-        chrome_options.add_argument("--headless=new")  # Yeni headless modu kullan
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
+        kept = [url for url in urls if not self._pruned(stats[url])]
+        if len(kept) < len(urls):
+            logger.info(f"Hiç yanıt vermeyen {len(urls) - len(kept)} CDN adresi atlandı")
+        return sorted(kept, key=rate, reverse=True)
+    
+    def record(self, key, latency, success):
+        """Bir HEAD denemesinin sonucunu desen anahtarı altında kaydeder"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._data.setdefault(key, {'attempts': 0, 'successes': 0, 'avg_latency': 0.0})
+            if entry['attempts'] >= CDN_STATS_WINDOW:
+                entry['attempts'] //= 2
+                entry['successes'] = (entry['successes'] + 1) // 2
+            entry['attempts'] += 1
+            entry['last_attempt'] = datetime.now().isoformat()
+            if success:
+                entry['successes'] += 1
+                entry['avg_latency'] = round(entry['avg_latency'] + (latency - entry['avg_latency']) / entry['successes'], 3)
+            self._dirty = True
+    
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                _save_json_file(self.path, self._data)
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"CDN istatistikleri yazılamadı: {e}")
+
+cdn_stats = CDNStats(CDN_STATS_FILE)
+
+def _probe_cdn_url(url, key):
+    """Desen adresine HEAD isteği gönderir ve sonucu cdn_stats'a desen anahtarıyla işler"""
+    started = time.monotonic()
+    try:
+        ok = http_head(url, headers={"User-Agent": USER_AGENT}, timeout=CDN_PROBE_TIMEOUT).status_code < 400
+    except Exception:
+        ok = False
+    cdn_stats.record(key, time.monotonic() - started, ok)
+    return ok
+
+def probe_stream_urls(urls, deadline=None, keys=None):
+    """
+    Aday m3u adreslerinin hepsini aynı anda dener ve ilk çalışanı döndürür.
+    Adaylar cdn_stats'a göre sıralanır; ilk başarıdan sonra bekleyen istekler iptal edilir,
+    havada olanlar sonuçlarını istatistiğe yazıp arka planda biter. keys verilirse (URL'den
+    şablona) istatistikler şablon bazında, verilmezse host ve yol öneki bazında tutulur.
+    """
+    keys = keys or {}
+    urls = cdn_stats.order(list(dict.fromkeys(urls)), keys)
+    if not urls:
+        return None
+    
+    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(urls)), thread_name_prefix='cdn-probe')
+    futures = {executor.submit(_probe_cdn_url, url, keys.get(url) or cdn_stats_key(url)): url for url in urls}
+    try:
+        for future in concurrent.futures.as_completed(futures, timeout=timeout):
+            if future.result():
+                return futures[future]
+    except concurrent.futures.TimeoutError:
+        logger.warning("Desen denemeleri süre bütçesi dolduğu için kesildi")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None
+
+def build_known_geolive_patterns(channel_name):
+    """
+    GeoLive kanal adından bilinen CDN adres desenlerini üretir. {adres: şablon} sözlüğü döndürür;
+    şablon cdn_stats anahtarıdır, böylece her kanal için denenen genel bir şablonun başarısızlığı
+    aynı host'taki diğer şablonları ve sabit adresleri etkilemez. Şablon alanları: {name} kanal
+    adı, {trt} '-canli-yayin' eki atılmış ad, {first}/{last} adın ilk/son '-' parçası.
+    """
+    fields = {
+        'name': channel_name,
+        'trt': channel_name.replace('-canli-yayin', ''),
+        'first': channel_name.split('-')[0],
+        'last': channel_name.split('-')[-1],
+    }
+    templates = [
+        "https://canlitv.center/stream/{name}.m3u8",
+        "https://cdn.yayin.com.tr/tv/{name}/playlist.m3u8",
+        "https://tv-{name}.live.trt.com.tr/master.m3u8",
+        "https://stream.canlitv.com/{name}/tracks-v1/index.m3u8",
+        "https://canlitv-pull.ercdn.net/{name}/playlist.m3u8",
+        # Bayrak TV gibi özel kanallar için pattern
+        "https://stream.tvcdn.biz/{name}/tracks-v1/index.m3u8",
+        "https://live.artidijitalmedya.com/{name}/index.m3u8",
+        # TRT kanalları için özel patternler
+        "https://tv-{trt}.medya.trt.com.tr/master.m3u8",
+        # Özel TV kanalları için patternler
+        "https://{first}.blutv.com/blutv_{first}/live.m3u8",
+        # Azerbaycan kanalları için özel patternler
+        "https://streams.livetv.az/{name}/playlist.m3u8",
+        "https://streams.livetv.az/azerbaycan/{name}/playlist.m3u8",
+        "https://yayin.canlitv.day/{name}/playlist.m3u8"
+    ]
+
+    # Azerbaycan kanalları için özel patternler
+    if any(keyword in channel_name.lower() for keyword in ['az', 'azerbaijan', 'azerbaycan', 'idman', 'ictimai', 'xezer']):
+        azerbaijan_patterns = [
+            "https://streams.livetv.az/azerbaijan/ictimai_stream2/playlist.m3u8",
+            "https://streams.livetv.az/azerbaijan/aztv_stream2/playlist.m3u8",
+            "https://streams.livetv.az/azerbaijan/idman_stream/playlist.m3u8",
+            "https://streams.livetv.az/azerbaijan/xazar_sd_stream_2/playlist.m3u8",
+            "https://live.livestreamtv.ca/azstar/smil:azstar.smil/playlist.m3u8",
+            "https://streams.livetv.az/azerbaijan/cbc_stream1/playlist.m3u8",
+            "https://streams.livetv.az/azerbaijan/arb24_stream1/playlist.m3u8"
+        ]
+        templates.extend(azerbaijan_patterns)
+        logger.info(f"Azerbaycan kanalı tespit edildi, {len(azerbaijan_patterns)} özel pattern eklendi")
+
+    # Eurostar ve diğer tematik kanallar için özel patternler
+    if "eurostar" in channel_name:
+        eurostar_patterns = [
+            "https://stream.eurostar.com.tr/eurostar/smil:eurostar.smil/playlist.m3u8",
+            "https://mn-nl.mncdn.com/eurostar/eurostar/chunklist.m3u8",
+            "https://xrklj56s.rocketcdn.com/eurostar.stream_720p/chunklist.m3u8",
+            "https://streaming.eurostar.com.tr/eurostar/eurostar/playlist.m3u8",
+            # Bilinen diğer CDN'ler için
+            "https://cdn-eurostar.yayin.com.tr/eurostar/eurostar/playlist.m3u8",
+            "https://live.duhnet.tv/S2/HLS_LIVE/eurostar/playlist.m3u8"
+        ]
+        templates.extend(eurostar_patterns)
+        logger.info(f"Eurostar için {len(eurostar_patterns)} özel pattern eklendi")
+
+    # Sinema kanalları için özel patternler
+    elif "sinema" in channel_name:
+        templates.extend([
+            "https://sinema-{last}.blutv.com/live/playlist.m3u8",
+            "https://cdn-sinema.yayin.com.tr/{name}/playlist.m3u8"
+        ])
+
+    # Spor kanalları için özel patternler
+    elif "spor" in channel_name or "sport" in channel_name:
+        templates.extend([
+            "https://live.sportstv.com.tr/{name}/playlist.m3u8",
+            "https://spor.blutv.com/{name}/live.m3u8"
+        ])
+
+    # Belgesel kanalları için özel patternler
+    elif "belgesel" in channel_name or "discovery" in channel_name or "national" in channel_name:
+        templates.extend([
+            "https://d-{name}.blutv.com/live/playlist.m3u8",
+            "https://belgesel.duhnet.tv/{name}/playlist.m3u8"
+        ])
+
+    # Çocuk kanalları için özel patternler
+    elif "cocuk" in channel_name or "kids" in channel_name or "cartoon" in channel_name:
+        templates.extend([
+            "https://cdn-cocuk.yayin.com.tr/{name}/playlist.m3u8",
+            "https://kids.blutv.com/{name}/playlist.m3u8"
+        ])
+
+    patterns = {}
+    for template in templates:
+        patterns.setdefault(template.format(**fields), template)
+    return patterns
+
+def probe_known_geolive_patterns(iframe_url, deadline=None):
+    """
+    GeoLive kanal adından türetilen bilinen CDN adreslerini aynı anda dener.
+    deadline verilirse denemeler kalan bütçeyle sınırlanır, bütçe dolmuşsa hiç denenmez.
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        logger.warning("GeoLive süre bütçesi doldu, bilinen desenler atlanıyor")
+        return None
+    try:
+        channel_name = iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else None
+        if not channel_name:
+            return None
+        known_patterns = build_known_geolive_patterns(channel_name)
+        logger.info(f"Bilinen M3U patternleri deneniyor: {channel_name} ({len(known_patterns)} aday)")
+        m3u_url = probe_stream_urls(list(known_patterns), deadline, keys=known_patterns)
+        if m3u_url:
+            logger.info(f"Bilinen pattern çalışıyor: {m3u_url}")
+        return m3u_url
+    except Exception as pattern_error:
+        logger.error(f"URL pattern denemesi hatası: {pattern_error}")
+    return None
+
+def _scan_geolive_with_selenium(driver, iframe_url, deadline=None):
+    """
+    Havuzdan alınan tarayıcıda GeoLive sayfasını açar ve m3u URL'sini arar.
+    deadline verilirse sayfa yükleme ve manifest bekleme süreleri kalan bütçeyle sınırlanır.
+    """
+    from selenium.webdriver.common.by import By
+    
+    def set_page_load_budget():
+        remaining = _budget_seconds(deadline, BROWSER_PAGE_LOAD_TIMEOUT)
+        if remaining <= 0:
+            return False
+        driver.set_page_load_timeout(max(1, int(remaining)))
+        return True
+    
+    try:
+        # Önce cookieleri ayarla
+        try:
+            logger.info("Cookies ayarlanıyor...")
+            if not set_page_load_budget():
+                return None
+            driver.get(BASE_URL)
+            driver.add_cookie({"name": "geolivevisit", "value": "1"})
+            driver.add_cookie({"name": "watched", "value": "true"})
+            driver.add_cookie({"name": "tvpage", "value": "active"})
+            logger.info("Cookies başarıyla ayarlandı")
+        except Exception as cookie_error:
+            logger.warning(f"Cookie ayarlama hatası: {cookie_error}")
         
-        # Stealth mode tespiti zorlaştıracak ayarlar
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Sayfayı yükle
+        logger.info(f"GeoLive iframe yükleniyor: {iframe_url}")
+        if not set_page_load_budget():
+            logger.warning("GeoLive süre bütçesi doldu, iframe yüklenmiyor")
+            return None
+        _drain_performance_log(driver)
+        driver.get(iframe_url)
         
-        # Farklı bir user-data-dir belirt (Github Actions için kritik)
-        import tempfile
-        import os
-        import random
-        import string
+        # Oynatıcının manifest isteğini bekle (sabit bekleme yerine ağ olayları)
+        logger.info("Manifest isteği bekleniyor...")
+        m3u_url = wait_for_stream_request(driver, timeout=_budget_seconds(deadline, STREAM_CAPTURE_TIMEOUT))
+        if m3u_url:
+            return m3u_url
         
-        # Rastgele bir kullanıcı profili oluştur
-        random_dir = ''.join(random.choice(string.ascii_lowercase) for i in range(10))
-        temp_dir = os.path.join(tempfile.gettempdir(), f"chrome_profile_{random_dir}")
-        chrome_options.add_argument(f"--user-data-dir={temp_dir}")
+        # Debug için ekran görüntüsü al
+        try:
+            screenshot_path = f"debug_geolive_screenshot_{iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else 'unknown'}.png"
+            driver.save_screenshot(screenshot_path)
+            logger.info(f"Ekran görüntüsü alındı: {screenshot_path}")
+        except Exception as ss_error:
+            logger.warning(f"Ekran görüntüsü alma hatası: {ss_error}")
         
-        # Diğer ayarlar
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--disable-site-isolation-trials")
-        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
-        chrome_options.add_argument(f"--referer={referer_url}")
+        # CAPTCHA kontrolü
+        if "captcha" in driver.page_source.lower() or "g-recaptcha" in driver.page_source.lower():
+            logger.warning("Selenium'da CAPTCHA algılandı")
+            # CI/CD ortamında CAPTCHA çözümü beklemek anlamsız, atlayalım
+            logger.warning("CI/CD ortamında CAPTCHA çözümü atlanıyor")
         
-        # CI/CD ortamlar için ek ayarlar
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-setuid-sandbox")
-        chrome_options.add_argument("--disable-infobars")
+        # Sayfa kaynak kodunu al ve m3u URL'lerini bul
+        page_source = driver.page_source
         
-        # WebDriver'ı başlat
-        driver = None
+        # Debug amaçlı kaydet
+        debug_file = f"selenium_geolive_{iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else 'unknown'}.html"
         try:
-            service = Service(chromedriver_path)
-            logger.info("Chrome Driver başlatılıyor...")
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info("Chrome Driver başarıyla başlatıldı")
-            
-            # Selenium Stealth uygulaması - otomatik tarayıcı tespitini zorlaştırır
-            try:
-                import selenium_stealth
-                selenium_stealth.stealth(driver,
-                    languages=["tr-TR", "tr", "en-US", "en"],
-                    vendor="Google Inc.",
-                    platform="Win32",
-                    webgl_vendor="Intel Inc.",
-                    renderer="Intel Iris OpenGL Engine",
-                    fix_hairline=True,
-                )
-                logger.info("Selenium Stealth modu aktif edildi")
-            except Exception as e:
-                logger.warning(f"Selenium Stealth uygulanamadı: {e}")
-                
-        except Exception as e:
-            logger.error(f"Chrome Driver başlatma hatası: {e}")
-            
-            # Alternatif yöntem: Farklı ayarlarla yeniden dene
-            try:
-                logger.info("Alternatif ayarlarla Chrome Driver başlatma deneniyor...")
-                chrome_options = Options()
-                chrome_options.add_argument("--headless=new")
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                chrome_options.add_argument("--disable-gpu")
-                
-                # Rastgele bir başka user-data-dir dene
-                random_dir = ''.join(random.choice(string.ascii_lowercase) for i in range(10))
-                temp_dir = os.path.join(tempfile.gettempdir(), f"chrome_profile_{random_dir}")
-                chrome_options.add_argument(f"--user-data-dir={temp_dir}")
-                
-                driver = webdriver.Chrome(options=chrome_options)
-                logger.info("Chrome Driver alternatif ayarlarla başlatıldı")
-            except Exception as alt_error:
-                logger.error(f"Alternatif Chrome Driver başlatma hatası: {alt_error}")
-                
-                # Doğrudan kanal URL'inden m3u adresi çıkarmaya çalış
-                logger.warning("Selenium başlatılamadı. Direk URL desenleri deneniyor...")
-                try:
-                    # Kanal adını al ve bilinen URL desenlerini dene
-                    channel_name = iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else None
-                    if channel_name:
-                        logger.info(f"Bilinen M3U patternleri deneniyor: {channel_name}")
-                        known_patterns = [
-                            f"https://canlitv.center/stream/{channel_name}.m3u8",
-                            f"https://cdn.yayin.com.tr/tv/{channel_name}/playlist.m3u8",
-                            f"https://tv-{channel_name}.live.trt.com.tr/master.m3u8",
-                            f"https://stream.canlitv.com/{channel_name}/tracks-v1/index.m3u8",
-                            f"https://canlitv-pull.ercdn.net/{channel_name}/playlist.m3u8",
-                            # Bayrak TV gibi özel kanallar için pattern
-                            f"https://stream.tvcdn.biz/{channel_name}/tracks-v1/index.m3u8",
-                            f"https://live.artidijitalmedya.com/{channel_name}/index.m3u8",
-                            # TRT kanalları için özel patternler
-                            f"https://tv-{channel_name.replace('-canli-yayin', '')}.medya.trt.com.tr/master.m3u8",
-                            # Özel TV kanalları için patternler
-                            f"https://{channel_name.split('-')[0]}.blutv.com/blutv_{channel_name.split('-')[0]}/live.m3u8",
-                            # Azerbaycan kanalları için özel patternler
-                            f"https://streams.livetv.az/{channel_name}/playlist.m3u8",
-                            f"https://streams.livetv.az/azerbaycan/{channel_name}/playlist.m3u8",
-                            f"https://yayin.canlitv.day/{channel_name}/playlist.m3u8"
-                        ]
-                        
-                        # Azerbaycan kanalları için özel patternler
-                        if any(keyword in channel_name.lower() for keyword in ['az', 'azerbaijan', 'azerbaycan', 'idman', 'ictimai', 'xezer']):
-                            azerbaijan_patterns = [
-                                "https://streams.livetv.az/azerbaijan/ictimai_stream2/playlist.m3u8",
-                                "https://streams.livetv.az/azerbaijan/aztv_stream2/playlist.m3u8",
-                                "https://streams.livetv.az/azerbaijan/idman_stream/playlist.m3u8",
-                                "https://streams.livetv.az/azerbaijan/xazar_sd_stream_2/playlist.m3u8",
-                                "https://live.livestreamtv.ca/azstar/smil:azstar.smil/playlist.m3u8",
-                                "https://streams.livetv.az/azerbaijan/cbc_stream1/playlist.m3u8",
-                                "https://streams.livetv.az/azerbaijan/arb24_stream1/playlist.m3u8"
-                            ]
-                            known_patterns.extend(azerbaijan_patterns)
-                            logger.info(f"Azerbaycan kanalı tespit edildi, {len(azerbaijan_patterns)} özel pattern eklendi")
-                        
-                        # Eurostar ve diğer tematik kanallar için özel patternler
-                        if "eurostar" in channel_name:
-                            eurostar_patterns = [
-                                "https://stream.eurostar.com.tr/eurostar/smil:eurostar.smil/playlist.m3u8",
-                                "https://mn-nl.mncdn.com/eurostar/eurostar/chunklist.m3u8",
-                                "https://xrklj56s.rocketcdn.com/eurostar.stream_720p/chunklist.m3u8",
-                                "https://streaming.eurostar.com.tr/eurostar/eurostar/playlist.m3u8",
-                                # Bilinen diğer CDN'ler için
-                                "https://cdn-eurostar.yayin.com.tr/eurostar/eurostar/playlist.m3u8",
-                                "https://live.duhnet.tv/S2/HLS_LIVE/eurostar/playlist.m3u8"
-                            ]
-                            known_patterns.extend(eurostar_patterns)
-                            logger.info(f"Eurostar için {len(eurostar_patterns)} özel pattern eklendi")
-                        
-                        # Sinema kanalları için özel patternler
-                        elif "sinema" in channel_name:
-                            sinema_patterns = [
-                                f"https://sinema-{channel_name.split('-')[-1]}.blutv.com/live/playlist.m3u8",
-                                f"https://cdn-sinema.yayin.com.tr/{channel_name}/playlist.m3u8"
-                            ]
-                            known_patterns.extend(sinema_patterns)
-                        
-                        # Spor kanalları için özel patternler
-                        elif "spor" in channel_name or "sport" in channel_name:
-                            sport_patterns = [
-                                f"https://live.sportstv.com.tr/{channel_name}/playlist.m3u8",
-                                f"https://spor.blutv.com/{channel_name}/live.m3u8"
-                            ]
-                            known_patterns.extend(sport_patterns)
-                        
-                        # Belgesel kanalları için özel patternler
-                        elif "belgesel" in channel_name or "discovery" in channel_name or "national" in channel_name:
-                            documentary_patterns = [
-                                f"https://d-{channel_name}.blutv.com/live/playlist.m3u8",
-                                f"https://belgesel.duhnet.tv/{channel_name}/playlist.m3u8"
-                            ]
-                            known_patterns.extend(documentary_patterns)
-                        
-                        # Çocuk kanalları için özel patternler
-                        elif "cocuk" in channel_name or "kids" in channel_name or "cartoon" in channel_name:
-                            kids_patterns = [
-                                f"https://cdn-cocuk.yayin.com.tr/{channel_name}/playlist.m3u8",
-                                f"https://kids.blutv.com/{channel_name}/playlist.m3u8"
-                            ]
-                            known_patterns.extend(kids_patterns)
-                        
-                        for pattern in known_patterns:
-                            try:
-                                head_response = requests.head(pattern, timeout=5)
-                                if head_response.status_code < 400:
-                                    logger.info(f"Bilinen pattern çalışıyor: {pattern}")
-                                    return pattern
-                            except:
-                                continue
-                except Exception as pattern_error:
-                    logger.error(f"URL pattern denemesi hatası: {pattern_error}")
-                
-                return None
+            with open(debug_file, 'w', encoding='utf-8') as f:
+                f.write(page_source)
+            logger.info(f"Selenium sayfa kaynağı kaydedildi: {debug_file}")
+        except Exception as save_error:
+            logger.warning(f"Sayfa kaynağı kaydetme hatası: {save_error}")
         
-        if not driver:
-            logger.error("Driver oluşturulamadı")
-            return None
+        # İçerikteki m3u URL'lerini bul
+        m3u_url = find_m3u_in_content(page_source)
+        if m3u_url:
+            logger.info(f"Selenium ile GeoLive sayfasında m3u URL bulundu: {m3u_url}")
+            return m3u_url
         
+        # JavaScript ile veri topla
         try:
-            # Zaman aşımı ayarları
-            driver.set_page_load_timeout(30)
-            
-            # Önce cookieleri ayarla
-            try:
-                logger.info("Cookies ayarlanıyor...")
-                driver.get(BASE_URL)
-                driver.add_cookie({"name": "geolivevisit", "value": "1"})
-                driver.add_cookie({"name": "watched", "value": "true"})
-                driver.add_cookie({"name": "tvpage", "value": "active"})
-                logger.info("Cookies başarıyla ayarlandı")
-            except Exception as cookie_error:
-                logger.warning(f"Cookie ayarlama hatası: {cookie_error}")
-            
-            # Sayfayı yükle
-            logger.info(f"GeoLive iframe yükleniyor: {iframe_url}")
-            driver.get(iframe_url)
-            
-            # Sayfanın yüklenmesini bekle
-            logger.info("Sayfa yüklenmesi bekleniyor...")
-            time.sleep(5)  # Sayfanın tamamen yüklenmesi için biraz bekle
-            
-            # Debug için ekran görüntüsü al
-            try:
-                screenshot_path = f"debug_geolive_screenshot_{iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else 'unknown'}.png"
-                driver.save_screenshot(screenshot_path)
-                logger.info(f"Ekran görüntüsü alındı: {screenshot_path}")
-            except Exception as ss_error:
-                logger.warning(f"Ekran görüntüsü alma hatası: {ss_error}")
-            
-            # CAPTCHA kontrolü
-            if "captcha" in driver.page_source.lower() or "g-recaptcha" in driver.page_source.lower():
-                logger.warning("Selenium'da CAPTCHA algılandı")
-                # CI/CD ortamında CAPTCHA çözümü beklemek anlamsız, atlayalım
-                logger.warning("CI/CD ortamında CAPTCHA çözümü atlanıyor")
-            
-            # Sayfa kaynak kodunu al ve m3u URL'lerini bul
-            page_source = driver.page_source
-            
-            # Debug amaçlı kaydet
-            debug_file = f"selenium_geolive_{iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else 'unknown'}.html"
-            try:
-                with open(debug_file, 'w', encoding='utf-8') as f:
-                    f.write(page_source)
-                logger.info(f"Selenium sayfa kaynağı kaydedildi: {debug_file}")
-            except Exception as save_error:
-                logger.warning(f"Sayfa kaynağı kaydetme hatası: {save_error}")
-            
-            # İçerikteki m3u URL'lerini bul
-            m3u_url = find_m3u_in_content(page_source)
-            if m3u_url:
-                logger.info(f"Selenium ile GeoLive sayfasında m3u URL bulundu: {m3u_url}")
-                driver.quit()
-                return m3u_url
-            
-            # JavaScript ile veri topla
-            try:
-                # JavaScript çalıştırarak daha derin analiz yap
-                logger.info("JavaScript analizi yapılıyor...")
-                js_result = driver.execute_script("""
-                function extractM3uUrls() {
-                    var results = [];
-                    
-                    // 1. Video elementlerini kontrol et
-                    var videos = document.querySelectorAll('video');
-                    for (var i = 0; i < videos.length; i++) {
-                        if (videos[i].src && videos[i].src.includes('.m3u')) {
-                            results.push({type: 'video.src', url: videos[i].src});
-                        }
-                        
-                        var sources = videos[i].querySelectorAll('source');
-                        for (var j = 0; j < sources.length; j++) {
-                            if (sources[j].src && sources[j].src.includes('.m3u')) {
-                                results.push({type: 'source.src', url: sources[j].src});
-                            }
-                        }
-                    }
-                    
-                    // 2. JavaScript değişkenleri ara
-                    var pageSource = document.documentElement.outerHTML;
-                    
-                    // Common patterns
-                    var patterns = [
-                        /var\\s+([a-zA-Z0-9_$]+)\\s*=\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
-                        /source\\s*:\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
-                        /file\\s*:\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
-                        /url\\s*:\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
-                        /src\\s*=\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
-                        /(https?:\\/\\/[^'"\s]+\\.m3u[8]?[^'"\s]*)/g
-                    ];
-                    
-                    for (var i = 0; i < patterns.length; i++) {
-                        var regex = patterns[i];
-                        var match;
-                        
-                        while ((match = regex.exec(pageSource)) !== null) {
-                            var url = match[1].includes('http') ? match[1] : match[2];
-                            if (url && url.includes('.m3u')) {
-                                results.push({type: 'regex', url: url});
-                            }
-                        }
+            # JavaScript çalıştırarak daha derin analiz yap
+            logger.info("JavaScript analizi yapılıyor...")
+            js_result = driver.execute_script("""
+            function extractM3uUrls() {
+                var results = [];
+                
+                // 1. Video elementlerini kontrol et
+                var videos = document.querySelectorAll('video');
+                for (var i = 0; i < videos.length; i++) {
+                    if (videos[i].src && videos[i].src.includes('.m3u')) {
+                        results.push({type: 'video.src', url: videos[i].src});
                     }
                     
-                    // 3. Network kayıtlarındaki m3u isteklerini kontrol et
-                    if (window.performance && window.performance.getEntries) {
-                        var entries = window.performance.getEntries();
-                        for (var i = 0; i < entries.length; i++) {
-                            if (entries[i].name && entries[i].name.includes('.m3u')) {
-                                results.push({type: 'network', url: entries[i].name});
-                            }
+                    var sources = videos[i].querySelectorAll('source');
+                    for (var j = 0; j < sources.length; j++) {
+                        if (sources[j].src && sources[j].src.includes('.m3u')) {
+                            results.push({type: 'source.src', url: sources[j].src});
                         }
                     }
-                    
-                    return results;
                 }
                 
-                return extractM3uUrls();
-                """)
+                // 2. JavaScript değişkenleri ara
+                var pageSource = document.documentElement.outerHTML;
                 
-                logger.info(f"JavaScript sonucu: {js_result}")
+                // Common patterns
+                var patterns = [
+                    /var\\s+([a-zA-Z0-9_$]+)\\s*=\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
+                    /source\\s*:\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
+                    /file\\s*:\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
+                    /url\\s*:\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
+                    /src\\s*=\\s*['"]([^'"]*\\.m3u[^'"]*)['"]/g,
+                    /(https?:\\/\\/[^'"\s]+\\.m3u[8]?[^'"\s]*)/g
+                ];
                 
-                if js_result and len(js_result) > 0:
-                    for result in js_result:
-                        if result.get('url') and '.m3u' in result.get('url'):
-                            logger.info(f"JavaScript analizi ile m3u URL bulundu: {result.get('url')}")
-                            driver.quit()
-                            return result.get('url')
+                for (var i = 0; i < patterns.length; i++) {
+                    var regex = patterns[i];
+                    var match;
+                    
+                    while ((match = regex.exec(pageSource)) !== null) {
+                        var url = match[1].includes('http') ? match[1] : match[2];
+                        if (url && url.includes('.m3u')) {
+                            results.push({type: 'regex', url: url});
+                        }
+                    }
+                }
                 
-            except Exception as js_error:
-                logger.warning(f"JavaScript analizi hatası: {js_error}")
-            
-            # HAR dosyası oluştur ve içinden m3u8 URL'leri ara
-            try:
-                # Performance loglarını al
-                logger.info("Performance logları alınıyor...")
-                logs = driver.execute_script("""
-                    var performance = window.performance || window.mozPerformance || window.msPerformance || window.webkitPerformance || {};
-                    var network = performance.getEntries() || [];
-                    return network;
-                """)
+                // 3. Network kayıtlarındaki m3u isteklerini kontrol et
+                if (window.performance && window.performance.getEntries) {
+                    var entries = window.performance.getEntries();
+                    for (var i = 0; i < entries.length; i++) {
+                        if (entries[i].name && entries[i].name.includes('.m3u')) {
+                            results.push({type: 'network', url: entries[i].name});
+                        }
+                    }
+                }
                 
-                # Network trafiğinde m3u8 URL'lerini ara
-                if logs:
-                    for entry in logs:
-                        name = entry.get('name', '')
-                        if name and ('.m3u8' in name or '.m3u' in name):
-                            logger.info(f"Performance loglarından m3u bulundu: {name}")
-                            driver.quit()
-                            return name
-            except Exception as perf_error:
-                logger.warning(f"Performance logları alınırken hata: {perf_error}")
+                return results;
+            }
             
-            # İframe içeriğini kontrol et
-            try:
-                logger.info("iframe'ler aranıyor...")
-                iframes = driver.find_elements(By.TAG_NAME, "iframe")
-                
-                for i, iframe in enumerate(iframes):
-                    try:
-                        iframe_src = iframe.get_attribute("src")
-                        logger.info(f"iframe {i} bulundu: {iframe_src}")
-                        
-                        # iframe'e geç
-                        driver.switch_to.frame(iframe)
-                        iframe_content = driver.page_source
-                        
-                        # Bu içerikte m3u URL'si ara
-                        m3u_url = find_m3u_in_content(iframe_content)
-                        if m3u_url:
-                            logger.info(f"iframe {i} içinde m3u URL bulundu: {m3u_url}")
-                            driver.quit()
-                            return m3u_url
-                        
-                        # Ana içeriğe geri dön
-                        driver.switch_to.default_content()
-                    except Exception as iframe_error:
-                        logger.warning(f"iframe {i} işleme hatası: {iframe_error}")
-                        driver.switch_to.default_content()
-            except Exception as iframes_error:
-                logger.warning(f"iframe'leri bulma hatası: {iframes_error}")
+            return extractM3uUrls();
+            """)
             
-            # Hiçbir şey bulunamadı
-            logger.warning(f"Selenium ile GeoLive iframe içinde m3u URL bulunamadı")
-            driver.quit()
+            logger.info(f"JavaScript sonucu: {js_result}")
             
-            # Son çare: Bilinen URL desenlerini dene
-            channel_name = iframe_url.split('kanal=')[1].split('&')[0] if 'kanal=' in iframe_url else None
-            if channel_name:
-                logger.info(f"Bilinen M3U patternleri deneniyor: {channel_name}")
-                known_patterns = [
-                    f"https://canlitv.center/stream/{channel_name}.m3u8",
-                    f"https://cdn.yayin.com.tr/tv/{channel_name}/playlist.m3u8",
-                    f"https://tv-{channel_name}.live.trt.com.tr/master.m3u8",
-                    f"https://stream.canlitv.com/{channel_name}/tracks-v1/index.m3u8",
-                    f"https://canlitv-pull.ercdn.net/{channel_name}/playlist.m3u8",
-                    # Bayrak TV gibi özel kanallar için pattern
-                    f"https://stream.tvcdn.biz/{channel_name}/tracks-v1/index.m3u8",
-                    f"https://live.artidijitalmedya.com/{channel_name}/index.m3u8",
-                    # TRT kanalları için özel patternler
-                    f"https://tv-{channel_name.replace('-canli-yayin', '')}.medya.trt.com.tr/master.m3u8",
-                    # Özel TV kanalları için patternler
-                    f"https://{channel_name.split('-')[0]}.blutv.com/blutv_{channel_name.split('-')[0]}/live.m3u8",
-                    # Azerbaycan kanalları için özel patternler
-                    f"https://streams.livetv.az/{channel_name}/playlist.m3u8",
-                    f"https://streams.livetv.az/azerbaycan/{channel_name}/playlist.m3u8",
-                    f"https://yayin.canlitv.day/{channel_name}/playlist.m3u8"
-                ]
-                
-                # Azerbaycan kanalları için özel patternler
-                if any(keyword in channel_name.lower() for keyword in ['az', 'azerbaijan', 'azerbaycan', 'idman', 'ictimai', 'xezer']):
-                    azerbaijan_patterns = [
-                        "https://streams.livetv.az/azerbaijan/ictimai_stream2/playlist.m3u8",
-                        "https://streams.livetv.az/azerbaijan/aztv_stream2/playlist.m3u8",
-                        "https://streams.livetv.az/azerbaijan/idman_stream/playlist.m3u8",
-                        "https://streams.livetv.az/azerbaijan/xazar_sd_stream_2/playlist.m3u8",
-                        "https://live.livestreamtv.ca/azstar/smil:azstar.smil/playlist.m3u8",
-                        "https://streams.livetv.az/azerbaijan/cbc_stream1/playlist.m3u8",
-                        "https://streams.livetv.az/azerbaijan/arb24_stream1/playlist.m3u8"
-                    ]
-                    known_patterns.extend(azerbaijan_patterns)
-                    logger.info(f"Azerbaycan kanalı tespit edildi, {len(azerbaijan_patterns)} özel pattern eklendi")
-                
-                # Eurostar ve diğer tematik kanallar için özel patternler
-                if "eurostar" in channel_name:
-                    eurostar_patterns = [
-                        "https://stream.eurostar.com.tr/eurostar/smil:eurostar.smil/playlist.m3u8",
-                        "https://mn-nl.mncdn.com/eurostar/eurostar/chunklist.m3u8",
-                        "https://xrklj56s.rocketcdn.com/eurostar.stream_720p/chunklist.m3u8",
-                        "https://streaming.eurostar.com.tr/eurostar/eurostar/playlist.m3u8",
-                        # Bilinen diğer CDN'ler için
-                        "https://cdn-eurostar.yayin.com.tr/eurostar/eurostar/playlist.m3u8",
-                        "https://live.duhnet.tv/S2/HLS_LIVE/eurostar/playlist.m3u8"
-                    ]
-                    known_patterns.extend(eurostar_patterns)
-                    logger.info(f"Eurostar için {len(eurostar_patterns)} özel pattern eklendi")
-                
-                # Sinema kanalları için özel patternler
-                elif "sinema" in channel_name:
-                    sinema_patterns = [
-                        f"https://sinema-{channel_name.split('-')[-1]}.blutv.com/live/playlist.m3u8",
-                        f"https://cdn-sinema.yayin.com.tr/{channel_name}/playlist.m3u8"
-                    ]
-                    known_patterns.extend(sinema_patterns)
-                
-                # Spor kanalları için özel patternler
-                elif "spor" in channel_name or "sport" in channel_name:
-                    sport_patterns = [
-                        f"https://live.sportstv.com.tr/{channel_name}/playlist.m3u8",
-                        f"https://spor.blutv.com/{channel_name}/live.m3u8"
-                    ]
-                    known_patterns.extend(sport_patterns)
-                
-                # Belgesel kanalları için özel patternler
-                elif "belgesel" in channel_name or "discovery" in channel_name or "national" in channel_name:
-                    documentary_patterns = [
-                        f"https://d-{channel_name}.blutv.com/live/playlist.m3u8",
-                        f"https://belgesel.duhnet.tv/{channel_name}/playlist.m3u8"
-                    ]
-                    known_patterns.extend(documentary_patterns)
-                
-                # Çocuk kanalları için özel patternler
-                elif "cocuk" in channel_name or "kids" in channel_name or "cartoon" in channel_name:
-                    kids_patterns = [
-                        f"https://cdn-cocuk.yayin.com.tr/{channel_name}/playlist.m3u8",
-                        f"https://kids.blutv.com/{channel_name}/playlist.m3u8"
-                    ]
-                    known_patterns.extend(kids_patterns)
-                
-                for pattern in known_patterns:
-                    try:
-                        head_response = requests.head(pattern, timeout=5)
-                        if head_response.status_code < 400:
-                            logger.info(f"Bilinen pattern çalışıyor: {pattern}")
-                            return pattern
-                    except:
-                        continue
+            if js_result and len(js_result) > 0:
+                for result in js_result:
+                    if result.get('url') and '.m3u' in result.get('url'):
+                        logger.info(f"JavaScript analizi ile m3u URL bulundu: {result.get('url')}")
+                        return result.get('url')
             
-            return None
+        except Exception as js_error:
+            logger.warning(f"JavaScript analizi hatası: {js_error}")
+        
+        # HAR dosyası oluştur ve içinden m3u8 URL'leri ara
+        try:
+            # Performance loglarını al
+            logger.info("Performance logları alınıyor...")
+            logs = driver.execute_script("""
+                var performance = window.performance || window.mozPerformance || window.msPerformance || window.webkitPerformance || {};
+                var network = performance.getEntries() || [];
+                return network;
+            """)
             
-        except Exception as browse_error:
-            logger.error(f"GeoLive sayfası Selenium ile erişim hatası: {browse_error}")
-            try:
-                if driver:
-                    driver.quit()
-            except:
-                pass
+            # Network trafiğinde m3u8 URL'lerini ara
+            if logs:
+                for entry in logs:
+                    name = entry.get('name', '')
+                    if name and ('.m3u8' in name or '.m3u' in name):
+                        logger.info(f"Performance loglarından m3u bulundu: {name}")
+                        return name
+        except Exception as perf_error:
+            logger.warning(f"Performance logları alınırken hata: {perf_error}")
+        
+        # İframe içeriğini kontrol et
+        try:
+            logger.info("iframe'ler aranıyor...")
+            iframes = driver.find_elements(By.TAG_NAME, "iframe")
+            
+            for i, iframe in enumerate(iframes):
+                try:
+                    iframe_src = iframe.get_attribute("src")
+                    logger.info(f"iframe {i} bulundu: {iframe_src}")
+                    
+                    # iframe'e geç
+                    driver.switch_to.frame(iframe)
+                    iframe_content = driver.page_source
+                    
+                    # Bu içerikte m3u URL'si ara
+                    m3u_url = find_m3u_in_content(iframe_content)
+                    if m3u_url:
+                        logger.info(f"iframe {i} içinde m3u URL bulundu: {m3u_url}")
+                        return m3u_url
+                    
+                    # Ana içeriğe geri dön
+                    driver.switch_to.default_content()
+                except Exception as iframe_error:
+                    logger.warning(f"iframe {i} işleme hatası: {iframe_error}")
+                    driver.switch_to.default_content()
+        except Exception as iframes_error:
+            logger.warning(f"iframe'leri bulma hatası: {iframes_error}")
+        
+        return None
+    except Exception as browse_error:
+        logger.error(f"GeoLive sayfası Selenium ile erişim hatası: {browse_error}")
+        raise
+
+def extract_geolive_with_selenium(iframe_url, referer_url, deadline=None):
+    """
+    Selenium ve Chrome Stealth ile GeoLive iframe'den m3u URL çıkarma (tarayıcı havuzu ile).
+    deadline verilirse tarayıcı bekleme, sayfa yükleme ve manifest yakalama kalan süreyle sınırlıdır.
+    """
+    try:
+        logger.info(f"Selenium ile GeoLive iframe işleniyor: {iframe_url}")
+        
+        try:
+            with browser_pool.lease(timeout=_budget_seconds(deadline, BROWSER_LEASE_TIMEOUT)) as driver:
+                m3u_url = _scan_geolive_with_selenium(driver, iframe_url, deadline)
+        except BrowserUnavailableError as e:
+            logger.error(f"Chrome Driver başlatma hatası: {e}")
             return None
+        
+        if not m3u_url:
+            # Hiçbir şey bulunamadı (bilinen desenler process_geolive_iframe'de zaten denendi)
+            logger.warning(f"Selenium ile GeoLive iframe içinde m3u URL bulunamadı")
+        return m3u_url
             
     except Exception as e:
         logger.error(f"Selenium ile GeoLive iframe işleme hatası: {str(e)}")
         return None
 
+def _import_ytdlp():
+    """yt-dlp paketini içe aktarır, kurulu değilse pip ile kurmayı dener"""
+    try:
+        import yt_dlp
+    except ImportError:
+        logger.warning("yt-dlp paketi bulunamadı, otomatik kurmayı deniyorum...")
+        import subprocess
+        import sys
+        
+        # pip kullanarak yt-dlp'yi yüklemeyi dene
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "yt-dlp"], 
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        import yt_dlp
+        logger.info("yt-dlp paketi başarıyla kuruldu")
+    return yt_dlp
+
+_ytdlp_state = {'module': None, 'failed': False}
+_ytdlp_lock = threading.Lock()
+
+def _get_ytdlp():
+    """yt-dlp modülünü bir kez yükler; kurulamadıysa None döndürür"""
+    with _ytdlp_lock:
+        if _ytdlp_state['module'] is None and not _ytdlp_state['failed']:
+            try:
+                _ytdlp_state['module'] = _import_ytdlp()
+            except Exception as e:
+                logger.warning(f"yt-dlp kullanılamıyor, yt-dlp yöntemi atlanacak: {e}")
+                _ytdlp_state['failed'] = True
+        return _ytdlp_state['module']
+
 def extract_with_ytdlp(url):
     """yt-dlp kullanarak m3u8 linkini çıkarır"""
     try:
-        # yt-dlp'nin kurulu olup olmadığını kontrol et
-        try:
-            import yt_dlp
-        except ImportError:
-            logger.warning("yt-dlp paketi bulunamadı, otomatik kurmayı deniyorum...")
-            import subprocess
-            import sys
-            
-            # pip kullanarak yt-dlp'yi yüklemeyi dene
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "yt-dlp"], 
-                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            import yt_dlp
-            logger.info("yt-dlp paketi başarıyla kuruldu")
+        yt_dlp = _get_ytdlp()
+        if yt_dlp is None:
+            return None
         
         logger.info(f"yt-dlp ile çıkarma deneniyor: {url}")
         
@@ -1761,401 +2981,810 @@ def extract_with_ytdlp(url):
         logger.error(f"yt-dlp ile çıkarma hatası: {str(e)}")
         return None
 
-def find_m3u_in_content(content):
-    """HTML veya JavaScript içeriğinden m3u URL'lerini çıkarır"""
-    if not content:
-        return None
-        
-    # m3u/m3u8 URL'leri için regex pattern'leri - daha kapsamlı
-    patterns = [
-        r'source:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'file:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'src=[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'(https?://[^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        r'hls:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'videoSrc\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'video\s*src\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'url:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'playlist:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'hlsUrl\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'streamURL\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'["\'](https?://[^\'"\s]+/playlist\.m3u[8]?)[\'"]',
-        r'["\'](https?://[^\'"\s]+/manifest\.m3u[8]?)[\'"]',
-        r'["\'](https?://[^\'"\s]+/live\.m3u[8]?)[\'"]',
-        r'["\'](https?://[^\'"\s]+/index\.m3u[8]?)[\'"]',
-        r'["\'](https?://[^\'"\s]+/master\.m3u[8]?)[\'"]',
-        r'["\'](https?://[^\'"\s]+/stream\.m3u[8]?)[\'"]',
-        r'source\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'data-source=[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'data-url=[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'data-stream=[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'stream_url[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        r'streamUrl[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        r'mediaUrl[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        r'playURL[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        r'hls_url[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        r'hlsURL[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        r'videoURL[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
-        
-        # canlitv.vin özel desenleri
-        r'var\s+vidogevideo\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'var\s+kaynakurl\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'var\s+url\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'var\s+videolink\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'var\s+m3ulink\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'var\s+str\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'videojs\([^\)]+\)\.src\(\{\s*src:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'if\s*\((\s*a\s*\+\s*b\s*\+\s*c\s*\+\s*d\s*\+\s*e\s*\+\s*f\s*)\)',
-        r'player\.src\(\{\s*src:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'player\.src\s*=\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        r'jwplayer\([^\)]+\)\.setup\(\{\s*[^\{\}]*file:\s*[\'"]([^\'"]*.m3u[8]?[^\'"]*)[\'"]',
-        
-        # Obfuscated JavaScript için
-        r'\\x68\\x74\\x74\\x70([^\'"]*.m3u[8]?[^\'"]*)',
-        r'\\u0068\\u0074\\u0074\\u0070([^\'"]*.m3u[8]?[^\'"]*)',
-    ]
+# m3u/m3u8 URL'leri için regex pattern'leri, öncelik sırasıyla (ilk grup ya da '.m3u' içeren grup URL'dir)
+M3U_PATTERNS = [
+    r'source:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'file:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'src=[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'(https?://[^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    r'hls:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'videoSrc\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'video\s*src\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'url:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'playlist:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'hlsUrl\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'streamURL\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'["\'](https?://[^\'"\s]+/playlist\.m3u[8]?)[\'"]',
+    r'["\'](https?://[^\'"\s]+/manifest\.m3u[8]?)[\'"]',
+    r'["\'](https?://[^\'"\s]+/live\.m3u[8]?)[\'"]',
+    r'["\'](https?://[^\'"\s]+/index\.m3u[8]?)[\'"]',
+    r'["\'](https?://[^\'"\s]+/master\.m3u[8]?)[\'"]',
+    r'["\'](https?://[^\'"\s]+/stream\.m3u[8]?)[\'"]',
+    r'source\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'data-source=[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'data-url=[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'data-stream=[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'stream_url[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    r'streamUrl[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    r'mediaUrl[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    r'playURL[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    r'hls_url[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    r'hlsURL[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    r'videoURL[\'"\s:=]+([^\'"\s]+\.m3u[8]?[^\'"\s]*)',
+    
+    # canlitv.vin özel desenleri
+    r'var\s+vidogevideo\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'var\s+kaynakurl\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'var\s+url\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'var\s+videolink\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'var\s+m3ulink\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'var\s+str\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'videojs\([^\)]+\)\.src\(\{\s*src:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'player\.src\(\{\s*src:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'player\.src\s*=\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
+    r'jwplayer\([^\)]+\)\.setup\(\{\s*[^\{\}]*file:\s*[\'"]([^\'"]*\.m3u[8]?[^\'"]*)[\'"]',
     
-    # Önce sayfada görülen string birleştirme işlemlerini tespit etmeye çalış
-    # Bu tür JavaScript kod obfuscation tekniklerini çözmeye çalışır
-    js_concat_patterns = [
-        r'((?:[a-zA-Z0-9_$]+\s*\+\s*){2,}[a-zA-Z0-9_$]+)',  # a + b + c formatı
-        r'(\[[^\[\]]+\]\.join\(\s*[\'"][\'"]?\s*\))',  # ["h","t","t","p"].join("") formatı
-        r'String\.fromCharCode\(([^\)]+)\)',  # String.fromCharCode(104,116,116,112) formatı
+    # Obfuscated JavaScript için
+    r'\\x68\\x74\\x74\\x70([^\'"]*\.m3u[8]?[^\'"]*)',
+    r'\\u0068\\u0074\\u0074\\u0070([^\'"]*\.m3u[8]?[^\'"]*)',
+]
+
+# Obfuscation çözücüleri pattern'lerden önce, genel URL araması en son denenir
+M3U_MATCH_RULES = (
+    [
+        # ["h","t","t","p"].join("") formatı
+        ('join', r'(\[[^\[\]]+\]\.join\(\s*[\'"][\'"]?\s*\))'),
+        # String.fromCharCode(104,116,116,112) formatı
+        ('charcode', r'String\.fromCharCode\(([^\)]+)\)'),
+        # canlitv.vin'de özel olarak kullanılan string birleştirme yöntemi
+        ('concat', r'([\'"](https?:)?/?/?[^\'"]*[\'"])\s*\+\s*([\'"](/[^\'"]*\.m3u[8]?[^\'"]*)[\'"])'),
+        # Base64 kodlu içerik
+        ('atob', r'atob\([\'"]([^\'"]+)[\'"]\)'),
+    ]
+    + [('pattern', pattern) for pattern in M3U_PATTERNS]
+    + [
+        # Son çare olarak .m3u veya .m3u8 içeren herhangi bir URL
+        ('catch_all', r'[\'"\(]((https?:)?//[^\'"\s\)]+)[\'"\)]'),
     ]
+)
+
+# m3u geçmeyen içerikte yalnızca bu işaretlerden biri varsa (kodlanmış URL) tarama yapılır
+M3U_DECODER_MARKERS = ('.join(', 'fromCharCode', 'atob(')
+# Bir işaretin çevresinde taranan karakter sayısı (iki yönde); eşleşmeler bu bölgeyi aşamaz
+M3U_SCAN_WINDOW = 4096
+
+class M3UMatcher:
+    """
+    M3U_MATCH_RULES'taki tüm kuralları tek bir derlenmiş regex'te birleştirir.
+    İçerik bir kez ve yalnızca '.m3u' / çözücü işaretlerinin çevresinde taranır; her eşleşmeden
+    sonra tarama bir sonraki karakterden sürdüğü için örtüşen eşleşmeler kaybolmaz.
+    """
     
-    for concat_pattern in js_concat_patterns:
-        concat_matches = re.findall(concat_pattern, content)
-        for concat_expr in concat_matches:
-            # Eğer bu bir join ifadesi ise
-            if '.join(' in concat_expr:
-                try:
-                    # ["h","t","t","p"].join("")
-                    array_str = concat_expr.split('.join(')[0].strip()
-                    # Basit bir JavaScript array parsing
-                    if array_str.startswith('[') and array_str.endswith(']'):
-                        array_items = re.findall(r'[\'"]([^\'"]*)[\'"]', array_str)
-                        combined = ''.join(array_items)
-                        if '.m3u' in combined:
-                            return combined
-                except Exception as e:
-                    logger.warning(f"Join ifadesi çözülemedi: {e}")
-            
-            # String.fromCharCode işlemi ise
-            elif 'String.fromCharCode' in concat_expr:
-                try:
-                    # String.fromCharCode(104,116,116,112)
-                    char_codes = re.findall(r'(\d+)', concat_expr)
-                    if char_codes:
-                        chars = [chr(int(code)) for code in char_codes]
-                        combined = ''.join(chars)
-                        if '.m3u' in combined:
-                            return combined
-                except Exception as e:
-                    logger.warning(f"fromCharCode ifadesi çözülemedi: {e}")
-            
-            # Basit string birleştirme ise (a + b + c)
-            else:
-                # JavaScript değişken birleştirme işlemleri için daha derin analiz gerekebilir
-                # Bu örnek için sadece sayfada gördüğümüz içeriği analiz ediyoruz
-                # Gerçek bir çözüm için JavaScript parsing/execution gerekebilir
-                pass
+    def __init__(self, rules):
+        self.kinds = []
+        self.group_ranges = []
+        alternatives = []
+        group_index = 0
+        for kind, pattern in rules:
+            group_count = re.compile(pattern).groups
+            self.kinds.append(kind)
+            self.group_ranges.append((group_index, group_index + group_count))
+            # Yakalamayan sarmalayıcı: sre'nin ilk karakter filtresi birleşik desende de çalışır
+            alternatives.append(f'(?:{pattern})')
+            group_index += group_count
+        self.group_starts = [start for start, _ in self.group_ranges]
+        self.regex = re.compile('|'.join(alternatives))
     
-    # canlitv.vin'de özel olarak kullanılan string birleştirme yöntemini tespit et
-    concat_str_pattern = r'([\'"](https?:)?/?/?[^\'"]*[\'"])\s*\+\s*([\'"](/[^\'"]*\.m3u[8]?[^\'"]*)[\'"])'
-    concat_matches = re.findall(concat_str_pattern, content)
-    for match in concat_matches:
-        try:
-            part1 = match[0].strip('\'"')
-            part2 = match[3].strip('\'"')
-            combined = part1 + part2
-            if '.m3u' in combined:
-                logger.info(f"String birleştirme tespit edildi: {combined}")
-                return combined
-        except Exception as e:
-            logger.warning(f"String birleştirme çözülemedi: {e}")
+    def find_all(self, content, path=()):
+        """
+        İçerikteki tüm m3u adaylarını belge sırasıyla döndürür.
+        Her aday: url, rule (kural sırası), source (kural türü) ve path (çözme yolu, ör. ('atob',)).
+        """
+        candidates = []
+        if not content:
+            return candidates
+        
+        search = self.regex.search
+        for window_start, window_end in self._candidate_windows(content):
+            pos = window_start
+            while True:
+                match = search(content, pos, window_end)
+                if not match:
+                    break
+                pos = match.start() + 1
+                # Eşleşen kural, son kapanan yakalama grubunun ait olduğu kuraldır
+                rule_index = bisect.bisect_right(self.group_starts, match.lastindex - 1) - 1
+                start, end = self.group_ranges[rule_index]
+                kind = self.kinds[rule_index]
+                if kind == 'atob':
+                    candidates.extend(self._decode_atob(match.groups()[start], path))
+                    continue
+                url = self._resolve(kind, match.groups()[start:end])
+                if url:
+                    candidates.append({'url': url, 'rule': rule_index, 'source': kind, 'path': path})
+        return candidates
+    
+    @staticmethod
+    def _candidate_windows(content):
+        """
+        Her eşleşme '.m3u' ya da bir çözücü işareti içerdiğinden yalnızca bu işaretlerin
+        çevresindeki bölgeler taranır. Çakışan bölgeler birleştirilir, belge sırası korunur.
+        """
+        anchors = []
+        for marker in ('.m3u',) + M3U_DECODER_MARKERS:
+            index = content.find(marker)
+            while index != -1:
+                anchors.append(index)
+                index = content.find(marker, index + 1)
+        if not anchors:
+            return []
+        
+        anchors.sort()
+        windows = []
+        for index in anchors:
+            window_start = max(0, index - M3U_SCAN_WINDOW)
+            window_end = min(len(content), index + M3U_SCAN_WINDOW)
+            if windows and window_start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], window_end)
+            else:
+                windows.append([window_start, window_end])
+        return windows
     
-    # Base64 kodlu içerik arama
-    base64_pattern = r'atob\([\'"]([^\'"]+)[\'"]\)'
-    base64_matches = re.findall(base64_pattern, content)
-    for encoded in base64_matches:
+    def _decode_atob(self, encoded, path):
+        """Base64 kodlu içeriği çözüp içindeki adayları döndürür"""
         try:
             import base64
             decoded = base64.b64decode(encoded).decode('utf-8')
             logger.info(f"Base64 çözüldü: {decoded[:50]}...")
-            
             # Çözülen içerikte m3u arama
-            m3u_in_decoded = find_m3u_in_content(decoded)
-            if m3u_in_decoded:
-                return m3u_in_decoded
+            return self.find_all(decoded, path + ('atob',))
         except Exception as e:
             logger.warning(f"Base64 çözme hatası: {e}")
+            return []
     
-    # Tüm pattern'leri dene
-    for pattern in patterns:
-        matches = re.findall(pattern, content)
-        if matches:
-            for match in matches:
-                # m3u ya da m3u8 uzantılı dosyaya denk gelmişsek kullan
-                if isinstance(match, tuple):  # Eğer pattern gruplar içeriyorsa
-                    for group in match:
-                        if group and '.m3u' in group:
-                            logger.info(f"M3U URL bulundu (grup): {group}")
-                            return group
-                elif match and '.m3u' in match:
-                    logger.info(f"M3U URL bulundu: {match}")
-                    return match
-    
-    # Son çare olarak .m3u veya .m3u8 içeren herhangi bir URL'yi bul
-    all_urls = re.findall(r'[\'"\(]((https?:)?//[^\'"\s\)]+)[\'"\)]', content)
-    for url in all_urls:
-        if isinstance(url, tuple):
-            url = url[0]
-        if '.m3u' in url:
-            logger.info(f"Genel URL aramasında m3u bulundu: {url}")
-            return url
+    def _resolve(self, kind, groups):
+        """Bir kural eşleşmesini URL'ye çevirir, m3u içermiyorsa None döner"""
+        if kind == 'join':
+            array_str = groups[0].split('.join(')[0].strip()
+            if array_str.startswith('[') and array_str.endswith(']'):
+                combined = ''.join(re.findall(r'[\'"]([^\'"]*)[\'"]', array_str))
+                if '.m3u' in combined:
+                    return combined
+        elif kind == 'charcode':
+            try:
+                combined = ''.join(chr(int(code)) for code in re.findall(r'(\d+)', groups[0]))
+                if '.m3u' in combined:
+                    return combined
+            except (ValueError, OverflowError) as e:
+                logger.warning(f"fromCharCode ifadesi çözülemedi: {e}")
+        elif kind == 'concat':
+            combined = groups[0].strip('\'"') + groups[3].strip('\'"')
+            if '.m3u' in combined:
+                return combined
+        else:
+            for group in groups:
+                if group and '.m3u' in group:
+                    return group
+        return None
+
+m3u_matcher = M3UMatcher(M3U_MATCH_RULES)
+
+# Bir kanal için saklanan ve doğrulamada denenen en fazla aday sayısı
+M3U_CANDIDATE_LIMIT = 5
+
+# Reklam, önizleme ya da yedek yayın olduğunu düşündüren URL parçaları
+M3U_AD_MARKERS = re.compile(
+    r'(?:^|[/_\-.=?&])(?:ads?|advert\w*|reklam\w*|preroll|midroll|vast|vpaid|preview|promo|teaser|'
+    r'trailer|sample|test|demo|dummy|placeholder|offline|fallback|yayin_?disi)(?:[/_\-.=?&]|$)',
+    re.IGNORECASE,
+)
+# Gerçek canlı yayın manifestlerinde sık görülen dosya adları
+M3U_LIVE_MARKERS = ('/playlist.m3u8', '/index.m3u8', '/master.m3u8', '/live', '/chunklist', '/tracks-')
+# Kaynağa göre (etiket, öznitelik ya da regex kuralı) temel puanlar
+M3U_SOURCE_SCORES = {
+    'video': 90, 'source': 90, 'data': 80, 'iframe': 70,
+    'join': 75, 'charcode': 75, 'concat': 75,
+    # Çalıştırılan scriptin oynatıcıya verdiği URL
+    'js_eval': 85,
+    # GeoLive sayfasındaki JavaScript çözücüleri
+    'js_player': 80, 'js_function': 75, 'json_config': 72, 'js_var': 70,
+}
+
+def score_m3u_candidate(candidate):
+    """
+    Bir m3u adayını puanlar; yüksek puan önce denenir.
+    Temel puan kaynaktan (etiket ya da regex kuralının öncelik sırası) gelir, ardından URL'nin
+    kendisine bakılarak reklam/önizleme izleri cezalandırılır, canlı yayın izleri ödüllendirilir.
+    """
+    source = candidate.get('source')
+    if source in M3U_SOURCE_SCORES:
+        score = M3U_SOURCE_SCORES[source]
+    elif source == 'catch_all':
+        score = 10
+    else:
+        # Regex kuralları: listedeki sıraya göre 70'ten aşağı
+        score = 70 - min(candidate.get('rule', 0), 50)
     
-    return None
+    url = candidate['url']
+    path = urllib.parse.urlsplit(url).path if '://' in url else url
+    if M3U_AD_MARKERS.search(url):
+        score -= 100
+    if '.m3u8' in path:
+        score += 5
+    if any(marker in url for marker in M3U_LIVE_MARKERS):
+        score += 10
+    if url.startswith('http') or url.startswith('//'):
+        score += 5
+    # Çözülmesi gereken (ör. base64) adaylar biraz daha az güvenilir
+    score -= 2 * len(candidate.get('path', ()))
+    return score
 
-def extract_with_selenium(url):
-    """Selenium ile JavaScript çalıştırarak m3u8 linkini çıkarır"""
+def rank_m3u_candidates(candidates):
+    """
+    Adayları puana göre sıralar, aynı URL'yi bir kez tutar (en yüksek puanlısı).
+    Eşit puanlarda ilk bulunan öne geçer.
+    """
+    best = {}
+    for order, candidate in enumerate(candidates):
+        if 'score' not in candidate:
+            candidate['score'] = score_m3u_candidate(candidate)
+        previous = best.get(candidate['url'])
+        if previous is None or candidate['score'] > previous[1]['score']:
+            best[candidate['url']] = (order if previous is None else previous[0], candidate)
+    ranked = sorted(best.values(), key=lambda item: (-item[1]['score'], item[0]))
+    return [candidate for _, candidate in ranked]
+
+def find_m3u_candidates(content, base_url=None):
+    """İçerikteki tüm m3u adaylarını puanlanmış ve sıralanmış olarak döndürür"""
+    candidates = m3u_matcher.find_all(content)
+    if base_url:
+        for candidate in candidates:
+            candidate['url'] = _absolute_url(candidate['url'], base_url)
+    return rank_m3u_candidates(candidates)
+
+def find_m3u_in_content(content):
+    """HTML veya JavaScript içeriğinden en yüksek puanlı m3u URL'sini çıkarır"""
+    candidates = find_m3u_candidates(content)
+    if not candidates:
+        return None
+    best = candidates[0]
+    if best['source'] == 'concat':
+        logger.info(f"String birleştirme tespit edildi: {best['url']}")
+    elif best['source'] == 'catch_all':
+        logger.info(f"Genel URL aramasında m3u bulundu: {best['url']}")
+    else:
+        logger.info(f"M3U URL bulundu: {best['url']}")
+    return best['url']
+
+# Gömülü JS yorumlayıcısı (quickjs) ile satır içi scriptleri çalıştırma ayarları
+JS_EVAL_ENABLED = True
+JS_EVAL_TIME_LIMIT = 2  # Her script için CPU süresi sınırı (saniye)
+JS_EVAL_MEMORY_LIMIT = 64 * 1024 * 1024
+JS_EVAL_MAX_SCRIPT_BYTES = 512 * 1024  # Bundan büyük (kütüphane) scriptler çalıştırılmaz
+
+# Oynatıcı ve DOM API'leri için sahte ortam: oynatıcıya verilen her m3u URL'si __captured'a yazılır
+JS_SANDBOX_PRELUDE = r"""
+var __captured = [];
+function __capture(value) {
+    try {
+        if (value === undefined || value === null) { return; }
+        if (typeof value === 'object') {
+            if (Array.isArray(value)) { value.forEach(__capture); return; }
+            ['src', 'file', 'source', 'url', 'hls', 'stream', 'playlist', 'sources'].forEach(function (key) {
+                if (value[key] !== undefined) { __capture(value[key]); }
+            });
+            return;
+        }
+        value = String(value);
+        if (value.indexOf('.m3u') !== -1) { __captured.push(value); }
+    } catch (e) {}
+}
+var __b64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=';
+function atob(input) {
+    var str = String(input).replace(/[^A-Za-z0-9+\/=]/g, ''), output = '', i = 0;
+    while (i < str.length) {
+        var e1 = __b64.indexOf(str.charAt(i++)), e2 = __b64.indexOf(str.charAt(i++));
+        var e3 = __b64.indexOf(str.charAt(i++)), e4 = __b64.indexOf(str.charAt(i++));
+        output += String.fromCharCode((e1 << 2) | (e2 >> 4));
+        if (e3 !== 64 && e3 !== -1) { output += String.fromCharCode(((e2 & 15) << 4) | (e3 >> 2)); }
+        if (e4 !== 64 && e4 !== -1) { output += String.fromCharCode(((e3 & 3) << 6) | e4); }
+    }
+    return output;
+}
+function btoa(input) {
+    var str = String(input), output = '';
+    for (var i = 0; i < str.length; i += 3) {
+        var c1 = str.charCodeAt(i), c2 = str.charCodeAt(i + 1), c3 = str.charCodeAt(i + 2);
+        output += __b64.charAt(c1 >> 2) + __b64.charAt(((c1 & 3) << 4) | (c2 >> 4));
+        output += isNaN(c2) ? '=' : __b64.charAt(((c2 & 15) << 2) | (c3 >> 6));
+        output += isNaN(c3) ? '=' : __b64.charAt(c3 & 63);
+    }
+    return output;
+}
+var __pending = [];
+function setTimeout(fn) { if (typeof fn === 'function') { __pending.push(fn); } return __pending.length; }
+var setInterval = setTimeout;
+function clearTimeout() {}
+var clearInterval = clearTimeout;
+function __element(tag) {
+    var element = {
+        tagName: String(tag || 'div').toUpperCase(), style: {}, attributes: {}, children: [], dataset: {},
+        classList: {add: function () {}, remove: function () {}, contains: function () { return false; }},
+        setAttribute: function (name, value) { this.attributes[name] = value; __capture(value); },
+        getAttribute: function (name) { return this.attributes[name] || null; },
+        appendChild: function (child) { this.children.push(child); return child; },
+        removeChild: function (child) { return child; },
+        insertBefore: function (child) { return child; },
+        addEventListener: function () {}, removeEventListener: function () {},
+        play: function () { return {then: function () {}, catch: function () {}}; },
+        pause: function () {}, load: function () {},
+        canPlayType: function () { return 'maybe'; },
+        querySelector: function () { return __element('div'); },
+        querySelectorAll: function () { return []; },
+        getElementsByTagName: function () { return []; }
+    };
+    Object.defineProperty(element, 'src', {
+        get: function () { return this._src || ''; },
+        set: function (value) { this._src = value; __capture(value); }
+    });
+    Object.defineProperty(element, 'innerHTML', {
+        get: function () { return this._html || ''; },
+        set: function (value) { this._html = value; __capture(value); }
+    });
+    return element;
+}
+var document = {
+    cookie: '', referrer: '', readyState: 'complete',
+    body: __element('body'), head: __element('head'), documentElement: __element('html'),
+    createElement: __element,
+    getElementById: function () { return __element('div'); },
+    getElementsByClassName: function () { return [__element('div')]; },
+    getElementsByTagName: function (tag) { return [__element(tag)]; },
+    querySelector: function (selector) { return __element(selector); },
+    querySelectorAll: function (selector) { return [__element(selector)]; },
+    addEventListener: function (name, fn) { if (typeof fn === 'function') { __pending.push(fn); } },
+    write: function (html) { __capture(html); },
+    writeln: function (html) { __capture(html); }
+};
+var window = this;
+window.document = document;
+window.location = {href: '', hostname: '', protocol: 'https:', search: '', hash: '', pathname: '/'};
+window.navigator = {userAgent: '', language: 'tr-TR', platform: 'Win32', plugins: []};
+window.addEventListener = function (name, fn) { if (typeof fn === 'function') { __pending.push(fn); } };
+window.console = {log: function () {}, warn: function () {}, error: function () {}, info: function () {}};
+var navigator = window.navigator, location = window.location, console = window.console;
+window.localStorage = window.sessionStorage = {getItem: function () { return null; }, setItem: function () {}, removeItem: function () {}};
+window.fetch = function (url) { __capture(url); return {then: function () { return this; }, catch: function () { return this; }}; };
+function XMLHttpRequest() {}
+XMLHttpRequest.prototype = {open: function (method, url) { __capture(url); }, send: function () {}, setRequestHeader: function () {}};
+function Hls() { this.loadSource = function (url) { __capture(url); }; this.attachMedia = function () {}; this.on = function () {}; }
+Hls.isSupported = function () { return true; };
+Hls.Events = {MANIFEST_PARSED: 'hlsManifestParsed', ERROR: 'hlsError', MEDIA_ATTACHED: 'hlsMediaAttached'};
+function __player() {
+    var player = {
+        src: function (value) { __capture(value); return player; },
+        setup: function (config) { __capture(config); return player; },
+        load: function (value) { __capture(value); return player; },
+        on: function () { return player; }, ready: function (fn) { if (typeof fn === 'function') { __pending.push(fn); } return player; },
+        play: function () { return player; }, pause: function () { return player; }
+    };
+    return player;
+}
+function videojs(element, options) { __capture(options); return __player(); }
+function jwplayer() { return __player(); }
+var Clappr = {Player: function (config) { __capture(config); return __player(); }};
+var flowplayer = function (element, config) { __capture(config); return __player(); };
+var Plyr = function () { return __player(); };
+function jQuery() { var chain = {ready: function (fn) { if (typeof fn === 'function') { __pending.push(fn); } return chain; }, on: function () { return chain; }, attr: function (name, value) { __capture(value); return chain; }, html: function (value) { __capture(value); return chain; }, append: function (value) { __capture(value); return chain; }, find: function () { return chain; }, css: function () { return chain; }, show: function () { return chain; }, hide: function () { return chain; }, click: function () { return chain; }}; if (typeof arguments[0] === 'function') { __pending.push(arguments[0]); } return chain; }
+var $ = jQuery;
+"""
+
+# Scriptler çalıştıktan sonra zamanlayıcıları işletip m3u içeren global değişkenleri de toplar
+JS_SANDBOX_EPILOGUE = r"""
+(function () {
+    for (var i = 0; i < __pending.length && i < 200; i++) {
+        try { __pending[i](); } catch (e) {}
+    }
+    Object.keys(window).forEach(function (key) {
+        try {
+            if (key.indexOf('__') !== 0 && typeof window[key] === 'string') { __capture(window[key]); }
+        } catch (e) {}
+    });
+    return JSON.stringify(__captured);
+})()
+"""
+
+def _import_quickjs():
+    """quickjs paketini içe aktarır, kurulu değilse pip ile kurmayı dener"""
     try:
-        # Selenium'un kurulu olup olmadığını kontrol et
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-        except ImportError:
-            logger.warning("Selenium paketleri bulunamadı, otomatik kurmayı deniyorum...")
-            import subprocess
-            import sys
-            
-            # Pip ile gerekli paketleri yükle
-            packages = ["selenium", "webdriver-manager"]
-            for package in packages:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package], 
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from webdriver_manager.chrome import ChromeDriverManager
-            logger.info("Selenium paketleri başarıyla kuruldu")
-        
-        # WebDriver Manager ile Chrome Driver'ı otomatik kur
-        try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            chromedriver_path = ChromeDriverManager().install()
-        except Exception as e:
-            logger.warning(f"Chrome Driver otomatik kurulumu hatası: {e}")
-            # Sistem PATH'inde ChromeDriver'ı aramaya çalış
-            chromedriver_path = "chromedriver"
+        import quickjs
+    except ImportError:
+        logger.warning("quickjs paketi bulunamadı, otomatik kurmayı deniyorum...")
+        import subprocess
+        import sys
         
-        logger.info(f"Selenium ile çıkarma deneniyor: {url}")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "quickjs"], 
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        import quickjs
+        logger.info("quickjs paketi başarıyla kuruldu")
+    return quickjs
+
+_quickjs_state = {'module': None, 'failed': False}
+_quickjs_lock = threading.Lock()
+
+def _get_quickjs():
+    with _quickjs_lock:
+        if _quickjs_state['module'] is None and not _quickjs_state['failed']:
+            try:
+                _quickjs_state['module'] = _import_quickjs()
+            except Exception as e:
+                logger.warning(f"quickjs kullanılamıyor, JS değerlendirme katmanı atlanacak: {e}")
+                _quickjs_state['failed'] = True
+        return _quickjs_state['module']
+
+def evaluate_scripts_for_m3u(scripts, base_url=None):
+    """
+    Satır içi scriptleri sahte DOM ve oynatıcı API'leri olan izole bir quickjs bağlamında
+    çalıştırır. hls.js/video.js/jwplayer/Clappr'a verilen, DOM'a yazılan ya da global bir
+    değişkende duran m3u URL'lerini sırayla döndürür. Tarayıcı başlatmadan milisaniyeler sürer.
+    """
+    if not JS_EVAL_ENABLED:
+        return []
+    scripts = [script for script in scripts if script and len(script) <= JS_EVAL_MAX_SCRIPT_BYTES]
+    if not scripts:
+        return []
+    quickjs = _get_quickjs()
+    if quickjs is None:
+        return []
+    
+    context = quickjs.Context()
+    context.set_memory_limit(JS_EVAL_MEMORY_LIMIT)
+    context.set_time_limit(JS_EVAL_TIME_LIMIT)
+    try:
+        context.eval(JS_SANDBOX_PRELUDE)
+        if base_url:
+            context.eval(f"window.location.href = document.referrer = {json.dumps(base_url)};")
+        for script in scripts:
+            try:
+                context.eval(script)
+            except Exception as script_error:
+                # Bir scriptin hatası diğerlerini durdurmaz (tarayıcıdaki gibi)
+                logger.debug(f"JS değerlendirme hatası: {str(script_error)[:100]}")
+        captured = json.loads(context.eval(JS_SANDBOX_EPILOGUE))
+    except Exception as e:
+        logger.warning(f"JS değerlendirme katmanı başarısız: {e}")
+        return []
+    
+    urls = []
+    for value in captured:
+        # document.write/innerHTML ile yazılan HTML parçalarındaki URL'ler
+        found = [value] if value.lstrip().startswith(('http', '//', '/')) and '<' not in value else \
+            [candidate['url'] for candidate in find_m3u_candidates(value)]
+        for url in found:
+            url = _absolute_url(url.strip(), base_url) if base_url else url.strip()
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+def _scan_page_with_selenium(driver, url):
+    """Havuzdan alınan tarayıcıda sayfayı açar ve video/script/iframe içinde m3u arar"""
+    try:
+        # Sayfayı yükle
+        _drain_performance_log(driver)
+        driver.get(url)
+        logger.info(f"Sayfa yüklendi: {url}")
         
-        # Chrome Options ayarlamaları
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Başsız modda çalıştır
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--mute-audio")
-        chrome_options.add_argument(f"user-agent={USER_AGENT}")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+        # Oynatıcının manifest isteğini bekle - çoğu oynatıcı bir saniye içinde ister
+        m3u_url = wait_for_stream_request(driver)
+        if m3u_url:
+            return m3u_url
         
-        # WebDriver'ı başlat
-        try:
-            service = Service(chromedriver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-        except Exception as e:
-            logger.error(f"Chrome Driver başlatma hatası: {e}")
-            return None
+        # Network trafiğini analiz etmek için JavaScript çalıştır
+        script = """
+        var videoSources = [];
         
-        try:
-            # Zaman aşımı ayarları
-            driver.set_page_load_timeout(30)
-            driver.implicitly_wait(5)
-            
-            # Sayfayı yükle
-            driver.get(url)
-            logger.info(f"Sayfa yüklendi: {url}")
-            
-            # Sayfa yüklendikten sonra biraz bekle - JavaScript yüklensin
-            time.sleep(5)
-            
-            # Network trafiğini analiz etmek için JavaScript çalıştır
-            script = """
-            var videoSources = [];
+        // Video etiketlerindeki src'leri al
+        var videoElements = document.querySelectorAll('video');
+        for(var i=0; i<videoElements.length; i++) {
+            var src = videoElements[i].src;
+            if(src && (src.includes('.m3u') || src.includes('.m3u8'))) {
+                videoSources.push(src);
+            }
             
-            // Video etiketlerindeki src'leri al
-            var videoElements = document.querySelectorAll('video');
-            for(var i=0; i<videoElements.length; i++) {
-                var src = videoElements[i].src;
+            // Video içindeki source etiketlerini kontrol et
+            var sources = videoElements[i].querySelectorAll('source');
+            for(var j=0; j<sources.length; j++) {
+                src = sources[j].src;
                 if(src && (src.includes('.m3u') || src.includes('.m3u8'))) {
                     videoSources.push(src);
                 }
-                
-                // Video içindeki source etiketlerini kontrol et
-                var sources = videoElements[i].querySelectorAll('source');
-                for(var j=0; j<sources.length; j++) {
-                    src = sources[j].src;
-                    if(src && (src.includes('.m3u') || src.includes('.m3u8'))) {
-                        videoSources.push(src);
-                    }
-                }
             }
-            
-            // iframe'leri kontrol et
-            var iframes = document.querySelectorAll('iframe');
-            var iframeSrcs = [];
-            for(var i=0; i<iframes.length; i++) {
-                iframeSrcs.push(iframes[i].src);
-            }
-            
-            // HLS.js veya video.js tanımlarını arat
-            var hlsJsUrls = [];
-            var scripts = document.querySelectorAll('script');
-            for(var i=0; i<scripts.length; i++) {
-                var scriptContent = scripts[i].innerText;
-                if(scriptContent) {
-                    // Yaygın HLS/DASH URL formatlarını kontrol et
-                    var m3u8Regex = /(["'])(https?:\\/\\/[^"']+\\.m3u8[^"']*)(\\1)/g;
-                    var match;
-                    while((match = m3u8Regex.exec(scriptContent)) !== null) {
-                        hlsJsUrls.push(match[2]);
-                    }
+        }
+        
+        // iframe'leri kontrol et
+        var iframes = document.querySelectorAll('iframe');
+        var iframeSrcs = [];
+        for(var i=0; i<iframes.length; i++) {
+            iframeSrcs.push(iframes[i].src);
+        }
+        
+        // HLS.js veya video.js tanımlarını arat
+        var hlsJsUrls = [];
+        var scripts = document.querySelectorAll('script');
+        for(var i=0; i<scripts.length; i++) {
+            var scriptContent = scripts[i].innerText;
+            if(scriptContent) {
+                // Yaygın HLS/DASH URL formatlarını kontrol et
+                var m3u8Regex = /(["'])(https?:\\/\\/[^"']+\\.m3u8[^"']*)(\\1)/g;
+                var match;
+                while((match = m3u8Regex.exec(scriptContent)) !== null) {
+                    hlsJsUrls.push(match[2]);
                 }
             }
+        }
+        
+        return {
+            videoSources: videoSources,
+            iframeSrcs: iframeSrcs,
+            hlsJsUrls: hlsJsUrls
+        };
+        """
+        
+        result = driver.execute_script(script)
+        
+        # Sonuçları analiz et
+        if result:
+            # 1. Önce doğrudan video kaynaklarını kontrol et
+            if result.get('videoSources') and len(result.get('videoSources')) > 0:
+                for src in result.get('videoSources'):
+                    if '.m3u' in src:
+                        logger.info(f"Video kaynağından m3u bulundu: {src}")
+                        return src
             
-            return {
-                videoSources: videoSources,
-                iframeSrcs: iframeSrcs,
-                hlsJsUrls: hlsJsUrls
-            };
-            """
-            
-            result = driver.execute_script(script)
+            # 2. HLS.js veya video.js URL'lerini kontrol et
+            if result.get('hlsJsUrls') and len(result.get('hlsJsUrls')) > 0:
+                for src in result.get('hlsJsUrls'):
+                    if '.m3u' in src:
+                        logger.info(f"Script içeriğinden m3u bulundu: {src}")
+                        return src
             
-            # Sonuçları analiz et
-            if result:
-                # 1. Önce doğrudan video kaynaklarını kontrol et
-                if result.get('videoSources') and len(result.get('videoSources')) > 0:
-                    for src in result.get('videoSources'):
-                        if '.m3u' in src:
-                            logger.info(f"Video kaynağından m3u bulundu: {src}")
-                            driver.quit()
-                            return src
+            # 3. iframe'leri kontrol et
+            if result.get('iframeSrcs') and len(result.get('iframeSrcs')) > 0:
+                logger.info(f"Toplam {len(result.get('iframeSrcs'))} iframe bulundu")
+                iframe_sources = result.get('iframeSrcs')
                 
-                # 2. HLS.js veya video.js URL'lerini kontrol et
-                if result.get('hlsJsUrls') and len(result.get('hlsJsUrls')) > 0:
-                    for src in result.get('hlsJsUrls'):
-                        if '.m3u' in src:
-                            logger.info(f"Script içeriğinden m3u bulundu: {src}")
-                            driver.quit()
-                            return src
-                
-                # 3. iframe'leri kontrol et
-                if result.get('iframeSrcs') and len(result.get('iframeSrcs')) > 0:
-                    logger.info(f"Toplam {len(result.get('iframeSrcs'))} iframe bulundu")
-                    iframe_sources = result.get('iframeSrcs')
-                    
-                    for iframe_src in iframe_sources:
-                        if iframe_src and iframe_src.strip():
-                            try:
-                                # iframe'e git
-                                driver.get(iframe_src)
-                                logger.info(f"iframe yüklendi: {iframe_src}")
-                                time.sleep(3)  # iframe yüklensin
-                                
-                                # iframe içinde m3u8 ara
-                                iframe_result = driver.execute_script(script)
+                for iframe_src in iframe_sources:
+                    if iframe_src and iframe_src.strip():
+                        try:
+                            # iframe'e git
+                            driver.get(iframe_src)
+                            logger.info(f"iframe yüklendi: {iframe_src}")
+                            m3u_url = wait_for_stream_request(driver)
+                            if m3u_url:
+                                return m3u_url
+                            
+                            # iframe içinde m3u8 ara
+                            iframe_result = driver.execute_script(script)
+                            
+                            if iframe_result:
+                                # iframe içindeki video kaynaklarını kontrol et
+                                if iframe_result.get('videoSources') and len(iframe_result.get('videoSources')) > 0:
+                                    for src in iframe_result.get('videoSources'):
+                                        if '.m3u' in src:
+                                            logger.info(f"iframe video kaynağından m3u bulundu: {src}")
+                                            return src
                                 
-                                if iframe_result:
-                                    # iframe içindeki video kaynaklarını kontrol et
-                                    if iframe_result.get('videoSources') and len(iframe_result.get('videoSources')) > 0:
-                                        for src in iframe_result.get('videoSources'):
-                                            if '.m3u' in src:
-                                                logger.info(f"iframe video kaynağından m3u bulundu: {src}")
-                                                driver.quit()
-                                                return src
-                                    
-                                    # iframe içindeki HLS.js URL'lerini kontrol et
-                                    if iframe_result.get('hlsJsUrls') and len(iframe_result.get('hlsJsUrls')) > 0:
-                                        for src in iframe_result.get('hlsJsUrls'):
-                                            if '.m3u' in src:
-                                                logger.info(f"iframe script içeriğinden m3u bulundu: {src}")
-                                                driver.quit()
-                                                return src
-                            except Exception as iframe_error:
-                                logger.warning(f"iframe işlenirken hata: {iframe_error}")
-            
-            # HAR dosyası oluştur ve içinden m3u8 URL'leri ara
-            try:
-                # Performance loglarını al
-                logs = driver.execute_script("""
-                    var performance = window.performance || window.mozPerformance || window.msPerformance || window.webkitPerformance || {};
-                    var network = performance.getEntries() || [];
-                    return network;
-                """)
-                
-                # Network trafiğinde m3u8 URL'lerini ara
-                if logs:
-                    for entry in logs:
-                        name = entry.get('name', '')
-                        if name and ('.m3u8' in name or '.m3u' in name):
-                            logger.info(f"Performance loglarından m3u bulundu: {name}")
-                            driver.quit()
-                            return name
-            except Exception as perf_error:
-                logger.warning(f"Performance logları alınırken hata: {perf_error}")
-            
-            # Hiçbir şey bulunamadı
-            logger.warning(f"Selenium ile m3u URL bulunamadı: {url}")
-            driver.quit()
-            return None
+                                # iframe içindeki HLS.js URL'lerini kontrol et
+                                if iframe_result.get('hlsJsUrls') and len(iframe_result.get('hlsJsUrls')) > 0:
+                                    for src in iframe_result.get('hlsJsUrls'):
+                                        if '.m3u' in src:
+                                            logger.info(f"iframe script içeriğinden m3u bulundu: {src}")
+                                            return src
+                        except Exception as iframe_error:
+                            logger.warning(f"iframe işlenirken hata: {iframe_error}")
+        
+        # HAR dosyası oluştur ve içinden m3u8 URL'leri ara
+        try:
+            # Performance loglarını al
+            logs = driver.execute_script("""
+                var performance = window.performance || window.mozPerformance || window.msPerformance || window.webkitPerformance || {};
+                var network = performance.getEntries() || [];
+                return network;
+            """)
             
-        except Exception as browse_error:
-            logger.error(f"Sayfa gezinme hatası: {browse_error}")
-            driver.quit()
+            # Network trafiğinde m3u8 URL'lerini ara
+            if logs:
+                for entry in logs:
+                    name = entry.get('name', '')
+                    if name and ('.m3u8' in name or '.m3u' in name):
+                        logger.info(f"Performance loglarından m3u bulundu: {name}")
+                        return name
+        except Exception as perf_error:
+            logger.warning(f"Performance logları alınırken hata: {perf_error}")
+        
+        # Hiçbir şey bulunamadı
+        logger.warning(f"Selenium ile m3u URL bulunamadı: {url}")
+        return None
+        
+    except Exception as browse_error:
+        logger.error(f"Sayfa gezinme hatası: {browse_error}")
+        raise
+
+def extract_with_selenium(url):
+    """Selenium ile JavaScript çalıştırarak m3u8 linkini çıkarır (tarayıcı havuzu ile)"""
+    try:
+        logger.info(f"Selenium ile çıkarma deneniyor: {url}")
+        
+        try:
+            with browser_pool.lease() as driver:
+                return _scan_page_with_selenium(driver, url)
+        except BrowserUnavailableError as e:
+            logger.error(f"Chrome Driver başlatma hatası: {e}")
             return None
             
     except Exception as e:
         logger.error(f"Selenium ile çıkarma hatası: {str(e)}")
         return None
 
+# Kanal sınıflandırma kuralları (öncelik, kategori, M3U grubu)
+CHANNEL_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "channel_rules.json")
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick anahtar kelime otomatı: tüm anahtar kelimeleri metin üzerinden tek geçişte,
+    metin uzunluğuyla orantılı sürede bulur. search() eşleşen anahtar kelimelerin sıra
+    numaralarını döndürür.
+    """
+    
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].append(index)
+        
+        # Hata bağlantıları genişlik öncelikli kurulur; kök çocukları köke bağlanır
+        pending = collections.deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def search(self, text):
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.update(self._output[state])
+        return found
+
+class ChannelClassifier:
+    """
+    Kanalın öncelik, kategori ve M3U grubunu tek bir otomatla belirler.
+    Kurallar CHANNEL_RULES_FILE'dan bir kez okunur; her kategorinin anahtar kelimeleri yalnızca bir
+    kez tanımlıdır ve grup ile çıkarma sırası da buradan türetilir. Tüm anahtar kelimeler tek otomatta
+    toplanır, ad ve URL birer kez taranır. Sonuçlar (ad, URL) anahtarıyla saklanır.
+    Kurallar sıralıdır: ilk eşleşen kategori önceliği belirler. Grup, eşleşen kategorilerden grup
+    tanımlayan ilkinden, yoksa yalnızca grup belirten kurallardan gelir.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._cache = {}
+    
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            rules = _load_json_file(self.path, None)
+            if rules is None:
+                logger.error(f"Kanal kuralları okunamadı, tüm kanallar varsayılan sınıfta: {self.path}")
+                rules = {}
+            self.categories = rules.get('categories', [])
+            self.groups = rules.get('groups', [])
+            self.default_category = rules.get('default_category', 'diger')
+            self.default_priority = rules.get('default_priority', 6)
+            self.default_group = rules.get('default_group', 'diger')
+            
+            # Her anahtar kelime (kural türü, kural sırası, alanlar) etiketleriyle tek otomata girer
+            keywords = []
+            self._tags = []
+            for kind, section in (('category', self.categories), ('group', self.groups)):
+                for position, rule in enumerate(section):
+                    for keyword in rule.get('keywords', []):
+                        keywords.append(keyword.lower())
+                        self._tags.append((kind, position, tuple(rule.get('fields', ['name']))))
+            self._automaton = KeywordAutomaton(keywords)
+            self._loaded = True
+    
+    def _matched_rules(self, name, url):
+        """Eşleşen kuralları {tür: {kural sırası}} olarak döndürür"""
+        matches = {'category': set(), 'group': set()}
+        for field, text in (('name', name), ('url', url)):
+            for index in self._automaton.search(text):
+                kind, position, fields = self._tags[index]
+                if field in fields:
+                    matches[kind].add(position)
+        return matches
+    
+    def classify(self, name, url=''):
+        """(ad, URL) için {'category', 'priority', 'group'} döndürür"""
+        key = (name, url)
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+        if not self._loaded:
+            self._load()
+        
+        matches = self._matched_rules(name.lower(), url.lower())
+        result = {
+            'category': self.default_category,
+            'priority': self.default_priority,
+            'group': self.default_group,
+        }
+        matched_categories = [self.categories[position] for position in sorted(matches['category'])]
+        if matched_categories:
+            result['category'] = matched_categories[0]['category']
+            result['priority'] = matched_categories[0]['priority']
+        category_groups = [rule['group'] for rule in matched_categories if rule.get('group')]
+        if category_groups:
+            result['group'] = category_groups[0]
+        elif matches['group']:
+            result['group'] = self.groups[min(matches['group'])]['group']
+        self._cache[key] = result
+        return result
+    
+    def classify_channel(self, channel):
+        return self.classify(channel.get('name', ''), channel.get('url', ''))
+
+channel_classifier = ChannelClassifier(CHANNEL_RULES_FILE)
+
 def create_m3u_file(channels):
     """
-    Verilen kanallar listesini kullanarak M3U dosyası oluşturur
+    Verilen kanallar listesini kullanarak OUTPUT_FILE M3U dosyasını oluşturur
     """
     try:
-        # Kanalları önceliğe göre sırala
-        channels.sort(key=determine_channel_priority)
+        # Kanalları önceliğe, aynı öncelikte sağlık puanına göre sırala (en hızlı ayna önce).
+        # Bu çalıştırmada ölçülmemiş stream'ler için HEALTH_FILE'daki önceki ölçüm kullanılır.
+        stored_health = load_stream_health()
+        # Eşitlikte ad ve URL sırası: çıktı, kanalların tamamlanma sırasından bağımsızdır
+        channels.sort(key=lambda channel: (
+            determine_channel_priority(channel),
+            -stream_health_score(channel.get('health') or stored_health.get(channel.get('m3u_url'))),
+        ) + _stable_channel_key(channel))
         
         # Kategorilere ayır
         turkish_channels = []
         azerbaijan_channels = []
         other_channels = []
         
+        buckets = {'turkiye': turkish_channels, 'azerbaycan': azerbaijan_channels}
         for channel in channels:
-            name = channel.get('name', '').lower()
-            url = channel.get('url', '').lower()
-            
-            # Azerbaycan kanalları
-            if any(x in name or x in url for x in ['az tv', 'azerbaijan', 'azerbaycan', 'idman', 'ictimai', 'xezer', 'space tv az', 'cbc az', 'arb']):
-                azerbaijan_channels.append(channel)
-            # Türkçe kanallar
-            elif '.tr' in url or 'turkiye' in name or 'türkiye' in name or 'trt' in name or 'canli' in url:
-                turkish_channels.append(channel)
-            # Diğer kanallar
-            else:
-                other_channels.append(channel)
+            buckets.get(channel_classifier.classify_channel(channel)['group'], other_channels).append(channel)
         
-        with open("tv_channels.m3u", "w", encoding="utf-8") as f:
+        # Geçici dosyaya yazıp atomik olarak yerine koy: yarıda kalan yazım yayınlanan listeyi bozmaz
+        tmp_path = f"{OUTPUT_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             f.write("#EXTM3U\n")
             
             # Türk kanalları
@@ -2169,7 +3798,7 @@ def create_m3u_file(channels):
                 tvg_logo = f" tvg-logo=\"{logo}\"" if logo else ""
                 
                 f.write(f"#EXTINF:-1{tvg_id}{group}{tvg_logo},{channel['name']}\n")
-                f.write(f"{channel['stream_url']}\n")
+                f.write(f"{channel['m3u_url']}\n")
             
             # Azerbaycan kanalları
             if azerbaijan_channels:
@@ -2183,7 +3812,7 @@ def create_m3u_file(channels):
                     tvg_logo = f" tvg-logo=\"{logo}\"" if logo else ""
                     
                     f.write(f"#EXTINF:-1{tvg_id}{group}{tvg_logo},{channel['name']}\n")
-                    f.write(f"{channel['stream_url']}\n")
+                    f.write(f"{channel['m3u_url']}\n")
             
             # Diğer kanallar
             if other_channels:
@@ -2197,364 +3826,1303 @@ def create_m3u_file(channels):
                     tvg_logo = f" tvg-logo=\"{logo}\"" if logo else ""
                     
                     f.write(f"#EXTINF:-1{tvg_id}{group}{tvg_logo},{channel['name']}\n")
-                    f.write(f"{channel['stream_url']}\n")
+                    f.write(f"{channel['m3u_url']}\n")
         
-        logger.info(f"M3U dosyası oluşturuldu: {len(turkish_channels)} Türk kanalı, {len(azerbaijan_channels)} Azerbaycan kanalı, {len(other_channels)} diğer kanal")
+        os.replace(tmp_path, OUTPUT_FILE)
+        
+        logger.info(f"M3U dosyası oluşturuldu ({OUTPUT_FILE}): {len(turkish_channels)} Türk kanalı, {len(azerbaijan_channels)} Azerbaycan kanalı, {len(other_channels)} diğer kanal")
         return True
     except Exception as e:
         logger.error(f"M3U dosyası oluşturulurken hata: {e}")
         return False
 
-def determine_channel_priority(channel_info):
+def _stable_channel_key(channel):
+    """Eşit sıralanan kanallar için kararlı ikincil anahtar (ad, URL)"""
+    return (channel.get('name') or '', channel.get('url') or '')
+
+def unique_stream_channels(channels):
+    """
+    Aynı stream URL'sine çıkan kanallardan birini tutar. Seçim tamamlanma sırasından bağımsızdır:
+    (öncelik, ad, URL) sırasında ilk gelen kanal stream'i alır.
+    """
+    unique = {}
+    for channel in sorted(channels, key=lambda c: (determine_channel_priority(c),) + _stable_channel_key(c)):
+        unique.setdefault(channel['m3u_url'], channel)
+    return list(unique.values())
+
+def determine_channel_priority(channel_info):
+    """
+    Kanalın sıralama önceliğini belirler (1 ulusal ... 6 diğer, kurallar CHANNEL_RULES_FILE'da)
+    """
+    return channel_classifier.classify_channel(channel_info)['priority']
+
+def create_metadata(channels, valid_count, valid_channels=None):
+    """
+    Güncel metadata bilgisini JSON dosyasına yazar.
+    Kanal kayıtları çözülen m3u URL'sini, başarılı çıkarma yöntemini ve zaman damgalarını da içerir;
+    artımlı mod bir sonraki çalıştırmada bu bilgileri kullanır.
+    """
+    try:
+        now = datetime.now().isoformat()
+        valid_ids = {id(c) for c in valid_channels} if valid_channels is not None else None
+        
+        channel_entries = []
+        for c in channels:
+            if not c.get('m3u_url'):
+                continue
+            is_valid = valid_ids is None or id(c) in valid_ids
+            channel_entries.append({
+                'id': c.get('id') or canonical_channel_id(c['url']),
+                'name': c['name'],
+                'url': c['url'],
+                'm3u_url': c['m3u_url'],
+                'strategy': c.get('strategy'),
+                'last_resolved': c.get('last_resolved') or now,
+                'last_checked': now if is_valid else c.get('last_checked'),
+                'valid': is_valid,
+            })
+        
+        metadata = {
+            'last_updated': now,
+            'channel_count': len(channels),
+            'valid_channels': valid_count,
+            'channels': channel_entries
+        }
+        
+        with open(METADATA_FILE, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+            
+        logger.info(f"Metadata dosyası oluşturuldu: {METADATA_FILE}")
+        return True
+    except Exception as e:
+        logger.error(f"Metadata dosyası oluşturulurken hata: {e}")
+        return False
+
+def load_previous_metadata():
+    """Önceki çalıştırmanın metadata kayıtlarını kanal URL'sine göre döndürür"""
+    metadata = _load_json_file(METADATA_FILE, {})
+    previous = {}
+    for entry in metadata.get('channels', []):
+        if entry.get('url') and entry.get('m3u_url'):
+            previous[entry['url']] = entry
+    return previous
+
+# Doğrulanan kanalların çalıştırma sırasında yazıldığı günlük (yarıda kalan çalıştırmaya devam için)
+JOURNAL_FILE = os.path.join(CACHE_DIR, "resolved_journal.jsonl")
+JOURNAL_FIELDS = ('name', 'url', 'm3u_url', 'strategy', 'last_resolved', 'stream_info')
+
+class ResolvedJournal:
+    """
+    Doğrulanan her kanalı satır satır JSON olarak günlüğe ekler ve diske zorlar.
+    Çalıştırma çıktıları yazmadan kesilirse sonraki çalıştırma load() ile bu kanalları
+    yeniden çıkarmadan devralır; çıktılar başarıyla yazılınca günlük silinir.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.enabled = True
+        self._lock = threading.Lock()
+    
+    def record(self, channel):
+        if not self.enabled:
+            return
+        entry = {field: channel.get(field) for field in JOURNAL_FIELDS}
+        entry['journaled_at'] = datetime.now().isoformat()
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                logger.warning(f"Günlüğe yazılamadı: {e}")
+    
+    def load(self):
+        """Günlükteki kanal kayıtlarını kanal URL'sine göre döndürür (son kayıt geçerlidir)"""
+        entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Çökme sırasında yarım kalmış son satır
+                    if entry.get('url') and entry.get('m3u_url'):
+                        entries[entry['url']] = entry
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Günlük okunamadı: {self.path} - {e}")
+        return entries
+    
+    def clear(self):
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+resolved_journal = ResolvedJournal(JOURNAL_FILE)
+
+# Kanal bazında tarama durumunun saklandığı veritabanı (--resume)
+CRAWL_STATE_FILE = os.path.join(CACHE_DIR, "crawl_state.sqlite3")
+CRAWL_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    discovery_done INTEGER NOT NULL DEFAULT 0,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS channels (
+    run_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    name TEXT,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    m3u_url TEXT,
+    strategy TEXT,
+    last_resolved TEXT,
+    stream_info TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, url)
+);
+"""
+
+class CrawlState:
+    """
+    Her kanalın keşif, çıkarma ve doğrulama durumunu SQLite'ta URL anahtarıyla saklar.
+    Aşama/durum çiftleri: discovered/pending, extracted/resolved, extracted/failed,
+    validated/valid, validated/invalid. Her kayıt hemen işlenir (WAL), böylece çöken bir
+    çalıştırma --resume ile kaldığı yerden sürdürülebilir. Yalnızca son çalıştırmanın kayıtları tutulur.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.run_id = None
+        self.resumed = False
+        self._lock = threading.Lock()
+        self._conn = None
+    
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(CRAWL_STATE_SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    def start_run(self, resume=False):
+        """
+        resume True ise bitmemiş son çalıştırmayı devralır (bulunamazsa yenisini başlatır).
+        Yeni çalıştırmada eski çalıştırmaların kayıtları silinir.
+        """
+        with self._lock:
+            conn = self._connect()
+            if resume:
+                row = conn.execute("SELECT id FROM runs WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1").fetchone()
+                if row:
+                    self.run_id = row[0]
+                    self.resumed = True
+                    return self.run_id
+                logger.info("Devam edilecek yarım çalıştırma yok, yeni tarama başlatılıyor")
+            with conn:
+                self.run_id = conn.execute("INSERT INTO runs (started_at) VALUES (?)",
+                                           (datetime.now().isoformat(),)).lastrowid
+                conn.execute("DELETE FROM channels WHERE run_id < ?", (self.run_id,))
+                conn.execute("DELETE FROM runs WHERE id < ?", (self.run_id,))
+            self.resumed = False
+            return self.run_id
+    
+    def record(self, channel, stage, status):
+        """Kanalın güncel aşamasını yazar; çalıştırma başlatılmadıysa bir şey yapmaz"""
+        if self.run_id is None:
+            return
+        stream_info = channel.get('stream_info')
+        values = (self.run_id, channel['url'], channel.get('name'), stage, status, channel.get('m3u_url'),
+                  channel.get('strategy'), channel.get('last_resolved'),
+                  json.dumps(stream_info, ensure_ascii=False) if stream_info else None,
+                  datetime.now().isoformat())
+        with self._lock:
+            try:
+                with self._connect() as conn:
+                    conn.execute("INSERT OR REPLACE INTO channels VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values)
+            except sqlite3.Error as e:
+                logger.warning(f"Tarama durumu yazılamadı: {channel['url']} - {e}")
+    
+    def channels(self):
+        """Çalıştırmanın kanal kayıtlarını keşif sırasıyla (aşama, durum, kanal sözlüğü) olarak döndürür"""
+        if self.run_id is None:
+            return []
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT url, name, stage, status, m3u_url, strategy, last_resolved, stream_info "
+                "FROM channels WHERE run_id = ? ORDER BY rowid", (self.run_id,)).fetchall()
+        result = []
+        for url, name, stage, status, m3u_url, strategy, last_resolved, stream_info in rows:
+            channel = {'name': name, 'url': url, 'm3u_url': m3u_url, 'strategy': strategy,
+                       'last_resolved': last_resolved}
+            if stream_info:
+                channel['stream_info'] = json.loads(stream_info)
+            result.append((stage, status, channel))
+        return result
+    
+    def _update_run(self, sql, params=()):
+        if self.run_id is None:
+            return
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(sql, params + (self.run_id,))
+    
+    def discovery_done(self):
+        if self.run_id is None:
+            return False
+        with self._lock:
+            row = self._connect().execute("SELECT discovery_done FROM runs WHERE id = ?", (self.run_id,)).fetchone()
+        return bool(row and row[0])
+    
+    def mark_discovery_done(self):
+        self._update_run("UPDATE runs SET discovery_done = 1 WHERE id = ?")
+    
+    def finish_run(self):
+        """Çalıştırmayı tamamlanmış işaretler; sonraki --resume onu devralmaz"""
+        self._update_run("UPDATE runs SET finished_at = ? WHERE id = ?", (datetime.now().isoformat(),))
+        self.run_id = None
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+crawl_state = CrawlState(CRAWL_STATE_FILE)
+
+def _is_stream_alive(m3u_url):
+    """Bilinen bir stream URL'sini ucuz bir HEAD (gerekirse kısa GET) ile kontrol eder"""
+    try:
+        response = http_head(m3u_url, timeout=8, allow_redirects=True)
+        if response.status_code < 400:
+            return True
+        response = http_get(m3u_url, timeout=8, stream=True)
+        try:
+            return response.status_code < 400
+        finally:
+            response.close()
+    except Exception:
+        return False
+
+# HLS manifest doğrulama ayarları
+HLS_MANIFEST_MAX_BYTES = 16 * 1024  # Manifestten okunacak en fazla bayt
+HLS_VALIDATION_TIMEOUT = 8  # Her istek için zaman aşımı (saniye)
+HLS_MAX_PLAYLIST_DEPTH = 2  # master -> variant zincirinde izlenecek en fazla adım
+HLS_PER_HOST_CONCURRENCY = 4  # Doğrulama sırasında aynı host'a açık en fazla istek
+HLS_CHECK_SEGMENT = False  # True ise medya listesindeki bir segmentin de yanıt verdiği kontrol edilir
+HLS_SEGMENT_PROBE_BYTES = 1024
+
+class HostConcurrencyLimiter:
+    """Host başına aynı anda açık istek sayısını sınırlar"""
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+    
+    @contextlib.contextmanager
+    def slot(self, url):
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.limit)
+        with semaphore:
+            yield
+
+def _parse_hls_attributes(text):
+    """#EXT-X-STREAM-INF satırındaki ANAHTAR=değer çiftlerini sözlüğe çevirir"""
+    return {key: value.strip('"') for key, value in re.findall(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)', text)}
+
+def parse_hls_playlist(text, base_url):
     """
-    Kanalın sıralama önceliğini belirler
+    Manifestin başını ayrıştırır. #EXTM3U ile başlamıyorsa None döndürür; aksi halde
+    {'variants': [(url, öznitelikler)], 'segments': [url]} döndürür. Kesilmiş son satır atlanır.
     """
-    name = channel_info.get('name', '').lower()
-    url = channel_info.get('url', '').lower()
+    text = text.lstrip('\ufeff').lstrip()
+    if not text.startswith('#EXTM3U'):
+        return None
+    lines = text.splitlines()
+    if not text.endswith(('\n', '\r')):
+        lines = lines[:-1]
     
-    # Ulusal ana kanallar en üstte
-    if any(x in name for x in ['trt1', 'atv', 'show', 'fox', 'star', 'kanal d', 'tv8', 'kanal7']):
-        return 1
+    playlist = {'variants': [], 'segments': []}
+    pending_variant = None
+    pending_segment = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            pending_variant = _parse_hls_attributes(line.split(':', 1)[1])
+        elif line.startswith('#EXTINF:'):
+            pending_segment = True
+        elif not line.startswith('#'):
+            url = urllib.parse.urljoin(base_url, line)
+            if pending_variant is not None:
+                playlist['variants'].append((url, pending_variant))
+            elif pending_segment:
+                playlist['segments'].append(url)
+            pending_variant = None
+            pending_segment = False
+    return playlist
+
+def _best_hls_variant(variants):
+    """En yüksek BANDWIDTH değerli varyantı seçer"""
+    def bandwidth(variant):
+        try:
+            return int(variant[1].get('BANDWIDTH', 0))
+        except ValueError:
+            return 0
+    return max(variants, key=bandwidth)
+
+class HLSValidator:
+    """
+    Stream URL'lerini manifestin yalnızca ilk HLS_MANIFEST_MAX_BYTES baytını okuyarak doğrular:
+    #EXTM3U başlığı, master listelerde en yüksek bant genişlikli varyant, medya listesinde segment
+    varlığı ve istenirse bir segmentin yanıt vermesi. HTML hata sayfaları ve boş listeler geçersizdir.
+    validate() geçerli stream için ayrıntıları içeren bir sözlük, aksi halde None döndürür.
+    """
     
-    # Haber kanalları
-    elif any(x in name for x in ['haber', 'cnn', 'ntv', 'tv100', 'halk tv', 'tele1']):
-        return 2
+    def __init__(self, check_segment=HLS_CHECK_SEGMENT, max_bytes=HLS_MANIFEST_MAX_BYTES,
+                 per_host=HLS_PER_HOST_CONCURRENCY):
+        self.check_segment = check_segment
+        self.max_bytes = max_bytes
+        self.host_limiter = HostConcurrencyLimiter(per_host)
     
-    # Spor kanalları
-    elif any(x in name for x in ['spor', 'smart', 'gs tv', 'fb tv', 'bjk']):
-        return 3
+    def _fetch_head_bytes(self, url, max_bytes, headers=None):
+        """URL'nin ilk max_bytes baytını akış olarak okur, (durum kodu, son URL, içerik) döndürür"""
+        with self.host_limiter.slot(url):
+            response = http_get(url, headers=headers, timeout=HLS_VALIDATION_TIMEOUT, stream=True)
+            try:
+                body = b''
+                if response.status_code < 400:
+                    for chunk in response.iter_content(chunk_size=4096):
+                        body += chunk
+                        if len(body) >= max_bytes:
+                            break
+                return response.status_code, response.url, body[:max_bytes].decode('utf-8', errors='replace')
+            finally:
+                response.close()
     
-    # Belgesel kanalları
-    elif any(x in name for x in ['belgesel', 'nat geo', 'discovery', 'trt belgesel']):
-        return 4
+    def _check_segment(self, segment_url):
+        headers = {'Range': f"bytes=0-{HLS_SEGMENT_PROBE_BYTES - 1}"}
+        status, _, _ = self._fetch_head_bytes(segment_url, HLS_SEGMENT_PROBE_BYTES, headers)
+        return status < 400
     
-    # Azerbaycan kanalları
-    elif any(x in name or x in url for x in ['az tv', 'azerbaijan', 'azerbaycan', 'idman', 'ictimai', 'xezer', 'space tv az', 'cbc az', 'arb']):
-        return 5
+    @staticmethod
+    def _next_step(playlist_text, playlist_url, depth):
+        """
+        Manifestin başına göre sıradaki adımı döndürür: ('variant', url, öznitelikler),
+        ('media', ilk segment) ya da geçersizse (None, sebep). Senkron ve asenkron doğrulama ortaktır.
+        """
+        playlist = parse_hls_playlist(playlist_text, playlist_url)
+        if playlist is None:
+            return None, "#EXTM3U başlığı yok"
+        if playlist['variants']:
+            if depth >= HLS_MAX_PLAYLIST_DEPTH:
+                return None, "iç içe master liste"
+            variant_url, attributes = _best_hls_variant(playlist['variants'])
+            return ('variant', variant_url, attributes), None
+        if not playlist['segments']:
+            return None, "segment yok"
+        return ('media', playlist['segments'][0]), None
     
-    # Diğer kanallar
-    else:
-        return 6
+    def validate(self, url):
+        try:
+            info = {'url': url, 'variant_url': None, 'bandwidth': None, 'resolution': None}
+            playlist_url = url
+            for depth in range(HLS_MAX_PLAYLIST_DEPTH + 1):
+                status, final_url, text = self._fetch_head_bytes(playlist_url, self.max_bytes)
+                if status >= 400:
+                    logger.debug(f"Manifest HTTP {status}: {playlist_url}")
+                    return None
+                step, reason = self._next_step(text, final_url, depth)
+                if step is None:
+                    logger.debug(f"Geçersiz manifest ({reason}): {playlist_url}")
+                    return None
+                if step[0] == 'variant':
+                    playlist_url = info['variant_url'] = step[1]
+                    info['bandwidth'] = step[2].get('BANDWIDTH')
+                    info['resolution'] = step[2].get('RESOLUTION')
+                    continue
+                if self.check_segment and not self._check_segment(step[1]):
+                    logger.debug(f"Segment yanıt vermiyor: {step[1]}")
+                    return None
+                return info
+        except Exception as e:
+            logger.debug(f"Manifest doğrulama hatası: {url} - {e}")
+        return None
+    
+    async def async_validate(self, session, url, share=True):
+        """validate()'in aiohttp sürümü; host sınırını oturumun bağlantı havuzu uygular"""
+        info = {'url': url, 'variant_url': None, 'bandwidth': None, 'resolution': None}
+        playlist_url = url
+        for depth in range(HLS_MAX_PLAYLIST_DEPTH + 1):
+            status, text, final_url = await async_fetch(session, playlist_url, timeout=HLS_VALIDATION_TIMEOUT,
+                                                        max_bytes=self.max_bytes, share=share, with_url=True)
+            if status is None or status >= 400:
+                return None
+            # Göreli varyant/segment yolları yönlendirme sonrası (edge) adrese göre çözülür
+            step, reason = self._next_step(text, final_url, depth)
+            if step is None:
+                logger.debug(f"Geçersiz manifest ({reason}): {playlist_url}")
+                return None
+            if step[0] == 'variant':
+                playlist_url = info['variant_url'] = step[1]
+                info['bandwidth'] = step[2].get('BANDWIDTH')
+                info['resolution'] = step[2].get('RESOLUTION')
+                continue
+            if self.check_segment:
+                headers = {'Range': f"bytes=0-{HLS_SEGMENT_PROBE_BYTES - 1}"}
+                status, _ = await async_fetch(session, step[1], headers=headers, timeout=HLS_VALIDATION_TIMEOUT,
+                                              max_bytes=HLS_SEGMENT_PROBE_BYTES, share=share)
+                if status is None or status >= 400:
+                    return None
+            return info
+        return None
+
+hls_validator = HLSValidator()
+
+# Stream sağlık ölçümü ayarları (--health-probe)
+HEALTH_PROBE_ENABLED = False
+HEALTH_FILE = os.path.join(CACHE_DIR, "health.json")  # Diğer istatistiklerle birlikte CI önbelleğinde saklanır
+HEALTH_PROBE_TIMEOUT = 10  # Her istek için zaman aşımı (saniye)
+HEALTH_SEGMENT_MAX_BYTES = 512 * 1024  # Hız ölçümü için segmentten indirilecek en fazla bayt
+HEALTH_REFERENCE_KBPS = 2000  # Manifest BANDWIDTH bildirmiyorsa karşılaştırılacak hız
 
-def create_metadata(channels, valid_count):
-    """Güncel metadata bilgisini JSON dosyasına yazar."""
+def _timed_read(url, max_bytes, timeout=HEALTH_PROBE_TIMEOUT):
+    """
+    URL'yi akış olarak indirir; (durum kodu, son URL, gövde, ilk bayta kadar geçen süre,
+    indirme süresi) döndürür. Gövde en fazla max_bytes bayttır.
+    """
+    started = time.monotonic()
+    response = http_get(url, timeout=timeout, stream=True)
     try:
-        metadata = {
-            'last_updated': datetime.now().isoformat(),
-            'channel_count': len(channels),
-            'valid_channels': valid_count,
-            'channels': [{'name': c['name'], 'url': c['url']} for c in channels if c.get('m3u_url')]
-        }
+        body = b''
+        first_byte = None
+        if response.status_code < 400:
+            for chunk in response.iter_content(chunk_size=16384):
+                if first_byte is None:
+                    first_byte = time.monotonic() - started
+                body += chunk
+                if len(body) >= max_bytes:
+                    break
+        elapsed = time.monotonic() - started
+        return response.status_code, response.url, body[:max_bytes], first_byte or elapsed, elapsed
+    finally:
+        response.close()
+
+def probe_stream_health(m3u_url):
+    """
+    Stream'in sağlık ölçümlerini çıkarır: manifeste (master ise varyant listesine) ulaşma süresi,
+    ilk segmentin ilk baytına kadar geçen süre, segment indirme hızı ve master listedeki
+    BANDWIDTH/RESOLUTION değerleri. Ölçüm başarısız olursa 'ok' False olur.
+    """
+    health = {
+        'ok': False,
+        'time_to_manifest': None,
+        'time_to_first_segment': None,
+        'throughput_kbps': None,
+        'bandwidth': None,
+        'resolution': None,
+        'checked_at': datetime.now().isoformat(),
+    }
+    try:
+        started = time.monotonic()
+        playlist_url = m3u_url
+        playlist = None
+        for _ in range(HLS_MAX_PLAYLIST_DEPTH + 1):
+            status, final_url, body, _, _ = _timed_read(playlist_url, HLS_MANIFEST_MAX_BYTES)
+            if status >= 400:
+                return health
+            playlist = parse_hls_playlist(body.decode('utf-8', errors='replace'), final_url)
+            if not playlist or not playlist['variants']:
+                break
+            playlist_url, attributes = _best_hls_variant(playlist['variants'])
+            health['bandwidth'] = attributes.get('BANDWIDTH')
+            health['resolution'] = attributes.get('RESOLUTION')
+        health['time_to_manifest'] = round(time.monotonic() - started, 3)
         
-        with open(METADATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-            
-        logger.info(f"Metadata dosyası oluşturuldu: {METADATA_FILE}")
-        return True
+        if not playlist or not playlist['segments']:
+            return health
+        
+        # Canlı listelerde en yeni segment sondadır
+        status, _, body, first_byte, elapsed = _timed_read(playlist['segments'][-1], HEALTH_SEGMENT_MAX_BYTES)
+        if status >= 400 or not body:
+            return health
+        health['time_to_first_segment'] = round(first_byte, 3)
+        download_time = max(elapsed - first_byte, 0.001)
+        health['throughput_kbps'] = round(len(body) * 8 / 1000 / download_time, 1)
+        health['ok'] = True
     except Exception as e:
-        logger.error(f"Metadata dosyası oluşturulurken hata: {e}")
+        logger.debug(f"Sağlık ölçümü hatası: {m3u_url} - {e}")
+    return health
+
+def stream_health_score(health):
+    """
+    Sağlık ölçümünü tek bir puana çevirir (yüksek daha iyi, ölçülemeyen stream 0).
+    Yarısı gecikmeden (manifest + ilk segment), yarısı indirme hızının stream bit hızını
+    ne kadar karşıladığından gelir.
+    """
+    if not health or not health.get('ok'):
+        return 0.0
+    latency = (health.get('time_to_manifest') or 0) + (health.get('time_to_first_segment') or 0)
+    try:
+        required_kbps = int(health.get('bandwidth') or 0) / 1000 or HEALTH_REFERENCE_KBPS
+    except ValueError:
+        required_kbps = HEALTH_REFERENCE_KBPS
+    headroom = min((health.get('throughput_kbps') or 0) / required_kbps, 2.0)
+    return round(50 / (1 + latency) + 25 * headroom, 2)
+
+def run_health_probes(channels):
+    """Kanalların stream'lerini paralel ölçer, channel['health']'e ve HEALTH_FILE'a yazar"""
+    if not channels:
+        return
+    logger.info(f"{len(channels)} stream için sağlık ölçümü yapılıyor")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix='health') as executor:
+        results = list(executor.map(lambda c: probe_stream_health(c['m3u_url']), channels))
+    
+    stored = load_stream_health()
+    for channel, health in zip(channels, results):
+        health['score'] = stream_health_score(health)
+        channel['health'] = health
+        stored[channel['m3u_url']] = dict(health, name=channel['name'])
+    
+    try:
+        _save_json_file(HEALTH_FILE, {'last_updated': datetime.now().isoformat(), 'streams': stored})
+        healthy = sum(1 for health in results if health['ok'])
+        logger.info(f"Sağlık ölçümü tamamlandı: {healthy}/{len(channels)} stream ölçüldü, sonuçlar {HEALTH_FILE} dosyasında")
+    except Exception as e:
+        logger.error(f"Sağlık dosyası yazılamadı: {e}")
+
+def load_stream_health():
+    """Önceki sağlık ölçümlerini stream URL'sine göre döndürür"""
+    return _load_json_file(HEALTH_FILE, {}).get('streams', {})
+
+def _restore_known_stream(channel, previous):
+    """Önceki çalıştırmada çözülmüş stream'i kanala geri yükler; yüklendiyse True döner"""
+    entry = previous.get(channel['url'])
+    if not entry or channel.get('m3u_url'):
         return False
+    channel['m3u_url'] = entry['m3u_url']
+    channel['strategy'] = entry.get('strategy')
+    channel['last_resolved'] = entry.get('last_resolved')
+    channel['last_checked'] = entry.get('last_checked')
+    return True
+
+def _forget_dead_stream(channel):
+    logger.info(f"Stream artık çalışmıyor, yeniden çıkarılacak: {channel['name']}")
+    channel['m3u_url'] = None
+    channel['last_resolved'] = None
 
 def save_debug_html():
     """Hata ayıklama için web sayfasını kaydeder."""
     try:
-        response = requests.get(BASE_URL, headers={'User-Agent': USER_AGENT})
+        response = http_get(BASE_URL, headers={'User-Agent': USER_AGENT})
         with open('debug_page.html', 'w', encoding='utf-8') as f:
             f.write(response.text)
         logger.info("Hata ayıklama için HTML sayfası kaydedildi: debug_page.html")
     except Exception as e:
         logger.error(f"HTML sayfası kaydedilirken hata: {e}")
 
-def check_m3u_urls(channels):
-    """Listelenen m3u URL'lerinin geçerliliğini kontrol eder"""
-    valid_channels = []
-    invalid_channels = []
+def _stream_candidate_urls(channel):
+    """Kanalın doğrulanacak stream URL'lerini sıralı döndürür: önce m3u_url, sonra diğer adaylar"""
+    urls = []
+    for url in [channel['m3u_url']] + [candidate['url'] for candidate in channel.get('m3u_candidates') or []]:
+        if not url.startswith('http'):
+            url = urllib.parse.urljoin(BASE_URL, url)
+        if url not in urls:
+            urls.append(url)
+    return urls[:M3U_CANDIDATE_LIMIT]
+
+def _select_stream(channel, urls, is_alive_results):
+    """
+    Sıradaki ilk çalışan adayı kanala yazar; bulunamazsa False döner.
+    Sonuç hls_validator'dan geldiyse manifest ayrıntıları channel['stream_info']'ya yazılır.
+    """
+    for url, is_alive in zip(urls, is_alive_results):
+        if is_alive:
+            if url != urls[0]:
+                logger.info(f"İlk aday çalışmadı, sıradaki aday seçildi: {channel['name']} - {url}")
+            channel['m3u_url'] = url  # Tam URL'yi güncelle
+            if isinstance(is_alive, dict):
+                channel['stream_info'] = is_alive
+            logger.info(f"Geçerli M3U URL: {channel['name']} - {url}")
+            return True
+    logger.warning(f"Geçersiz M3U URL ({len(urls)} aday denendi): {channel['name']} - {urls[0]}")
+    return False
+
+def validate_channel(channel):
+    """
+    Kanalın adaylarını küçük bir havuzda aynı anda doğrular ama puan sırasıyla değerlendirir:
+    sıralamada çalışan ilk aday kazanır, henüz başlamamış denemeler iptal edilir, havada olanlar
+    arka planda biter. Geçerliyse True döner.
+    """
+    urls = _stream_candidate_urls(channel)
+    if len(urls) == 1:
+        return _select_stream(channel, urls, [hls_validator.validate(urls[0])])
     
-    logger.info(f"Toplam {len([c for c in channels if c.get('m3u_url')])} m3u URL'si kontrol edilecek")
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix='m3u-candidate')
+    try:
+        futures = [executor.submit(hls_validator.validate, url) for url in urls]
+        # Sonuçları sırayla oku: çalışan ilk adayda dur
+        results = []
+        for future in futures:
+            results.append(future.result())
+            if results[-1]:
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return _select_stream(channel, urls, results)
+
+def save_all_channel_pages(channel_urls=None):
+    """
+    Tüm kanal sayfalarını ve iframe'lerini debug klasörüne kaydeder.
+    Ana işlemde bu kayıtlar extract_m3u_url'in yaptığı isteklerin yan çıktısı olarak zaten
+    üretildiği için bu fonksiyon yalnızca tek başına hata ayıklama içindir; aynı önbellekli
+    istekleri kullanır, bu yüzden ana işlemle birlikte çalıştırılsa bile sayfalar ikinci kez indirilmez.
+    """
+    logger.info("Tüm kanal sayfaları indiriliyor ve kaydediliyor...")
     
-    # İki denemede kontrol et - ilk denemede başarısız olanları ikinci denemede tekrar dene
-    for attempt in range(2):
-        channels_to_check = channels if attempt == 0 else invalid_channels
-        invalid_channels = []
-        
-        for channel in channels_to_check:
-            if not channel.get('m3u_url'):
-                continue
+    if channel_urls is None:
+        channel_urls = get_all_channel_urls()
+    
+    def save_page(url):
+        channel_slug = _url_slug(url)
+        try:
+            response = cached_get(url, headers={"User-Agent": USER_AGENT}, timeout=15)
+            if response.status_code != 200:
+                logger.error(f"Kanal sayfası yüklenemedi: HTTP {response.status_code}")
+                return False
+            snapshot_writer.submit(f"{channel_slug}.html", response.text)
+            
+            # Sayfadaki iframe'leri bul ve içeriklerini kaydet
+            soup = make_soup(response.text)
+            for i, iframe in enumerate(soup.find_all('iframe')):
+                iframe_src = iframe.get('src', '')
+                if not iframe_src:
+                    continue
                 
-            try:
-                m3u_url = channel['m3u_url']
-                if not m3u_url.startswith('http'):
-                    m3u_url = urllib.parse.urljoin(BASE_URL, m3u_url)
+                # iframe src'yi normalize et
+                if iframe_src.startswith('//'):
+                    iframe_src = 'https:' + iframe_src
+                elif not iframe_src.startswith('http'):
+                    iframe_src = urllib.parse.urljoin(url, iframe_src)
                 
-                # HEAD isteği ile kontrol et
                 try:
-                    head_response = requests.head(m3u_url, timeout=8, allow_redirects=True)
-                    
-                    # Bazı sunucular HEAD isteklerini desteklemez, bu durumda GET kullanmayı dene
-                    if head_response.status_code >= 400:
-                        logger.info(f"HEAD isteği başarısız, GET deneniyor: {channel['name']}")
-                        get_response = requests.get(m3u_url, timeout=8, stream=True)
-                        
-                        # İlk birkaç baytı oku ve bağlantıyı kapat
-                        if get_response.status_code < 400:
-                            for chunk in get_response.iter_content(chunk_size=1024):
-                                if chunk:
-                                    break
-                            get_response.close()
-                            
-                            channel['m3u_url'] = m3u_url  # Tam URL'yi güncelle
-                            valid_channels.append(channel)
-                            logger.info(f"Geçerli M3U URL (GET): {channel['name']} - {m3u_url}")
-                            continue
-                    
-                    # HEAD isteği başarılıysa
-                    if head_response.status_code < 400:
-                        channel['m3u_url'] = m3u_url  # Tam URL'yi güncelle
-                        valid_channels.append(channel)
-                        logger.info(f"Geçerli M3U URL (HEAD): {channel['name']} - {m3u_url}")
-                    else:
-                        invalid_channels.append(channel)
-                        logger.warning(f"Geçersiz M3U URL (HTTP {head_response.status_code}): {channel['name']} - {m3u_url}")
-                
-                except Exception as e:
-                    # Bağlantı hatası, ikinci denemede farklı yöntem kullanacağız
-                    invalid_channels.append(channel)
-                    logger.warning(f"M3U URL kontrolü hatası: {channel['name']} - {e}")
-            
-            except Exception as e:
-                logger.error(f"Genel hata: {channel['name']} - {str(e)}")
-                
-        logger.info(f"Deneme {attempt+1} - Geçerli URL: {len(valid_channels)}, Geçersiz URL: {len(invalid_channels)}")
-        
-        # Bir sonraki tur için geçersizleri tekrar kontrol et
-        if attempt == 0 and invalid_channels:
-            logger.info(f"Geçersiz {len(invalid_channels)} URL ikinci kez kontrol edilecek")
-            time.sleep(2)  # İkinci deneme öncesi bekle
+                    iframe_response = cached_get(iframe_src, headers={
+                        "User-Agent": USER_AGENT,
+                        "Referer": url
+                    }, timeout=15)
+                    if iframe_response.status_code == 200:
+                        snapshot_writer.submit(f"{channel_slug}_iframe_{i}.html", iframe_response.text)
+                except Exception as iframe_error:
+                    logger.warning(f"İframe indirilirken hata: {iframe_error}")
+            return True
+        except Exception as e:
+            logger.error(f"Kanal sayfası kaydedilirken hata: {e}")
+            return False
     
-    # Duplikasyonları temizle
-    unique_valid_channels = []
-    seen_urls = set()
+    # Rate limiting host bazında paylaşılan oturumda yapılır, sabit beklemeye gerek yok
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='snapshot') as executor:
+        processed_count = sum(1 for saved in executor.map(save_page, channel_urls) if saved)
+    snapshot_writer.flush()
     
-    for channel in valid_channels:
-        if channel['m3u_url'] not in seen_urls:
-            seen_urls.add(channel['m3u_url'])
-            unique_valid_channels.append(channel)
+    logger.info(f"Toplam {processed_count} kanal sayfası başarıyla kaydedildi.")
+    return channel_urls
+
+def create_async_session(limit=ASYNC_MAX_CONNECTIONS, limit_per_host=ASYNC_PER_HOST_CONNECTIONS):
+    """Toplam ve host başına bağlantı sınırları olan bir aiohttp oturumu oluşturur"""
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT})
+
+class AsyncSingleFlight:
+    """SingleFlight'ın olay döngüsü sürümü: aynı anahtarlı istekler tek görevde birleştirilir"""
     
-    logger.info(f"Geçerli benzersiz M3U URL sayısı: {len(unique_valid_channels)}/{len([c for c in channels if c.get('m3u_url')])}")
-    return unique_valid_channels
+    def __init__(self, max_results=SINGLE_FLIGHT_MAX_RESULTS):
+        self.max_results = max_results
+        self._inflight = {}
+        self._results = collections.OrderedDict()
+    
+    async def do(self, key, factory, shareable=None):
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda done: self._finish(key, done, shareable))
+        # Bekleyenlerden birinin iptali ortak isteği iptal etmesin
+        return await asyncio.shield(task)
+    
+    def _finish(self, key, task, shareable):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if shareable is None or shareable(task.result()):
+            self._results[key] = task.result()
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+    
+    def forget(self):
+        self._results.clear()
 
-def save_all_channel_pages():
-    """Tüm kanal sayfalarını kaydeder - debug için kullanılır"""
-    logger.info("Tüm kanal sayfaları indiriliyor ve kaydediliyor...")
+async_request_flights = AsyncSingleFlight()
+
+def _is_shareable_async_result(result):
+    status = result[0]
+    return status is not None and status not in HTTP_RETRY_STATUSES
+
+async def async_fetch(session, url, method='GET', headers=None, timeout=10, allow_redirects=True, max_bytes=None,
+                      share=True, with_url=False):
+    """
+    Tek bir asenkron HTTP isteği yapar ve (durum kodu, içerik) döndürür; with_url=True ise
+    yönlendirmelerden sonraki son URL de eklenir: (durum kodu, içerik, son URL).
+    max_bytes verilirse gövdenin yalnızca ilk max_bytes baytı (ya da daha kısaysa tamamı) okunur,
+    HEAD isteklerinde içerik boştur. Bağlantı hatalarında durum ve içerik None olur. Aynı istekler
+    http_get'teki gibi birleştirilir; share=False ile (ör. tekrar denemelerde) her zaman ağa çıkılır.
+    """
+    factory = lambda: _async_fetch(session, url, method, headers, timeout, allow_redirects, max_bytes)
+    if not (SINGLE_FLIGHT_ENABLED and share):
+        result = await factory()
+    else:
+        key = request_flight_key(method, url, headers, allow_redirects=allow_redirects, max_bytes=max_bytes)
+        result = await async_request_flights.do(key, factory, _is_shareable_async_result)
+    return result if with_url else result[:2]
+
+async def _async_fetch(session, url, method, headers, timeout, allow_redirects, max_bytes):
+    try:
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with session.request(method, url, headers=headers, timeout=client_timeout,
+                                   allow_redirects=allow_redirects) as response:
+            final_url = str(response.url)
+            if method == 'HEAD':
+                return response.status, '', final_url
+            if max_bytes:
+                # read(n) o an tampondaki kadarını döndürür; max_bytes ya da gövde sonuna kadar oku
+                body = b''
+                while len(body) < max_bytes:
+                    chunk = await response.content.read(max_bytes - len(body))
+                    if not chunk:
+                        break
+                    body += chunk
+                return response.status, body.decode(response.charset or 'utf-8', errors='replace'), final_url
+            return response.status, await response.text(errors='replace'), final_url
+    except Exception as e:
+        logger.debug(f"Asenkron istek hatası: {url} - {e}")
+        return None, None, None
+
+async def async_check_and_fix_urls(session, url_list, aliases=None):
+    """check_and_fix_urls'in asenkron sürümü: tüm URL'ler aynı olay döngüsünde paralel denenir"""
+    headers = {"User-Agent": USER_AGENT}
     
-    # Debug klasörü oluştur
-    debug_dir = "debug_channels"
-    os.makedirs(debug_dir, exist_ok=True)
+    async def probe(candidate):
+        status, _ = await async_fetch(session, candidate, method='HEAD', headers=headers,
+                                      timeout=5, allow_redirects=False)
+        return status is not None and status < 400, status is None
     
-    # Tüm URL'leri topla ve geçerli olanları bul
-    channel_urls = get_all_channel_urls()
+    async def check(url):
+        # Varyasyonlar yalnızca önceki aday çalışmadığında denenir
+        for candidate in _probe_candidates(url, (aliases or {}).get(url, ())):
+            ok, errored = await probe(candidate)
+            if ok:
+                _remember_probe_result(url, candidate)
+                return candidate
+            if errored and candidate == url:
+                return candidate
+        return None
     
-    # URL doğrulama ve düzeltme mekanizmasıyla, çalışmayan URL'leri düzelt
+    url_list = list(url_list)
+    results = await asyncio.gather(*(check(url) for url in url_list))
     working_urls = []
+    fixed_count = 0
+    for url, chosen in zip(url_list, results):
+        if not chosen:
+            continue
+        working_urls.append(chosen)
+        if chosen != url:
+            logger.info(f"URL düzeltildi: {url} -> {chosen}")
+            fixed_count += 1
+    slug_variant_memory.save()
     
-    # URL'lerin %10'unu test et (tüm listeyi test etmek çok uzun sürer)
-    sample_size = min(50, len(channel_urls))
-    sample_urls = random.sample(channel_urls, sample_size)
+    logger.info(f"URL kontrolü tamamlandı: {len(working_urls)} çalışan URL, {fixed_count} URL düzeltildi")
+    return working_urls
+
+async def async_get_all_channel_urls(session):
+    """get_all_channel_urls'in asenkron sürümü: kategori sayfaları paralel indirilir"""
+    logger.info("Tüm kanal URL'leri toplanıyor (asenkron)...")
+    status, html_content = await async_fetch(session, "https://www.canlitv.vin", timeout=10)
+    if status is None or status >= 400:
+        logger.error(f"Ana sayfa alınamadı: HTTP {status}")
+        return []
     
-    logger.info(f"URL örneklemi test ediliyor: {sample_size} URL")
-    for url in sample_urls:
-        try:
-            # URL'yi test et
-            response = requests.head(url, headers={"User-Agent": USER_AGENT}, timeout=5)
-            if response.status_code < 400:
-                # URL çalışıyor, tüm listeye ekle
-                working_urls.append(url)
-                logger.info(f"URL çalışıyor: {url}")
-            else:
-                # URL çalışmıyor, düzeltmeye çalış
-                logger.warning(f"URL çalışmıyor ({response.status_code}): {url}")
-                
-                # Kanal adını çıkar ve alternatif URL formatlarını dene
-                try:
-                    channel_name = url.rstrip('/').split('/')[-1]
-                    base_name = channel_name
-                    
-                    # Yaygın ekleri çıkar
-                    for suffix in ['-canli', '-izle', '-yayin', '-hd', '-tv']:
-                        base_name = base_name.replace(suffix, '')
-                    
-                    # Alternatif formatları dene
-                    alt_formats = [
-                        f"{BASE_URL}{base_name}-canli-yayin",
-                        f"{BASE_URL}{base_name}-canli-izle",
-                        f"{BASE_URL}{base_name}-hd-izle",
-                        f"{BASE_URL}{base_name}-hd-canli-yayin",
-                        f"{BASE_URL}{base_name}-tv-hd-izle"
-                    ]
-                    
-                    found_working = False
-                    for alt_url in alt_formats:
-                        try:
-                            alt_response = requests.head(alt_url, headers={"User-Agent": USER_AGENT}, timeout=5)
-                            if alt_response.status_code < 400:
-                                working_urls.append(alt_url)
-                                logger.info(f"Alternatif URL çalışıyor: {alt_url}")
-                                found_working = True
-                                break
-                        except:
-                            continue
-                    
-                    if not found_working:
-                        # Hiçbir alternatif çalışmadıysa, orijinal URL'yi ekle
-                        working_urls.append(url)
-                except:
-                    # URL işlenemezse, orijinal URL'yi ekle
-                    working_urls.append(url)
-        except Exception as e:
-            # Test hatası, URL'yi olduğu gibi ekle
-            working_urls.append(url)
-            logger.warning(f"URL test hatası: {url} - {e}")
+    all_links, category_urls = _collect_homepage_links(make_soup(html_content))
     
-    # Diğer tüm URL'leri ekle
-    for url in channel_urls:
-        if url not in sample_urls:
-            working_urls.append(url)
+    pages = await asyncio.gather(*(async_fetch(session, href, timeout=10) for href in category_urls))
+    for href, (_, category_content) in zip(category_urls, pages):
+        if category_content is None:
+            logger.error(f"Kategori sayfası işlenirken hata: {href}")
+            continue
+        all_links.update(_collect_category_links(make_soup(category_content)))
+    
+    catalog = ChannelCatalog.from_links(all_links)
+    checked_urls = await async_check_and_fix_urls(session, catalog.primary_urls(), catalog.alias_map())
+    logger.info(f"Toplam {len(checked_urls)} kanal URL'si bulundu")
+    return checked_urls
+
+async def async_extract_m3u_url(session, channel_info, semaphore):
+    """
+    Kanal sayfasını asenkron indirir, ayrıştırma ve iç içe çıkarma adımlarını
+    olay döngüsünü bloke etmemek için bir iş parçacığında çalıştırır.
+    """
+    async with semaphore:
+        headers = {
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+            'Referer': BASE_URL,
+        }
+        status, html_content = await async_fetch(session, channel_info['url'], headers=headers, timeout=15)
+        if status is None or status >= 400:
+            logger.error(f"Sayfa alınırken hata: {channel_info['url']} - HTTP {status}")
+            return None
+        return await asyncio.to_thread(extract_m3u_url, channel_info, html_content)
+
+async def async_check_m3u_urls(session, channels):
+    """Kanalların m3u adaylarını eşzamanlı doğrular (validate_channel'ın asenkron karşılığı), geçerli ve benzersiz olanları döndürür"""
+    logger.info(f"Toplam {len(channels)} m3u URL'si kontrol edilecek (asenkron)")
+    
+    async def check(channel):
+        urls = _stream_candidate_urls(channel)
+        
+        # İki denemede kontrol et; adaylar eşzamanlı denenir, puan sırasıyla seçilir
+        for attempt in range(2):
+            results = await asyncio.gather(*(hls_validator.async_validate(session, url, share=attempt == 0) for url in urls))
+            if any(results):
+                break
+            if attempt == 0:
+                await asyncio.sleep(2)
+        
+        is_valid = _select_stream(channel, urls, results)
+        if is_valid:
+            resolved_journal.record(channel)
+        crawl_state.record(channel, 'validated', 'valid' if is_valid else 'invalid')
+        return is_valid
+    
+    results = await asyncio.gather(*(check(channel) for channel in channels))
+    
+    # Duplikasyonları temizle
+    unique_valid_channels = unique_stream_channels(
+        [channel for channel, is_valid in zip(channels, results) if is_valid])
     
-    # Benzersiz URL listesi oluştur
-    working_urls = list(set(working_urls))
+    logger.info(f"Geçerli benzersiz M3U URL sayısı: {len(unique_valid_channels)}/{len(channels)}")
+    return unique_valid_channels
+
+async def async_run_pipeline(previous=None, max_workers=MAX_WORKERS, deadline=GLOBAL_DEADLINE, max_channels=MAX_CHANNELS):
+    """
+    Keşif, çıkarma ve doğrulama aşamalarını tek bir olay döngüsünde çalıştırır. ChannelPipeline ile
+    aynı artımlı mod, günlük ve tarama durumu katmanını kullanır: --resume ile yarım kalan taramanın
+    kanalları devralınır, önceki çalıştırmadan bilinen stream'ler önce yeniden doğrulanır ve yalnızca
+    ölenler ile yeni kanallar çıkarılır. (tüm kanallar, geçerli kanallar) ikilisini döndürür.
+    """
+    previous = previous or {}
+    channels = []
+    valid_channels = []
+    pending = []
     
-    logger.info(f"Toplam {len(working_urls)} URL işlenecek")
+    def add_valid(channel, record=True):
+        valid_channels.append(channel)
+        if record:
+            resolved_journal.record(channel)
+            crawl_state.record(channel, 'validated', 'valid')
     
-    # Her URL için sayfayı indir ve kaydet
-    processed_count = 0
-    for url in working_urls:
-        # Kanal adını URL'den çıkar
-        channel_slug = url.rstrip('/').split('/')[-1]
+    async with create_async_session() as session:
+        discover = True
+        if crawl_state.resumed:
+            restored = crawl_state.channels()
+            for stage, status, channel in restored:
+                channels.append(channel)
+                if status == 'valid':
+                    add_valid(channel, record=False)
+                elif status in ('pending', 'resolved'):
+                    pending.append(channel)
+            logger.info(f"Tarama durumundan {len(restored)} kanal devralındı")
+            discover = not crawl_state.discovery_done()
+        
+        if discover:
+            seen_ids = {canonical_channel_id(channel['url']) for channel in channels}
+            for channel in _unique_channels(await async_get_all_channel_urls(session)):
+                if channel['id'] in seen_ids:
+                    continue
+                if len(seen_ids) >= max_channels:
+                    logger.info(f"Kanal sınırına ulaşıldı ({max_channels}), kalan URL'ler işlenmeyecek")
+                    break
+                seen_ids.add(channel['id'])
+                _restore_known_stream(channel, previous)
+                crawl_state.record(channel, 'discovered', 'pending')
+                channels.append(channel)
+                pending.append(channel)
+            crawl_state.mark_discovery_done()
+        if not channels:
+            return [], []
+        
+        # Bilinen stream hâlâ çalışıyorsa çıkarma ve ikinci doğrulama gerekmez
+        known = [channel for channel in pending if channel.get('m3u_url')]
+        if known:
+            logger.info(f"Bilinen {len(known)} stream URL'si yeniden doğrulanıyor")
+            stream_infos = await asyncio.gather(*(hls_validator.async_validate(session, channel['m3u_url'])
+                                                  for channel in known))
+            for channel, stream_info in zip(known, stream_infos):
+                if stream_info:
+                    channel['stream_info'] = stream_info
+                    add_valid(channel)
+                else:
+                    _forget_dead_stream(channel)
         
-        logger.info(f"Kanal sayfası indiriliyor: {channel_slug}")
+        to_extract = sorted((channel for channel in pending if not channel.get('m3u_url')), key=_extraction_priority)
+        semaphore = asyncio.Semaphore(max_workers)
+        tasks = {asyncio.ensure_future(async_extract_m3u_url(session, channel, semaphore)): channel
+                 for channel in to_extract}
+        if tasks:
+            done, not_done = await asyncio.wait(tasks, timeout=deadline or None)
+            for task in not_done:
+                task.cancel()
+            if not_done:
+                logger.warning(f"Süre sınırı aşıldı, {len(not_done)} kanal işlenmeden bırakıldı")
+            
+            for task in done:
+                channel = tasks[task]
+                try:
+                    channel['m3u_url'] = task.result()
+                except Exception as e:
+                    logger.error(f"Kanal işlenirken hata: {channel['name']} - {e}")
+                    channel['m3u_url'] = None
+                if channel['m3u_url']:
+                    channel['last_resolved'] = datetime.now().isoformat()
+                crawl_state.record(channel, 'extracted', 'resolved' if channel['m3u_url'] else 'failed')
         
+        # async_check_m3u_urls günlüğe ve tarama durumuna kendisi yazar
+        for channel in await async_check_m3u_urls(session, [c for c in to_extract if c.get('m3u_url')]):
+            add_valid(channel, record=False)
+    
+    # Aynı stream'e çıkan kanallardan hangisinin kalacağı doğrulama sırasına bağlı olmasın
+    valid_channels = unique_stream_channels(valid_channels)
+    logger.info(f"Geçerli benzersiz M3U URL sayısı: {len(valid_channels)}/{len(channels)}")
+    return channels, valid_channels
+
+def _extraction_priority(channel):
+    """Kanallar çalma listesindeki öncelik sırasıyla çıkarılır: ulusal kanallar önce, sınıfsızlar en son"""
+    return channel_classifier.classify_channel(channel)['priority']
+
+class ChannelPipeline:
+    """
+    Keşif, çıkarma ve doğrulama aşamalarını sınırlı kuyruklarla birbirine bağlar.
+    Kontrol edilen her kanal URL'si hemen çıkarma kuyruğuna, m3u URL'si bulunan her kanal
+    hemen doğrulama kuyruğuna girer; böylece farklı aşamalardaki ağ beklemeleri üst üste biner.
+    Çıkarma kuyruğu öncelik sıralıdır (ana kanallar önce). Önceki çalıştırmadan bilinen
+    stream'ler çıkarma aşamasında yeniden doğrulanır, ölenler tam çıkarmaya bırakılır.
+    """
+    
+    _DONE = (float('inf'), -1, None)  # Öncelikli kuyrukta tüm kanallardan sonra gelen bitiş işareti
+    
+    def __init__(self, previous=None, max_workers=MAX_WORKERS, deadline=GLOBAL_DEADLINE,
+                 validators=VALIDATION_WORKERS, max_channels=MAX_CHANNELS, queue_size=PIPELINE_QUEUE_SIZE):
+        self.previous = previous or {}
+        self.max_workers = max_workers
+        self.validators = validators
+        self.max_channels = max_channels
+        self.deadline_at = time.monotonic() + deadline if deadline else None
+        self.extract_queue = queue.PriorityQueue(maxsize=queue_size)
+        self.validate_queue = queue.Queue(maxsize=queue_size)
+        self.channels = []
+        self.valid_channels = []
+        self.retry_channels = []
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._extractors_left = max_workers
+    
+    def _add_valid(self, channel, record=True):
+        """
+        Kanalı geçerli listeye ekler; record False ise (ör. tarama durumundan devralınan) yeniden kaydetmez.
+        Aynı stream'e çıkan kanallar run() sonunda kararlı sırayla tekilleştirilir.
+        """
+        with self._lock:
+            self.valid_channels.append(channel)
+            count = len(self.valid_channels)
+        if record:
+            resolved_journal.record(channel)
+            crawl_state.record(channel, 'validated', 'valid')
+        if count % 10 == 0:
+            logger.info(f"Geçerli kanal sayısı: {count}")
+    
+    def _enqueue(self, channel):
+        with self._lock:
+            self.channels.append(channel)
+        self.extract_queue.put((_extraction_priority(channel), next(self._sequence), channel))
+    
+    def _restore_from_state(self, seen):
+        """
+        --resume: yarım kalan çalıştırmanın kanallarını kaldıkları aşamadan devralır. Doğrulanmışlar
+        günlüğe ve tarama durumuna yeniden yazılmadan doğrudan geçerli listeye girer; bekleyenler
+        çıkarmaya, çıkarılmış ama doğrulanmamışlar bilinen stream yolundan doğrulamaya gider.
+        Başarısız olanlar yeniden denenmez.
+        """
+        restored = crawl_state.channels()
+        for stage, status, channel in restored:
+            seen.add(channel['url'])
+            if status == 'valid':
+                with self._lock:
+                    self.channels.append(channel)
+                self._add_valid(channel, record=False)
+            elif status in ('pending', 'resolved'):
+                self._enqueue(channel)
+            else:
+                with self._lock:
+                    self.channels.append(channel)
+        logger.info(f"Tarama durumundan {len(restored)} kanal devralındı")
+    
+    def _discover(self):
+        """Kanal linklerini toplar, kontrol edilen her URL'yi çıkarma kuyruğuna koyar"""
         try:
-            # Sayfayı indir
-            response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=15)
+            seen = set()
+            if crawl_state.resumed:
+                self._restore_from_state(seen)
+                if crawl_state.discovery_done():
+                    return
             
-            if response.status_code != 200:
-                logger.error(f"Kanal sayfası yüklenemedi: HTTP {response.status_code}")
-                continue
-                
-            # Sayfayı kaydet
-            with open(f"{debug_dir}/{channel_slug}.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
+            logger.info("Tüm kanal URL'leri toplanıyor...")
+            catalog = collect_channel_links()
+            seen_ids = {canonical_channel_id(url) for url in seen}
+            for _, chosen in iter_checked_urls(catalog.primary_urls(), catalog.alias_map()):
+                if not chosen or chosen in seen:
+                    continue
+                # Düzeltilen URL başka bir kanalın kimliğine çıkabilir; her kanal bir kez işlenir
+                channel = catalog.new_channel(chosen)
+                if channel['id'] in seen_ids:
+                    continue
+                if len(seen) >= self.max_channels:
+                    logger.info(f"Kanal sınırına ulaşıldı ({self.max_channels}), kalan URL'ler işlenmeyecek")
+                    break
+                seen.add(chosen)
+                seen_ids.add(channel['id'])
+                _restore_known_stream(channel, self.previous)
+                crawl_state.record(channel, 'discovered', 'pending')
+                self._enqueue(channel)
+            crawl_state.mark_discovery_done()
+            logger.info(f"Keşif tamamlandı: {len(seen)} kanal")
+        except Exception as e:
+            logger.error(f"Tüm kanal URL'leri toplanırken hata: {e}")
+        finally:
+            for _ in range(self.max_workers):
+                self.extract_queue.put(self._DONE)
+    
+    def _extract_worker(self):
+        """Kanalları çıkarır; m3u URL'si bulunanları doğrulama kuyruğuna geçirir"""
+        try:
+            while True:
+                _, _, channel = self.extract_queue.get()
+                if channel is None:
+                    break
                 
-            logger.info(f"Kanal HTML içeriği kaydedildi: {debug_dir}/{channel_slug}.html")
-            
-            # Sayfadaki iframe'leri bul ve içeriklerini kaydet
-            soup = BeautifulSoup(response.text, 'html.parser')
-            iframes = soup.find_all('iframe')
-            
-            for i, iframe in enumerate(iframes):
-                iframe_src = iframe.get('src', '')
+                # Bilinen stream hâlâ çalışıyorsa çıkarma ve ikinci doğrulama gerekmez
+                if channel.get('m3u_url'):
+                    stream_info = hls_validator.validate(channel['m3u_url'])
+                    if stream_info:
+                        channel['stream_info'] = stream_info
+                        self._add_valid(channel)
+                        continue
+                    _forget_dead_stream(channel)
                 
-                # iframe src'yi normalize et
-                if iframe_src:
-                    if iframe_src.startswith('//'):
-                        iframe_src = 'https:' + iframe_src
-                    elif not iframe_src.startswith('http'):
-                        iframe_src = urllib.parse.urljoin(url, iframe_src)
-                        
-                    try:
-                        # iframe içeriğini indir
-                        iframe_response = requests.get(iframe_src, headers={
-                            "User-Agent": USER_AGENT,
-                            "Referer": url
-                        }, timeout=15)
-                        
-                        if iframe_response.status_code == 200:
-                            # iframe içeriğini kaydet
-                            with open(f"{debug_dir}/{channel_slug}_iframe_{i}.html", "w", encoding="utf-8") as f:
-                                f.write(iframe_response.text)
-                                
-                            logger.info(f"İframe içeriği kaydedildi: {debug_dir}/{channel_slug}_iframe_{i}.html")
-                    except Exception as iframe_error:
-                        logger.warning(f"İframe indirilirken hata: {iframe_error}")
-            
-            processed_count += 1
-            
-            # Her 10 sayfada bir 2 saniye bekle - rate limiting'i önlemek için
-            if processed_count % 10 == 0:
-                time.sleep(2)
-            else:
-                time.sleep(1)  # Her sayfa arasında 1 saniye bekle
+                if self.deadline_at and time.monotonic() > self.deadline_at:
+                    with self._lock:
+                        self.skipped += 1
+                    continue
                 
-        except Exception as e:
-            logger.error(f"Kanal sayfası kaydedilirken hata: {e}")
-            
-        # Her sayfa arasında 2 saniye bekle - rate limiting
-        time.sleep(2)
+                try:
+                    channel['m3u_url'] = extract_m3u_url(channel)
+                except Exception as e:
+                    logger.error(f"Kanal işlenirken hata: {channel['name']} - {e}")
+                    channel['m3u_url'] = None
+                if channel['m3u_url']:
+                    channel['last_resolved'] = datetime.now().isoformat()
+                crawl_state.record(channel, 'extracted', 'resolved' if channel['m3u_url'] else 'failed')
+                if channel['m3u_url']:
+                    self.validate_queue.put(channel)
+        finally:
+            with self._lock:
+                self._extractors_left -= 1
+                last = self._extractors_left == 0
+            if last:
+                for _ in range(self.validators):
+                    self.validate_queue.put(None)
     
-    logger.info(f"Toplam {processed_count} kanal sayfası başarıyla kaydedildi.")
+    def _validate_worker(self):
+        """Çıkarılan stream'leri doğrular; ilk denemede geçemeyenler ikinci tura kalır"""
+        while True:
+            channel = self.validate_queue.get()
+            if channel is None:
+                break
+            try:
+                if validate_channel(channel):
+                    self._add_valid(channel)
+                else:
+                    with self._lock:
+                        self.retry_channels.append(channel)
+            except Exception as e:
+                logger.error(f"Genel hata: {channel['name']} - {str(e)}")
     
-    return working_urls
+    def run(self):
+        """Boru hattını çalıştırır, (tüm kanallar, geçerli kanallar) ikilisini döndürür"""
+        threads = [threading.Thread(target=self._discover, name='discover', daemon=True)]
+        threads += [threading.Thread(target=self._extract_worker, name=f'extract-{i}', daemon=True)
+                    for i in range(self.max_workers)]
+        threads += [threading.Thread(target=self._validate_worker, name=f'validate-{i}', daemon=True)
+                    for i in range(self.validators)]
+        logger.info(f"Boru hattı başlıyor: {self.max_workers} çıkarma, {self.validators} doğrulama iş parçacığı")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if self.skipped:
+            logger.warning(f"Süre sınırı aşıldı, {self.skipped} kanal işlenmeden bırakıldı")
+        
+        # İlk doğrulamada geçemeyenleri bir kez daha dene
+        if self.retry_channels:
+            logger.info(f"Geçersiz {len(self.retry_channels)} URL ikinci kez kontrol edilecek")
+            time.sleep(2)  # İkinci deneme öncesi bekle
+            request_flights.forget()  # İlk turun yanıtları yeniden kullanılmasın
+            with concurrent.futures.ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix='m3u-check') as executor:
+                results = list(executor.map(validate_channel, self.retry_channels))
+            for channel, is_valid in zip(self.retry_channels, results):
+                if is_valid:
+                    self._add_valid(channel)
+                else:
+                    crawl_state.record(channel, 'validated', 'invalid')
+        
+        self.valid_channels = unique_stream_channels(self.valid_channels)
+        logger.info(f"Geçerli benzersiz M3U URL sayısı: {len(self.valid_channels)}/{len(self.channels)}")
+        return self.channels, self.valid_channels
+
+def write_outputs(channels, valid_channels, health_probe=HEALTH_PROBE_ENABLED):
+    """M3U ve metadata dosyalarını yazar (istenirse önce stream sağlığını ölçer), ikisi de yazıldıysa True döner"""
+    if health_probe:
+        run_health_probes(valid_channels)
+    
+    # M3U dosyasını oluştur
+    written = create_m3u_file(valid_channels)
+    
+    # Metadata dosyasını oluştur (kanallar keşif sırasına değil ad/URL sırasına göre yazılır)
+    channels = sorted(channels, key=_stable_channel_key)
+    written = create_metadata(channels, len(valid_channels), valid_channels) and written
+    
+    # Çıktılar tamamsa günlüğe gerek kalmadı; yazım başarısızsa sonraki çalıştırma günlükten devam eder
+    if written:
+        resolved_journal.clear()
+    
+    logger.info(f"İşlem tamamlandı! {len(valid_channels)} geçerli kanal m3u dosyasına eklendi.")
+    return written
 
-def main():
+def main(max_workers=MAX_WORKERS, deadline=GLOBAL_DEADLINE, use_async=False, incremental=INCREMENTAL_MODE,
+         health_probe=HEALTH_PROBE_ENABLED, resume=False):
     logger.info("Kanal çekme işlemi başlıyor...")
     
     # Hata ayıklama için sayfayı kaydet
     save_debug_html()
     
-    # Tüm kanalları al
-    channels = get_channels()
+    if use_async and aiohttp is None:
+        logger.warning("aiohttp paketi bulunamadı, senkron moda geçiliyor")
+        use_async = False
     
-    if not channels:
-        logger.error("Hiç kanal bulunamadı!")
-        return False
+    # Artımlı mod: önceki çalıştırmada çözülen kanalları yükle
+    previous = load_previous_metadata() if incremental else {}
+    if incremental:
+        logger.info(f"Artımlı mod: önceki çalıştırmadan {len(previous)} çözülmüş kanal bulundu")
     
-    # Tüm kanalları işlemek için maksimum sayıyı artır
-    max_channels = 1000  # İşlenecek maksimum kanal sayısını artırıyoruz
-    channels_to_process = channels[:max_channels]
-    logger.info(f"İşlenecek kanal sayısı: {len(channels_to_process)}/{len(channels)}")
-    
-    # Kanal listesini karıştır, popüler kanalları önceliklendirmeye çalışalım
-    def prioritize_channels(channel):
-        # TRT, ATV, gibi ana kanalları önceliklendir
-        name = channel['name'].lower()
-        for prefix in ['trt', 'atv', 'show', 'star', 'kanal d', 'fox', 'tv8']:
-            if prefix in name:
-                return 0
-        return 1
-        
-    # Kanalları önceliklendir
-    channels_to_process.sort(key=prioritize_channels)
-    
-    # Her kanal için m3u URL'sini çıkar
-    for i, channel in enumerate(channels_to_process):
-        if not channel.get('m3u_url'):  # Zaten m3u_url yoksa ekle
-            channel['m3u_url'] = extract_m3u_url(channel)
-        
-        # Rate limiting - her 5 kanalda bir 2 saniye bekle
-        if (i + 1) % 5 == 0:
-            logger.info(f"İşlenen: {i+1}/{len(channels_to_process)} - Rate limiting: 2 saniye bekleniyor...")
-            time.sleep(2)
-    
-    # İşlenen kanalları ana listeye ekle
-    for i, channel in enumerate(channels_to_process):
-        if i < len(channels):
-            channels[i] = channel
-    
-    # Geçerli M3U URL'leri olan kanalları kontrol et
-    valid_channels = check_m3u_urls([c for c in channels if c.get('m3u_url')])
+    # Yarıda kalmış çalıştırmanın doğruladığı kanallar yeniden çıkarılmaz
+    journaled = resolved_journal.load()
+    if journaled:
+        logger.info(f"Yarıda kalan çalıştırmanın günlüğünden {len(journaled)} kanal devralınıyor")
+        previous = {**previous, **journaled}
     
-    # M3U dosyasını oluştur
-    create_m3u_file(valid_channels)
+    # Kanal bazında tarama durumu; --resume yarım kalan son çalıştırmayı devralır
+    crawl_state.start_run(resume=resume)
+    if crawl_state.resumed:
+        logger.info("Yarım kalan tarama kaldığı yerden sürdürülüyor")
     
-    # Metadata dosyasını oluştur
-    create_metadata(channels, len(valid_channels))
+    if use_async:
+        # Asenkron mod: keşif, çıkarma ve doğrulama tek olay döngüsünde
+        channels, valid_channels = asyncio.run(async_run_pipeline(previous, max_workers=max_workers, deadline=deadline))
+    else:
+        # Keşif, çıkarma ve doğrulama aynı anda çalışan aşamalar olarak ilerler
+        channels, valid_channels = ChannelPipeline(previous, max_workers=max_workers, deadline=deadline).run()
     
-    logger.info(f"İşlem tamamlandı! {len(valid_channels)} geçerli kanal m3u dosyasına eklendi.")
+    if not channels:
+        logger.error("Hiç kanal bulunamadı!")
+        return False
+    
+    if write_outputs(channels, valid_channels, health_probe):
+        crawl_state.finish_run()
+    flush_caches()
     return True
 
+def parse_args():
+    """Komut satırı argümanlarını okur"""
+    parser = argparse.ArgumentParser(description="Türk ve Azerbaycan TV kanalları için M3U listesi oluşturur")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f"Aynı anda işlenecek kanal sayısı (varsayılan: {MAX_WORKERS})")
+    parser.add_argument('--host-rate', type=float, default=PER_HOST_RATE_LIMIT,
+                        help=f"Host başına saniyedeki en fazla istek, 0 = sınırsız (varsayılan: {PER_HOST_RATE_LIMIT})")
+    parser.add_argument('--deadline', type=int, default=GLOBAL_DEADLINE,
+                        help=f"Çıkarma aşaması için süre sınırı (saniye), 0 = sınırsız (varsayılan: {GLOBAL_DEADLINE})")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Keşif, çıkarma ve doğrulamayı asenkron HTTP boru hattında çalıştır (aiohttp gerekir)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Disk üzerindeki HTTP yanıt önbelleğini kullanma")
+    parser.add_argument('--cache-ttl', type=int, default=HTTP_CACHE_TTL,
+                        help=f"Önbellekteki yanıtların yeniden doğrulanmadan kullanılacağı süre (saniye, varsayılan: {HTTP_CACHE_TTL})")
+    parser.add_argument('--no-snapshots', action='store_true',
+                        help=f"Taranan kanal sayfalarını {SNAPSHOT_DIR}/ klasörüne kaydetme")
+    parser.add_argument('--full', action='store_true',
+                        help="Artımlı modu kapat, tüm kanalları baştan çıkar")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"Yarıda kalan son taramaya {CRAWL_STATE_FILE} kayıtlarından kaldığı yerden devam et")
+    parser.add_argument('--browsers', type=int, default=BROWSER_POOL_SIZE,
+                        help=f"Selenium için açık tutulacak en fazla Chrome sayısı (varsayılan: {BROWSER_POOL_SIZE})")
+    parser.add_argument('--no-resource-blocking', action='store_true',
+                        help="Headless tarayıcıda resim, font, medya ve reklam isteklerini engelleme")
+    parser.add_argument('--check-segments', action='store_true',
+                        help="Doğrulamada manifestin yanında bir medya segmentinin de yanıt verdiğini kontrol et")
+    parser.add_argument('--health-probe', action='store_true',
+                        help=f"Geçerli stream'lerin gecikme ve hızını ölçüp {HEALTH_FILE} dosyasına yaz, listeyi buna göre sırala")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    # Manuel analiz için tüm kanal sayfalarını indir
-    save_all_channel_pages()
+    args = parse_args()
+    host_rate_limiter.set_rate(args.host_rate)
+    http_cache.enabled = not args.no_cache
+    http_cache.ttl = args.cache_ttl
+    snapshot_writer.enabled = not args.no_snapshots
+    browser_pool.size = max(1, args.browsers)
+    browser_pool.block_resources = not args.no_resource_blocking
+    hls_validator.check_segment = args.check_segments
     
-    # Ana işlemi çalıştır
-    main() 
\ No newline at end of file
+    # Ana işlemi çalıştır (kanal sayfalarının debug kayıtları bu tarama sırasında yazılır)
+    try:
+        main(max_workers=max(1, args.workers), deadline=args.deadline, use_async=args.use_async,
+             incremental=not args.full, health_probe=args.health_probe, resume=args.resume)
+    finally:
+        browser_pool.shutdown()